@@ -0,0 +1,15 @@
+"""Benchmarks for powerwall_control.
+
+These are standalone scripts, run from the top of the repository, e.g.
+
+    python -m benchmarks.models
+
+They need the dev dependency group, as installed by uv sync. This
+includes the bench group, with cryptography for the transport
+benchmark's TLS certificates.
+
+To run them all, write the results as JSON and check them against
+thresholds.json (and optionally a baseline from an earlier run):
+
+    python -m benchmarks --output results.json --baseline baseline.json
+"""
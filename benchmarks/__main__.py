@@ -0,0 +1,197 @@
+"""Run the benchmark suite, and write the results as JSON.
+
+Run from the top of the repository:
+
+    python -m benchmarks [SUITE ...] [--output FILE] [--baseline FILE]
+
+Results are flattened to metric names of the form suite.group.metric.
+All metrics are better when lower. The JSON written records the git
+commit, so results can be kept and compared across commits.
+
+The results are checked against the thresholds file. Each metric has
+the first rule in it whose pattern (an fnmatch glob) matches the
+name, or else the default rule. A rule may give:
+
+- max: the highest acceptable value
+- max_regression: the highest acceptable fractional increase over
+  the baseline, if one is given, or null to not compare the metric
+
+The exit status is 1 if any metric is outside its thresholds.
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+from fnmatch import fnmatchcase
+import inspect
+import json
+from pathlib import Path
+import platform
+import subprocess
+import sys
+from typing import Any
+
+from . import client, coordinator, models, status, transport
+
+SUITES = {
+    "models": models.run,
+    "status": status.run,
+    "client": client.run,
+    "transport": transport.run,
+    "coordinator": coordinator.run,
+}
+
+DEFAULT_THRESHOLDS = Path(__file__).with_name("thresholds.json")
+
+
+def flatten(results: dict[str, Any], prefix: str) -> dict[str, float]:
+    """Flatten nested results to dotted metric names."""
+    flat = {}
+    for name, value in results.items():
+        if isinstance(value, dict):
+            flat |= flatten(value, f"{prefix}.{name}")
+        else:
+            flat[f"{prefix}.{name}"] = float(value)
+    return flat
+
+
+def git_commit() -> tuple[str | None, bool]:
+    """Return the current commit, and whether the tree has changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(dirty)
+
+
+def run_suites(names: list[str]) -> dict[str, float]:
+    """Run the named suites, returning the flattened results."""
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        suite_results = SUITES[name]()
+        if inspect.isawaitable(suite_results):
+            suite_results = asyncio.run(suite_results)
+        results |= flatten(suite_results, name)
+    return results
+
+
+def rule_for(metric: str, thresholds: dict[str, Any]) -> dict[str, Any]:
+    """Return the threshold rule for a metric."""
+    for pattern, rule in thresholds.get("metrics", {}).items():
+        if fnmatchcase(metric, pattern):
+            return {"max_regression": thresholds.get("max_regression")} | rule
+    return {"max_regression": thresholds.get("max_regression")}
+
+
+def check(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    thresholds: dict[str, Any],
+) -> list[str]:
+    """Return descriptions of the metrics outside their thresholds."""
+    failures = []
+    for metric, value in results.items():
+        rule = rule_for(metric, thresholds)
+        if (limit := rule.get("max")) is not None and value > limit:
+            failures.append(f"{metric} is {value:.2f}, over the maximum of {limit}")
+        base = baseline.get(metric)
+        max_regression = rule["max_regression"]
+        if base and max_regression is not None:
+            regression = (value - base) / base
+            if regression > max_regression:
+                failures.append(
+                    f"{metric} is {value:.2f}, {regression:.0%} over the baseline "
+                    f"{base:.2f} (allowed {max_regression:.0%})"
+                )
+    return failures
+
+
+def print_table(results: dict[str, float], baseline: dict[str, float]) -> None:
+    """Print the results, and the change from any baseline."""
+    width = max(map(len, results), default=0) + 2
+    print(f"{'metric':<{width}}{'value':>12}{'baseline':>12}{'change':>10}")
+    for metric, value in results.items():
+        line = f"{metric:<{width}}{value:>12.2f}"
+        if base := baseline.get(metric):
+            line += f"{base:>12.2f}{(value - base) / base:>+10.0%}"
+        print(line)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run the powerwall_control benchmark suite",
+        epilog=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "suites",
+        nargs="*",
+        metavar="SUITE",
+        help=f"Suites to run, from {', '.join(SUITES)}. Default all.",
+    )
+    parser.add_argument(
+        "--output", "-o", type=Path, default=None, help="File to write results to"
+    )
+    parser.add_argument(
+        "--baseline",
+        "-b",
+        type=Path,
+        default=None,
+        help="Results of an earlier run to compare against",
+    )
+    parser.add_argument(
+        "--thresholds",
+        "-t",
+        type=Path,
+        default=DEFAULT_THRESHOLDS,
+        help="Thresholds file to check results against",
+    )
+    args = parser.parse_args()
+    if unknown := set(args.suites) - SUITES.keys():
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main() -> int:
+    """Run the suite, write and check the results."""
+    args = parse_args()
+    thresholds = json.loads(args.thresholds.read_text(encoding="utf-8"))
+    baseline = {}
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+
+    names = args.suites or list(SUITES)
+    commit, dirty = git_commit()
+    document = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "suites": names,
+        "results": run_suites(names),
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    print_table(document["results"], baseline)
+    if failures := check(document["results"], baseline, thresholds):
+        print("\nThresholds exceeded:", file=sys.stderr)
+        for failure in failures:
+            print(f"  {failure}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
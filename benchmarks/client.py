@@ -0,0 +1,108 @@
+"""Benchmark the overhead of Auth.request and EnergySite calls.
+
+Requests go to the emulator with no faults injected. Through a
+MemoryTransport there are no sockets, so the times are the cost of
+the client itself (rate limiter, retry loop, headers and parsing),
+plus the emulator's handler, which is timed on its own for reference.
+Over loopback HTTP the times include aiohttp on both ends.
+
+Run from the top of the repository:
+
+    python -m benchmarks.client
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import statistics
+import time
+
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+import netzero
+
+from .emulator import Emulator, EmulatorOptions
+from .transport import UNLIMITED
+
+
+async def time_calls(call: Callable[[], Awaitable[object]], number: int) -> list[float]:
+    """Time a number of calls, in microseconds each, after a warm up."""
+    for _ in range(number // 10):
+        await call()
+    times = []
+    for _ in range(number):
+        start = time.perf_counter()
+        await call()
+        times.append((time.perf_counter() - start) * 1e6)
+    return times
+
+
+def summary(times: list[float]) -> dict[str, float]:
+    """Return the median and 90th percentile of times."""
+    return {
+        "median_us": statistics.median(times),
+        "p90_us": statistics.quantiles(times, n=10)[-1],
+    }
+
+
+async def run(
+    memory_samples: int = 5000, loopback_samples: int = 500
+) -> dict[str, dict[str, float]]:
+    """Run the benchmark, returning statistics per transport and call."""
+    emulator = Emulator(EmulatorOptions(seed=1))
+    token = emulator.add_sites(1)[0]
+    results = {}
+
+    request = netzero.MemoryRequest(
+        "GET",
+        URL(f"{netzero.DEFAULT_HOST}/100000/config"),
+        CIMultiDictProxy(CIMultiDict({"Authorization": f"Bearer {token}"})),
+    )
+    results["handler"] = summary(
+        await time_calls(lambda: emulator.async_handle(request), memory_samples)
+    )
+
+    async def request_only(auth: netzero.Auth) -> None:
+        resp = await auth.request("GET", "100000/config")
+        resp.release()
+
+    memory = netzero.Auth(
+        None,
+        token,
+        rate_limiter=UNLIMITED,
+        transport=netzero.MemoryTransport(emulator.async_handle),
+    )
+    base_url = await emulator.async_start()
+    loopback = netzero.Auth(None, token, rate_limiter=UNLIMITED, host=base_url)
+    for name, auth, samples in (
+        ("memory", memory, memory_samples),
+        ("loopback", loopback, loopback_samples),
+    ):
+        async with auth:
+            site = netzero.EnergySite(auth, 100000)
+            results[f"{name}_request"] = summary(
+                await time_calls(lambda auth=auth: request_only(auth), samples)
+            )
+            results[f"{name}_get_config"] = summary(
+                await time_calls(site.async_get_config, samples)
+            )
+            results[f"{name}_set_config"] = summary(
+                await time_calls(
+                    lambda site=site: site.async_set_config(grid_charging=True),
+                    samples,
+                )
+            )
+    await emulator.async_stop()
+    return results
+
+
+def main() -> None:
+    """Print a table of the results."""
+    results = asyncio.run(run())
+    print(f"{'':<22}{'median us':>12}{'p90 us':>12}")
+    for name, stats in results.items():
+        print(f"{name:<22}{stats['median_us']:>12.1f}{stats['p90_us']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Benchmark the configuration coordinator hot paths.
+
+Fan-out times one update of PwCtrlCoordinator data with listeners for
+a typical set of entities, when nothing changed, when one field
+changed, and when every field changed.
+
+Control latency times requests made the way the number, select and
+switch entities make them (with async_request_control()) until the
+POST reaches the emulator, through a MemoryTransport, for different
+debounce settings. Single writes are spaced out, while bursts are
+writes in quick succession, as from an automation or a slider.
+
+Run from the top of the repository:
+
+    python -m benchmarks.coordinator
+"""
+
+import asyncio
+from collections.abc import Callable
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from custom_components.powerwall_control.coordinator import (
+    UPDATE_INTERVAL,
+    PwCtrlCoordinator,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import frame
+import netzero
+
+from .emulator import Emulator, EmulatorOptions
+from .transport import UNLIMITED
+
+# Listeners, by the config fields they depend on, for a site with a
+# handful of entities per control field, plus listeners for
+# everything.
+FANOUT_LISTENERS = {
+    "backup_reserve_percent": 5,
+    "operational_mode": 5,
+    "energy_exports": 5,
+    "grid_charging": 5,
+    "live_status": 20,
+    None: 5,
+}
+
+# Control debounce settings to compare, in seconds
+DEBOUNCE_SETTINGS = {
+    "trailing": {"cooldown": 0.05, "immediate": False, "max_wait": None},
+    "leading": {"cooldown": 0.05, "immediate": True, "max_wait": None},
+    "max_wait": {"cooldown": 0.05, "immediate": False, "max_wait": 0.15},
+}
+
+# Writes in a burst, and the time between them
+BURST_WRITES = 20
+BURST_SPACING = 0.01
+
+CONFIG = {
+    "backup_reserve_percent": 80,
+    "operational_mode": "autonomous",
+    "energy_exports": "pv_only",
+    "grid_charging": False,
+}
+
+
+async def fanout(hass: HomeAssistant, updates: int = 5000) -> dict[str, float]:
+    """Time data updates with listeners for a typical set of entities."""
+    crd = PwCtrlCoordinator(hass, netzero.EnergySite(None, 12345))
+    calls = 0
+
+    def listener() -> None:
+        nonlocal calls
+        calls += 1
+
+    for field, count in FANOUT_LISTENERS.items():
+        for _ in range(count):
+            crd.async_add_listener(
+                listener, None if field is None else frozenset({field})
+            )
+
+    base = netzero.EnergySiteConfig(12345, CONFIG)
+    variants = {
+        "unchanged": netzero.EnergySiteConfig(12345, CONFIG),
+        "one_field": netzero.EnergySiteConfig(
+            12345, CONFIG | {"backup_reserve_percent": 50}
+        ),
+        "all_fields": netzero.EnergySiteConfig(
+            12345,
+            {
+                "backup_reserve_percent": 50,
+                "operational_mode": "backup",
+                "energy_exports": "battery_ok",
+                "grid_charging": True,
+            },
+        ),
+    }
+
+    results = {}
+    for name, other in variants.items():
+        crd.async_set_updated_data(base)
+        calls = 0
+        start = time.perf_counter()
+        for i in range(updates):
+            crd.async_set_updated_data(other if i % 2 == 0 else base)
+        results[f"{name}_us"] = (time.perf_counter() - start) / updates * 1e6
+        results[f"{name}_calls"] = calls / updates
+    await crd.async_shutdown()
+    return results
+
+
+async def wait_for(condition: Callable[[], bool], timeout: float = 5) -> None:
+    """Wait until the condition is met."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError
+        await asyncio.sleep(0.001)
+
+
+async def control_latency(
+    hass: HomeAssistant, settings: dict[str, Any], rounds: int = 5
+) -> dict[str, float]:
+    """Time control requests until their POST is made."""
+    emulator = Emulator(EmulatorOptions(live_status=False))
+    token = emulator.add_sites(1)[0]
+    posts: list[float] = []
+
+    async def handler(request: netzero.MemoryRequest) -> netzero.MemoryResponse:
+        if request.method == "POST":
+            posts.append(time.perf_counter())
+        return await emulator.async_handle(request)
+
+    auth = netzero.Auth(
+        None,
+        token,
+        rate_limiter=UNLIMITED,
+        transport=netzero.MemoryTransport(handler),
+    )
+    crd = PwCtrlCoordinator(hass, netzero.EnergySite(auth, 100000))
+    crd.async_set_options(
+        update_interval=UPDATE_INTERVAL,
+        verify_delay=None,
+        verify_retries=0,
+        **settings,
+    )
+    await crd.async_refresh()
+    # Long enough for the debouncer to be quiet again
+    quiet = settings["cooldown"] * 3
+
+    async def settle() -> None:
+        count = -1
+        while count != len(posts):
+            count = len(posts)
+            await asyncio.sleep(quiet)
+
+    single = []
+    for i in range(rounds):
+        count = len(posts)
+        start = time.perf_counter()
+        await crd.async_request_control(backup_reserve_percent=50 + i % 2)
+        await wait_for(lambda count=count: len(posts) > count)
+        single.append((posts[count] - start) * 1000)
+        await settle()
+
+    first, last, burst_posts = [], [], []
+    for burst in range(rounds):
+        count = len(posts)
+        start = time.perf_counter()
+        for i in range(BURST_WRITES):
+            end = time.perf_counter()
+            # Each burst ends on a new value, so isn't a no-op
+            await crd.async_request_control(
+                backup_reserve_percent=(burst * BURST_WRITES + i) % 100
+            )
+            await asyncio.sleep(BURST_SPACING)
+        await wait_for(lambda: crd.applied_generation == crd.requested_generation)
+        await settle()
+        first.append((posts[count] - start) * 1000)
+        last.append((posts[-1] - end) * 1000)
+        burst_posts.append(len(posts) - count)
+
+    await crd.async_shutdown()
+    await auth.async_close()
+    return {
+        "single_ms": statistics.median(single),
+        "burst_first_ms": statistics.median(first),
+        "burst_last_ms": statistics.median(last),
+        "burst_posts": statistics.median(burst_posts),
+    }
+
+
+async def run() -> dict[str, dict[str, float]]:
+    """Run the benchmark, returning results per scenario."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        # Coordinators report being created outside of a config entry
+        frame.async_setup(hass)
+        results = {"fanout": await fanout(hass)}
+        for name, settings in DEBOUNCE_SETTINGS.items():
+            results[f"debounce_{name}"] = await control_latency(hass, settings)
+        await hass.async_stop(force=True)
+    return results
+
+
+def main() -> None:
+    """Print the results."""
+    for scenario, metrics in asyncio.run(run()).items():
+        print(scenario)
+        for metric, value in metrics.items():
+            print(f"  {metric:<20}{value:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
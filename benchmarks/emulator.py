@@ -0,0 +1,479 @@
+"""Local stand-in for the Netzero Developer API.
+
+Serves GET and POST /api/v1/{site}/config for any number of simulated
+energy sites, checking bearer tokens, so the Auth and EnergySite
+clients (and anything built on them) can be exercised over real HTTP
+without touching the Netzero servers.
+
+Faults can be injected to see how clients cope with a loaded or
+unreliable server:
+
+- latency drawn from a distribution, before each response
+- 429 responses with a Retry-After header, either at random or when a
+  token goes over a rate limit
+- bursts of consecutive 5xx responses
+- slow bodies, trickled out in chunks after the headers
+
+Run from the top of the repository, e.g.
+
+    python -m benchmarks.emulator --sites 5000 --tokens 50 \
+        --latency lognormal:80:0.5 --error-rate 0.01 --error-burst 5
+
+and point a client at the printed base URL with Auth(host=...). The
+emulator can also be used in-process, as in the other benchmarks,
+either over a local socket:
+
+    emulator = Emulator(EmulatorOptions(latency=parse_latency("fixed:20")))
+    token = emulator.add_sites(1000)[0]
+    auth = netzero.Auth(None, token, host=await emulator.async_start())
+
+or with no sockets at all, through a MemoryTransport:
+
+    auth = netzero.Auth(
+        None, token, transport=netzero.MemoryTransport(emulator.async_handle)
+    )
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+import contextlib
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import hashlib
+import json
+import math
+import random
+import time
+from typing import Any, NamedTuple
+
+from aiohttp import web
+from multidict import CIMultiDict
+
+import netzero
+
+# Configuration each simulated site starts with
+DEFAULT_CONFIG = {
+    "backup_reserve_percent": 80,
+    "operational_mode": "autonomous",
+    "energy_exports": "pv_only",
+    "grid_charging": False,
+}
+
+# First simulated site ID
+FIRST_SITE_ID = 100000
+
+# Statuses used for 5xx bursts
+ERROR_STATUSES = (500, 502, 503, 504)
+
+# Path of the API under the base URL
+DEFAULT_HOST_PATH = "/api/v1"
+
+# Returns a latency in seconds
+type Latency = Callable[[random.Random], float]
+
+
+class _Reply(NamedTuple):
+    """Reply to a request, before it is sent by a transport."""
+
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    slow: bool
+
+
+def parse_latency(spec: str) -> Latency:
+    """Parse a latency distribution, with times in milliseconds.
+
+    The spec is one of:
+        fixed:MS
+        uniform:LOW_MS:HIGH_MS
+        exponential:MEAN_MS
+        lognormal:MEDIAN_MS:SIGMA
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(arg) for arg in args.split(":")] if args else []
+        match kind, values:
+            case "fixed", [ms]:
+                return lambda rng: ms / 1000
+            case "uniform", [low, high]:
+                return lambda rng: rng.uniform(low, high) / 1000
+            case "exponential", [mean]:
+                return lambda rng: rng.expovariate(1 / mean) / 1000
+            case "lognormal", [median, sigma]:
+                return lambda rng: rng.lognormvariate(math.log(median), sigma) / 1000
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency distribution {spec!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class EmulatorOptions:
+    """Faults injected by the emulator.
+
+    Attributes:
+        latency: Distribution of the delay before each response, or
+            None for no delay.
+        throttle_rate: Probability of a request getting a 429.
+        rate_limit: Requests per second allowed for each token, with a
+            burst of up to the same number of requests. Requests over
+            the limit get a 429. None for no limit.
+        retry_after: Seconds given in the Retry-After header of
+            random 429s.
+        error_rate: Probability of a request starting a burst of 5xx
+            responses.
+        error_burst: Number of consecutive requests in a 5xx burst.
+        slow_body_rate: Probability of a response body being slow.
+        slow_body_time: Seconds taken to send a slow body.
+        live_status: Whether to include a live status in each config.
+        seed: Seed for the random faults, for repeatable runs.
+    """
+
+    latency: Latency | None = None
+    throttle_rate: float = 0
+    rate_limit: float | None = None
+    retry_after: float = 1
+    error_rate: float = 0
+    error_burst: int = 3
+    slow_body_rate: float = 0
+    slow_body_time: float = 2
+    live_status: bool = True
+    seed: int | None = None
+
+
+class Emulator:
+    """Local stand-in for the Netzero API.
+
+    Sites are added with a token, which must be given as a bearer
+    token to access them. Requests without a valid token get a 401,
+    and requests for a site which isn't the token's get a 404, as
+    with the real API.
+
+    Counts of responses, by method and status, are kept in stats.
+    """
+
+    def __init__(self, options: EmulatorOptions | None = None) -> None:
+        """Initialize an emulator with no sites."""
+        self.options = EmulatorOptions() if options is None else options
+        self.sites: dict[str, dict[str, Any]] = {}
+        self.tokens: dict[str, set[str]] = {}
+        self.stats: Counter[str] = Counter()
+
+        self._rng = random.Random(self.options.seed)
+        # Requests left in the current 5xx burst
+        self._burst = 0
+        # Rate limit bucket of each token, as (tokens, last refill time)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._runner: web.AppRunner | None = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/api/v1/{site}/config", self._handle_config)
+        self.app.router.add_post("/api/v1/{site}/config", self._handle_config)
+        self.app.router.add_route("HEAD", "/api/v1", self._handle_root)
+
+    def add_site(
+        self, site_id: str, token: str, config: dict[str, Any] | None = None
+    ) -> None:
+        """Add a site, accessible with the token."""
+        site_id = str(site_id)
+        self.sites[site_id] = dict(DEFAULT_CONFIG if config is None else config)
+        self.tokens.setdefault(token, set()).add(site_id)
+
+    def add_sites(self, count: int, tokens: int = 1) -> list[str]:
+        """Add sites, spread evenly over new tokens, and return the tokens.
+
+        Sites are numbered from FIRST_SITE_ID, following any already
+        added this way. Tokens are 40 hex digits, so they pass the
+        config flow validation.
+        """
+        names = [
+            hashlib.sha1(f"emulator{len(self.tokens) + i}".encode()).hexdigest()
+            for i in range(tokens)
+        ]
+        first = FIRST_SITE_ID + len(self.sites)
+        for i in range(count):
+            self.add_site(str(first + i), names[i % tokens])
+        return names
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, and return the base URL for Auth."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        address, port = self._runner.addresses[0][:2]
+        return f"http://{address}:{port}/api/v1"
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_root(self, request: web.Request) -> web.Response:
+        """Respond to pre-warming."""
+        return web.Response()
+
+    async def async_handle(
+        self, request: netzero.MemoryRequest
+    ) -> netzero.MemoryResponse:
+        """Handle a request from a MemoryTransport.
+
+        Slow bodies are simulated by waiting for slow_body_time
+        before responding.
+        """
+        path = request.url.path.removeprefix(DEFAULT_HOST_PATH)
+        site_id, _, rest = path.strip("/").partition("/")
+        if request.method == "HEAD" and not site_id:
+            return netzero.MemoryResponse(200)
+        if rest != "config" or request.method not in ("GET", "POST"):
+            return netzero.MemoryResponse(404)
+
+        async def read_json() -> Any:
+            return request.json
+
+        reply = await self._async_respond(
+            request.method,
+            site_id,
+            request.headers.get("Authorization", ""),
+            read_json,
+        )
+        if reply.slow:
+            await asyncio.sleep(self.options.slow_body_time)
+        return netzero.MemoryResponse(
+            reply.status, reply.body, CIMultiDict(reply.headers)
+        )
+
+    async def _handle_config(self, request: web.Request) -> web.StreamResponse:
+        """Return the configuration of a site, changing it for a POST."""
+        reply = await self._async_respond(
+            request.method,
+            request.match_info["site"],
+            request.headers.get("Authorization", ""),
+            request.json,
+        )
+        if not reply.slow:
+            return web.Response(
+                status=reply.status, body=reply.body, headers=reply.headers
+            )
+
+        # Trickle the body out after the headers
+        response = web.StreamResponse(headers=reply.headers)
+        response.content_length = len(reply.body)
+        await response.prepare(request)
+        chunks = 10
+        size = math.ceil(len(reply.body) / chunks)
+        for start in range(0, len(reply.body), size):
+            await asyncio.sleep(self.options.slow_body_time / chunks)
+            await response.write(reply.body[start : start + size])
+        await response.write_eof()
+        return response
+
+    async def _async_respond(
+        self,
+        method: str,
+        site_id: str,
+        authorization: str,
+        read_json: Callable[[], Awaitable[Any]],
+    ) -> _Reply:
+        """Wait for the latency, then work out the reply to a request.
+
+        Faults and the token are checked first. A POST changes the
+        site configuration, then both methods reply with it.
+        """
+        options = self.options
+        if options.latency is not None:
+            await asyncio.sleep(options.latency(self._rng))
+
+        token = authorization.removeprefix("Bearer ")
+        if token not in self.tokens:
+            return self._reply(method, 401)
+
+        if self._burst == 0 and self._rng.random() < options.error_rate:
+            self._burst = options.error_burst
+        if self._burst:
+            self._burst -= 1
+            return self._reply(method, self._rng.choice(ERROR_STATUSES))
+
+        if (retry_after := self._throttle(token)) is not None:
+            return self._reply(
+                method, 429, headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+        if site_id not in self.tokens[token]:
+            return self._reply(method, 404)
+
+        if method == "POST":
+            try:
+                changes = await read_json()
+                # Check the values can be parsed by the client models
+                netzero.EnergySiteConfig(site_id, self.sites[site_id] | changes)
+            except (TypeError, ValueError):
+                return self._reply(method, 400)
+            if not changes.keys() <= DEFAULT_CONFIG.keys():
+                return self._reply(method, 400)
+            self.sites[site_id] |= changes
+
+        config = dict(self.sites[site_id])
+        if options.live_status:
+            config["live_status"] = self._live_status()
+        return self._reply(
+            method,
+            200,
+            headers={"Content-Type": "application/json"},
+            body=json.dumps(config).encode(),
+            slow=self._rng.random() < options.slow_body_rate,
+        )
+
+    def _throttle(self, token: str) -> float | None:
+        """Return the Retry-After for a throttled request, or None."""
+        options = self.options
+        if options.rate_limit is not None:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(token, (options.rate_limit, now))
+            tokens = min(options.rate_limit, tokens + (now - last) * options.rate_limit)
+            if tokens < 1:
+                self._buckets[token] = (tokens, now)
+                return (1 - tokens) / options.rate_limit
+            self._buckets[token] = (tokens - 1, now)
+        if self._rng.random() < options.throttle_rate:
+            return options.retry_after
+        return None
+
+    def _reply(
+        self,
+        method: str,
+        status: int,
+        *,
+        headers: dict[str, str] | None = None,
+        body: bytes = b"",
+        slow: bool = False,
+    ) -> _Reply:
+        """Return a reply, counting it."""
+        self.stats[f"{method} {status}"] += 1
+        return _Reply(status, headers or {}, body, slow)
+
+    def _live_status(self) -> dict[str, Any]:
+        """Return a plausible live status."""
+        rng = self._rng
+        solar = rng.uniform(0, 5000)
+        load = rng.uniform(200, 3000)
+        battery = rng.uniform(-3000, 3000)
+        return {
+            "percentage_charged": rng.uniform(5, 100),
+            "solar_power": solar,
+            "battery_power": battery,
+            "load_power": load,
+            "grid_power": load - solar - battery,
+            "generator_power": 0,
+            "grid_status": "Active",
+            "island_status": "on_grid",
+            "storm_mode_active": False,
+            "timestamp": datetime.now(UTC).isoformat(),
+            "wall_connectors": [],
+        }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the Netzero API",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument(
+        "--sites", type=int, default=1, help="Number of sites to simulate"
+    )
+    parser.add_argument(
+        "--tokens", type=int, default=1, help="Number of tokens to spread sites over"
+    )
+    parser.add_argument(
+        "--latency",
+        type=parse_latency,
+        default=None,
+        help="Latency distribution, e.g. fixed:50, uniform:20:80, "
+        "exponential:50 or lognormal:50:0.5 (times in ms)",
+    )
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0, help="Probability of a random 429"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Requests per second allowed for each token",
+    )
+    parser.add_argument(
+        "--retry-after", type=float, default=1, help="Retry-After of random 429s"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="Probability of a request starting a 5xx burst",
+    )
+    parser.add_argument(
+        "--error-burst", type=int, default=3, help="Length of 5xx bursts"
+    )
+    parser.add_argument(
+        "--slow-body-rate",
+        type=float,
+        default=0,
+        help="Probability of a slow response body",
+    )
+    parser.add_argument(
+        "--slow-body-time",
+        type=float,
+        default=2,
+        help="Seconds taken to send a slow body",
+    )
+    parser.add_argument(
+        "--no-live-status",
+        dest="live_status",
+        action="store_false",
+        help="Leave the live status out of configurations",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    return parser.parse_args()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Serve until cancelled, then print the response counts."""
+    emulator = Emulator(
+        EmulatorOptions(
+            latency=args.latency,
+            throttle_rate=args.throttle_rate,
+            rate_limit=args.rate_limit,
+            retry_after=args.retry_after,
+            error_rate=args.error_rate,
+            error_burst=args.error_burst,
+            slow_body_rate=args.slow_body_rate,
+            slow_body_time=args.slow_body_time,
+            live_status=args.live_status,
+            seed=args.seed,
+        )
+    )
+    tokens = emulator.add_sites(args.sites, args.tokens)
+    base_url = await emulator.async_start(args.host, args.port)
+
+    print(f"Serving {len(emulator.sites)} sites at {base_url}")
+    for token in tokens:
+        site_ids = sorted(emulator.tokens[token])
+        print(f"  {token}: sites {site_ids[0]}-{site_ids[-1]}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await emulator.async_stop()
+        for name, count in sorted(emulator.stats.items()):
+            print(f"{name:<10}{count:>10}")
+
+
+def main() -> None:
+    """Run the emulator until interrupted."""
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
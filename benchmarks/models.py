@@ -0,0 +1,185 @@
+"""Micro-benchmark for the Netzero API model objects.
+
+Compares the parse-once, slotted EnergySiteConfig against a copy of
+the previous implementation, which kept the raw JSON dictionary and
+re-derived each value on every property access.
+
+Run from the top of the repository:
+
+    python -m benchmarks.models
+"""
+
+from datetime import datetime
+import gc
+import json
+import timeit
+import tracemalloc
+from typing import Any
+
+import netzero
+
+SAMPLE_RESPONSE = json.dumps(
+    {
+        "backup_reserve_percent": 80,
+        "operational_mode": "autonomous",
+        "energy_exports": "pv_only",
+        "grid_charging": True,
+        "live_status": {
+            "percentage_charged": 87.5,
+            "solar_power": 4140,
+            "battery_power": -2520,
+            "load_power": 1620,
+            "grid_power": 110,
+            "generator_power": 0,
+            "grid_status": "Active",
+            "island_status": "on_grid",
+            "storm_mode_active": False,
+            "timestamp": "2020-12-31T23:59:59.900Z",
+            "wall_connectors": [
+                {
+                    "din": f"wc{i}",
+                    "wall_connector_state": 2,
+                    "wall_connector_fault_state": 1,
+                    "wall_connector_power": 100 * i,
+                }
+                for i in range(2)
+            ],
+        },
+    }
+)
+
+
+class LegacyEnergySiteStatus:
+    """Status decoded on each access, as before."""
+
+    def __init__(self, site_id: str, raw_data: dict[str, Any]) -> None:
+        """Initialize a status object."""
+        self.site_id = site_id
+        self.raw_data = raw_data
+
+    @property
+    def percentage_charged(self) -> float:
+        """Percentage charge."""
+        return float(self.raw_data["percentage_charged"])
+
+    @property
+    def grid_status(self) -> netzero.GridStatus:
+        """Grid status."""
+        return netzero.GridStatus(self.raw_data["grid_status"])
+
+    @property
+    def timestamp(self) -> datetime:
+        """Timestamp."""
+        return datetime.fromisoformat(self.raw_data["timestamp"])
+
+
+class LegacyEnergySiteConfig:
+    """Config decoded on each access, as before."""
+
+    def __init__(self, site_id: str, raw_data: dict[str, Any]) -> None:
+        """Initialize a config object."""
+        self.site_id = site_id
+        self.raw_data = raw_data
+
+    def __eq__(self, other: "LegacyEnergySiteConfig"):
+        """Compare config objects."""
+        return (
+            self.site_id == other.site_id
+            and self.backup_reserve_percent == other.backup_reserve_percent
+            and self.operational_mode == other.operational_mode
+            and self.energy_exports == other.energy_exports
+            and self.grid_charging == other.grid_charging
+        )
+
+    @property
+    def backup_reserve_percent(self) -> int:
+        """Backup reserve."""
+        return self.raw_data["backup_reserve_percent"]
+
+    @property
+    def operational_mode(self) -> netzero.OperationalMode:
+        """Operational mode."""
+        return netzero.OperationalMode(self.raw_data["operational_mode"])
+
+    @property
+    def energy_exports(self) -> netzero.EnergyExportMode | None:
+        """Energy exports."""
+        value = self.raw_data["energy_exports"]
+        if value is None:
+            return None
+        return netzero.EnergyExportMode(value)
+
+    @property
+    def grid_charging(self) -> bool:
+        """Grid charging."""
+        return self.raw_data["grid_charging"]
+
+    @property
+    def live_status(self) -> LegacyEnergySiteStatus:
+        """Live status."""
+        return LegacyEnergySiteStatus(self.site_id, self.raw_data["live_status"])
+
+
+def read_all(config) -> None:
+    """Read the values an entity update and __eq__ would read."""
+    _ = config.backup_reserve_percent
+    _ = config.operational_mode
+    _ = config.energy_exports
+    _ = config.grid_charging
+    status = config.live_status
+    _ = status.percentage_charged
+    _ = status.grid_status
+    _ = status.timestamp
+
+
+def per_call_us(stmt, number: int) -> float:
+    """Best of 5 timings of stmt, in microseconds per call."""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def snapshot_bytes(cls, count: int = 1000) -> float:
+    """Memory retained per parsed snapshot, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [cls("12345", json.loads(SAMPLE_RESPONSE)) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def run() -> dict[str, dict[str, float]]:
+    """Run the benchmark, returning results per implementation."""
+    results = {}
+    for name, cls in (
+        ("legacy", LegacyEnergySiteConfig),
+        ("parse_once", netzero.EnergySiteConfig),
+    ):
+        raw = json.loads(SAMPLE_RESPONSE)
+        a = cls("12345", raw)
+        b = cls("12345", json.loads(SAMPLE_RESPONSE))
+        results[name] = {
+            "parse_us": per_call_us(lambda cls=cls, raw=raw: cls("12345", raw), 20000),
+            "read_all_us": per_call_us(lambda a=a: read_all(a), 20000),
+            "eq_us": per_call_us(lambda a=a, b=b: a == b, 50000),
+            "snapshot_bytes": snapshot_bytes(cls),
+        }
+    return results
+
+
+def main() -> None:
+    """Print a comparison table."""
+    results = run()
+    metrics = list(results["legacy"])
+    print(f"{'metric':<16}{'legacy':>12}{'parse_once':>12}")
+    for metric in metrics:
+        print(
+            f"{metric:<16}"
+            f"{results['legacy'][metric]:>12.2f}"
+            f"{results['parse_once'][metric]:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Micro-benchmark for the live status model objects.
+
+Times parsing EnergySiteStatus, indexing its wall connectors by DIN,
+and comparing and diffing snapshots, for a site with a couple of wall
+connectors and for one with many.
+
+Run from the top of the repository:
+
+    python -m benchmarks.status
+"""
+
+import json
+import timeit
+from typing import Any
+
+import netzero
+
+# Number of wall connectors at each site size
+SITE_SIZES = {"small": 2, "large": 50}
+
+
+def sample_status(wall_connectors: int, power: int = 0) -> dict[str, Any]:
+    """Return a live status with a number of wall connectors."""
+    return {
+        "percentage_charged": 87.5,
+        "solar_power": 4140,
+        "battery_power": -2520,
+        "load_power": 1620,
+        "grid_power": 110,
+        "generator_power": 0,
+        "grid_status": "Active",
+        "island_status": "on_grid",
+        "storm_mode_active": False,
+        "timestamp": "2020-12-31T23:59:59.900Z",
+        "wall_connectors": [
+            {
+                "din": f"wc{i}",
+                "wall_connector_state": 2,
+                "wall_connector_fault_state": 1,
+                "wall_connector_power": 100 * i + power,
+            }
+            for i in range(wall_connectors)
+        ],
+    }
+
+
+def per_call_us(stmt, number: int) -> float:
+    """Best of 5 timings of stmt, in microseconds per call."""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def run() -> dict[str, dict[str, float]]:
+    """Run the benchmark, returning results per site size."""
+    results = {}
+    for name, count in SITE_SIZES.items():
+        raw = json.loads(json.dumps(sample_status(count)))
+        a = netzero.EnergySiteStatus("12345", raw)
+        b = netzero.EnergySiteStatus("12345", json.loads(json.dumps(raw)))
+        # Only the last wall connector differs
+        changed = sample_status(count)
+        changed["wall_connectors"][-1]["wall_connector_power"] += 1
+        c = netzero.EnergySiteStatus("12345", changed)
+        number = 200000 // (count + 10)
+        results[name] = {
+            "parse_us": per_call_us(
+                lambda raw=raw: netzero.EnergySiteStatus("12345", raw), number
+            ),
+            "wall_connectors_us": per_call_us(
+                lambda raw=raw: {
+                    item["din"]: netzero.WallConnector(item)
+                    for item in raw["wall_connectors"]
+                },
+                number,
+            ),
+            "eq_us": per_call_us(lambda a=a, b=b: a == b, number),
+            "diff_wall_connectors_us": per_call_us(
+                lambda a=a, c=c: c.diff_wall_connectors(a), number
+            ),
+        }
+    return results
+
+
+def main() -> None:
+    """Print a table of the results."""
+    results = run()
+    metrics = list(results["small"])
+    print(f"{'metric':<26}" + "".join(f"{name:>12}" for name in results))
+    for metric in metrics:
+        print(
+            f"{metric:<26}"
+            + "".join(f"{values[metric]:>12.2f}" for values in results.values())
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark cold and warm request latency to an HTTPS stand-in server.
+
+A local aiohttp server with a self-signed certificate stands in for
+the Netzero API. Cold requests use a new session each time, so pay for
+the TCP and TLS handshakes. Warm requests use an Auth with a dedicated
+connection pool, pre-warmed with Auth.async_prewarm().
+
+Run from the top of the repository:
+
+    python -m benchmarks.transport
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+import ipaddress
+from pathlib import Path
+import ssl
+import statistics
+import tempfile
+import time
+
+from aiohttp import web
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+import netzero
+
+# The rate limiter is shared by token, and is not what is being measured
+UNLIMITED = netzero.RateLimiter(rate=1e9, capacity=1e9)
+
+CONFIG = {
+    "backup_reserve_percent": 80,
+    "operational_mode": "autonomous",
+    "energy_exports": "pv_only",
+    "grid_charging": True,
+}
+
+
+def make_ssl_contexts(tmp: Path) -> tuple[ssl.SSLContext, ssl.SSLContext]:
+    """Create server and client SSL contexts for a self-signed certificate."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.now(UTC)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=1))
+        .not_valid_after(now + timedelta(hours=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [
+                    x509.DNSName("localhost"),
+                    x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+                ]
+            ),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+    cert_file = tmp / "cert.pem"
+    key_file = tmp / "key.pem"
+    cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_file.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+
+    server = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server.load_cert_chain(cert_file, key_file)
+    client = ssl.create_default_context(cafile=cert_file)
+    return server, client
+
+
+async def handle_config(request: web.Request) -> web.Response:
+    """Return a constant site config."""
+    return web.json_response(CONFIG)
+
+
+async def handle_root(request: web.Request) -> web.Response:
+    """Respond to pre-warming."""
+    return web.Response()
+
+
+async def time_request(auth: netzero.Auth, client_ssl: ssl.SSLContext) -> float:
+    """Time a single config GET, in milliseconds."""
+    start = time.perf_counter()
+    resp = await auth.request("GET", "12345/config", ssl=client_ssl)
+    resp.raise_for_status()
+    await resp.json()
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(samples: int = 50) -> dict[str, dict[str, float]]:
+    """Run the benchmark, returning latency statistics in milliseconds."""
+    with tempfile.TemporaryDirectory() as tmp:
+        server_ssl, client_ssl = make_ssl_contexts(Path(tmp))
+
+    app = web.Application()
+    app.router.add_get("/api/v1/{site}/config", handle_config)
+    app.router.add_route("HEAD", "/api/v1", handle_root)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0, ssl_context=server_ssl)
+    await site.start()
+    port = runner.addresses[0][1]
+    host = f"https://localhost:{port}/api/v1"
+
+    cold = []
+    for _ in range(samples):
+        async with netzero.Auth(
+            None, "TOKEN", rate_limiter=UNLIMITED, host=host
+        ) as auth:
+            cold.append(await time_request(auth, client_ssl))
+
+    async with netzero.Auth(None, "TOKEN", rate_limiter=UNLIMITED, host=host) as auth:
+        await auth.async_prewarm(ssl=client_ssl)
+        warm = [await time_request(auth, client_ssl) for _ in range(samples)]
+
+    await runner.cleanup()
+
+    return {
+        name: {
+            "median_ms": statistics.median(values),
+            "p90_ms": statistics.quantiles(values, n=10)[-1],
+        }
+        for name, values in (("cold", cold), ("warm", warm))
+    }
+
+
+def main() -> None:
+    """Print a comparison table."""
+    results = asyncio.run(run())
+    print(f"{'':<8}{'median ms':>12}{'p90 ms':>12}")
+    for name, stats in results.items():
+        print(f"{name:<8}{stats['median_ms']:>12.2f}{stats['p90_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
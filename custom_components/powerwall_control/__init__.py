@@ -11,51 +11,206 @@ Netzero Developer API.
 
 * Set grid export mode (never, solar only, solar and battery).
 
+* Change several of these at once, immediately, with the set_config
+  service.
+
+* Report the live status (power flows, charge, grid and storm mode)
+  returned with the configuration, and fire events when the grid
+  status, island status or storm mode change.
+
 This integration is intended to work together with the Tesla Powerwall
 integration. The entities from that integration should be used to
-monitor the Powerwall state. This integration is only intended to make
-changes to the Powerwall configuration. The same changes can be made
+monitor the Powerwall state in detail. This integration is mainly
+intended to make changes to the Powerwall configuration, and only
+reports the live status which comes with it. The same changes can be made
 via the Tesla App, Tesla Fleet API, or alternative integrations like
 Teslemetry.
 """
 
+from datetime import timedelta
+from typing import Any
+
+from aiohttp import ClientSession
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import CONF_URL, EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 
 # Temporarily use netzero directly to test in place within HA
 from . import netzero
-from .const import DOMAIN
-from .coordinator import PwCtrlCoordinator
+from .const import (
+    CONF_CONTROL_COOLDOWN,
+    CONF_CONTROL_IMMEDIATE,
+    CONF_CONTROL_MAX_WAIT,
+    CONF_STATUS_MAX_INTERVAL,
+    CONF_STATUS_MIN_INTERVAL,
+    CONF_UPDATE_INTERVAL,
+    CONF_VERIFY_DELAY,
+    CONF_VERIFY_RETRIES,
+    DOMAIN,
+)
+from .coordinator import (
+    REQUEST_CONTROL_DEFAULT_COOLDOWN,
+    REQUEST_CONTROL_DEFAULT_IMMEDIATE,
+    REQUEST_CONTROL_DEFAULT_MAX_WAIT,
+    STATUS_MAX_INTERVAL,
+    STATUS_MIN_INTERVAL,
+    UPDATE_INTERVAL,
+    VERIFY_DEFAULT_DELAY,
+    VERIFY_DEFAULT_RETRIES,
+    PwCtrlCoordinator,
+    PwCtrlStatusCoordinator,
+)
+from .services import async_setup_services
 
 # We don't have global configuration
 CONFIG_SCHEMA = cv.empty_config_schema(DOMAIN)
 
 # List of platforms to support.
-PLATFORMS = [Platform.NUMBER, Platform.SELECT, Platform.SWITCH]
+PLATFORMS = [
+    Platform.BINARY_SENSOR,
+    Platform.NUMBER,
+    Platform.SELECT,
+    Platform.SENSOR,
+    Platform.SWITCH,
+]
+
+# Version of the stored configuration snapshot
+STORAGE_VERSION = 1
+
+# Sites validated by the config flow are kept for this many seconds,
+# for the config entry setup which follows to reuse.
+VALIDATED_SITE_TIMEOUT = 60
+DATA_VALIDATED_SITES = f"{DOMAIN}_validated_sites"
+
+# Connection pool to the Netzero API, shared by all config entries
+DATA_SESSION = f"{DOMAIN}_session"
 
 # Our ConfigEntry.runtime_data will hold PwCtrlRuntimeData.
 # Otherwise access the config entries via the .data[] dictionary.
 type PwCtrlConfigEntry = ConfigEntry[PwCtrlRuntimeData]
 
 
+@callback
+def _async_get_session(hass: HomeAssistant) -> ClientSession:
+    """Return the connection pool to the Netzero API.
+
+    The pool is tuned for the API (see netzero.create_session()), and
+    is closed when Home Assistant stops.
+    """
+    if (session := hass.data.get(DATA_SESSION)) is None:
+        session = hass.data[DATA_SESSION] = netzero.create_session()
+
+        async def _async_close_session(event: Event) -> None:
+            await session.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    return session
+
+
+def async_get_site(
+    hass: HomeAssistant,
+    api_token: str,
+    system_id: str,
+    host: str = netzero.DEFAULT_HOST,
+) -> netzero.EnergySite:
+    """Create the Netzero site, without connecting to it.
+
+    The host is the base URL of the API, which may be changed to go
+    through a proxy.
+    """
+    auth = netzero.Auth(_async_get_session(hass), api_token, host=host)
+    return netzero.EnergySite(auth, system_id)
+
+
 async def async_get_config(
-    hass: HomeAssistant, api_token: str, system_id: str
+    hass: HomeAssistant,
+    api_token: str,
+    system_id: str,
+    host: str = netzero.DEFAULT_HOST,
 ) -> (netzero.EnergySite, netzero.EnergySiteConfig):
     """Connect to Netzero and retreive the site and site configuration."""
-    session = async_get_clientsession(hass)
-    auth = netzero.Auth(session, api_token)
-    site = netzero.EnergySite(auth, system_id)
+    site = async_get_site(hass, api_token, system_id, host)
     config = await site.async_get_config()
     return (site, config)
 
 
+@callback
+def async_add_validated_site(
+    hass: HomeAssistant,
+    api_token: str,
+    system_id: str,
+    site: netzero.EnergySite,
+    config: netzero.EnergySiteConfig,
+    *,
+    host: str = netzero.DEFAULT_HOST,
+) -> None:
+    """Keep a site and configuration just validated by the config flow.
+
+    This saves the config entry setup from fetching the configuration
+    again immediately afterwards.
+    """
+    validated = hass.data.setdefault(DATA_VALIDATED_SITES, {})
+    expires = hass.loop.time() + VALIDATED_SITE_TIMEOUT
+    validated[system_id] = (api_token, host, expires, site, config)
+
+
+@callback
+def _async_pop_validated_site(
+    hass: HomeAssistant,
+    api_token: str,
+    system_id: str,
+    *,
+    host: str = netzero.DEFAULT_HOST,
+) -> tuple[netzero.EnergySite, netzero.EnergySiteConfig] | None:
+    """Take the recently validated site and configuration, if any."""
+    validated = hass.data.get(DATA_VALIDATED_SITES, {})
+    if (item := validated.pop(system_id, None)) is None:
+        return None
+    token, validated_host, expires, site, config = item
+    if token != api_token or validated_host != host or hass.loop.time() > expires:
+        return None
+    return (site, config)
+
+
+def _async_get_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict[str, Any]]:
+    """Return the store for the entry's configuration snapshot."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+
+
+async def _async_migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Prefix the unique IDs of Powerwall entities with the system ID.
+
+    Entities from before this didn't include it, so collided between
+    config entries. Wall Connector entities already include the DIN.
+    """
+    system_id = entry.data["system_id"]
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, system_id)})
+    if device is None:
+        return
+
+    @callback
+    def _async_migrate(entity: er.RegistryEntry) -> dict[str, Any] | None:
+        if entity.device_id != device.id or entity.unique_id.startswith(
+            f"{system_id}_"
+        ):
+            return None
+        return {"new_unique_id": f"{system_id}_{entity.unique_id}"}
+
+    await er.async_migrate_entries(hass, entry.entry_id, _async_migrate)
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Called by Home Assistant when loading the integration."""
+    async_setup_services(hass)
     return True
 
 
@@ -70,39 +225,128 @@ async def async_setup_entry(hass: HomeAssistant, entry: PwCtrlConfigEntry) -> bo
         name="Powerwall",
     )
 
-    # Create API connection
-    site, config = await async_get_config(
-        hass, entry.data["api_token"], entry.data["system_id"]
-    )
+    store = _async_get_store(hass, entry)
+    snapshot = None
+    host = entry.data.get(CONF_URL, netzero.DEFAULT_HOST)
+
+    # Reuse the API connection and configuration from the config flow
+    # if it has just validated them.
+    if validated := _async_pop_validated_site(
+        hass, entry.data["api_token"], entry.data["system_id"], host=host
+    ):
+        site, config = validated
+    else:
+        # Create API connection
+        site = async_get_site(
+            hass, entry.data["api_token"], entry.data["system_id"], host
+        )
+
+        # Start from the snapshot of the last good configuration if
+        # there is one, so setup doesn't wait on Netzero. A snapshot of
+        # any other site is ignored, and the configuration fetched.
+        snapshot = await store.async_load()
+        if snapshot and str(snapshot["site_id"]) != str(entry.data["system_id"]):
+            snapshot = None
+        if snapshot:
+            config = netzero.EnergySiteConfig(snapshot["site_id"], snapshot["config"])
+        else:
+            config = await site.async_get_config()
 
-    coordinator = PwCtrlCoordinator(hass, site)
+    coordinator = PwCtrlCoordinator(hass, site, store)
+    status_coordinator = PwCtrlStatusCoordinator(hass, coordinator)
 
-    entry.runtime_data = PwCtrlRuntimeData(coordinator, device_info)
+    entry.runtime_data = PwCtrlRuntimeData(coordinator, status_coordinator, device_info)
+
+    await _async_migrate_unique_ids(hass, entry)
+
+    # Options are applied without reloading the entry when changed
+    _async_apply_options(entry)
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
     # Creates a HA object for each platform required.
     # This calls `async_setup_entry` function in each platform module.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Update all entities with initial values populated during
-    # async_get_config() call
-    coordinator.async_set_updated_data(config)
+    # Update all entities with initial values, either from the
+    # snapshot or populated during the async_get_config() call
+    if snapshot:
+        coordinator.async_set_stored_data(config)
+    else:
+        coordinator.async_set_updated_data(config)
+    status_coordinator.async_set_updated_data(config.live_status)
+
+    if snapshot:
+        # Entities are stale until this status poll reconciles the
+        # configuration with Netzero.
+        entry.async_create_background_task(
+            hass, status_coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+        )
 
     return True
 
 
+@callback
+def _async_apply_options(entry: PwCtrlConfigEntry) -> None:
+    """Apply the entry options to the coordinators."""
+    options = entry.options
+    entry.runtime_data.coordinator.async_set_options(
+        update_interval=timedelta(
+            minutes=options.get(
+                CONF_UPDATE_INTERVAL, UPDATE_INTERVAL.total_seconds() / 60
+            )
+        ),
+        cooldown=options.get(CONF_CONTROL_COOLDOWN, REQUEST_CONTROL_DEFAULT_COOLDOWN),
+        immediate=options.get(
+            CONF_CONTROL_IMMEDIATE, REQUEST_CONTROL_DEFAULT_IMMEDIATE
+        ),
+        max_wait=options.get(CONF_CONTROL_MAX_WAIT, REQUEST_CONTROL_DEFAULT_MAX_WAIT),
+        # A verify delay of 0 turns verification off
+        verify_delay=(
+            timedelta(seconds=verify_delay)
+            if (verify_delay := options.get(CONF_VERIFY_DELAY))
+            else VERIFY_DEFAULT_DELAY
+        ),
+        verify_retries=int(options.get(CONF_VERIFY_RETRIES, VERIFY_DEFAULT_RETRIES)),
+    )
+    entry.runtime_data.status_coordinator.async_set_intervals(
+        timedelta(
+            seconds=options.get(
+                CONF_STATUS_MIN_INTERVAL, STATUS_MIN_INTERVAL.total_seconds()
+            )
+        ),
+        timedelta(
+            seconds=options.get(
+                CONF_STATUS_MAX_INTERVAL, STATUS_MAX_INTERVAL.total_seconds()
+            )
+        ),
+    )
+
+
+async def _async_update_options(hass: HomeAssistant, entry: PwCtrlConfigEntry) -> None:
+    """Handle the entry options being changed."""
+    _async_apply_options(entry)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the configuration snapshot of a deleted config entry."""
+    await _async_get_store(hass, entry).async_remove()
+
+
 class PwCtrlRuntimeData:
     """Central class to store runtime state."""
 
     def __init__(
         self,
         coordinator: PwCtrlCoordinator,
+        status_coordinator: PwCtrlStatusCoordinator,
         device_info: DeviceInfo,
     ) -> None:
         """Store hass and site."""
         self.coordinator = coordinator
+        self.status_coordinator = status_coordinator
         self.device_info = device_info
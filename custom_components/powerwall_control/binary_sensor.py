@@ -0,0 +1,100 @@
+"""Define Powerwall Control binary sensor entities.
+
+This is a Home Assistant defined file that specifies all binary sensor
+entities for an integration. A binary sensor is either on or off.
+
+Powerwall Control defines binary sensors for the grid status, island
+status and storm mode from the live status of the energy site.
+Changes to these also fire an EVENT_STATUS_CHANGED event.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+
+from . import PwCtrlConfigEntry
+from .coordinator import PwCtrlStatusCoordinator
+from .entity import PwCtrlEntity
+from .netzero import EnergySiteStatus, GridStatus, IslandStatus
+
+
+@dataclass(frozen=True, kw_only=True)
+class PwCtrlBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a live status binary sensor entity."""
+
+    is_on_fn: Callable[[EnergySiteStatus], bool]
+
+
+BINARY_SENSORS: tuple[PwCtrlBinarySensorEntityDescription, ...] = (
+    PwCtrlBinarySensorEntityDescription(
+        key="grid_status",
+        translation_key="grid_status",
+        device_class=BinarySensorDeviceClass.POWER,
+        is_on_fn=lambda status: status.grid_status == GridStatus.ACTIVE,
+    ),
+    PwCtrlBinarySensorEntityDescription(
+        key="off_grid",
+        translation_key="off_grid",
+        is_on_fn=lambda status: status.island_status == IslandStatus.OFF_GRID,
+    ),
+    PwCtrlBinarySensorEntityDescription(
+        key="storm_mode",
+        translation_key="storm_mode",
+        is_on_fn=lambda status: status.storm_mode_active,
+    ),
+)
+
+
+class PwCtrlLiveStatusBinarySensorEntity(
+    PwCtrlEntity[PwCtrlStatusCoordinator], BinarySensorEntity
+):
+    """Live status binary sensor entity class."""
+
+    entity_description: PwCtrlBinarySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: PwCtrlStatusCoordinator,
+        device_info: DeviceInfo,
+        system_id: str,
+        description: PwCtrlBinarySensorEntityDescription,
+    ) -> None:
+        """Initialize the binary sensor entity."""
+        self.entity_description = description
+        self._attr_unique_id = f"{system_id}_{description.key}"
+        super().__init__(coordinator, device_info)
+
+    @property
+    def available(self) -> bool:
+        """Return if the live status was included in the last response."""
+        return super().available and self.coordinator.data is not None
+
+    @property
+    def is_on(self) -> bool:
+        """Return the state from the live status."""
+        return self.entity_description.is_on_fn(self.coordinator.data)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: PwCtrlConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up binary sensor platform from a config entry."""
+    async_add_entities(
+        PwCtrlLiveStatusBinarySensorEntity(
+            entry.runtime_data.status_coordinator,
+            entry.runtime_data.device_info,
+            entry.data["system_id"],
+            description,
+        )
+        for description in BINARY_SENSORS
+    )
@@ -14,11 +14,40 @@ import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries, exceptions
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
+from homeassistant.const import CONF_URL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    TextSelector,
+    TextSelectorConfig,
+)
 
-from . import async_get_config
-from .const import DOMAIN
+from . import async_add_validated_site, async_get_config, netzero
+from .const import (
+    CONF_CONTROL_COOLDOWN,
+    CONF_CONTROL_IMMEDIATE,
+    CONF_CONTROL_MAX_WAIT,
+    CONF_STATUS_MAX_INTERVAL,
+    CONF_STATUS_MIN_INTERVAL,
+    CONF_UPDATE_INTERVAL,
+    CONF_VERIFY_DELAY,
+    CONF_VERIFY_RETRIES,
+    DOMAIN,
+)
+from .coordinator import (
+    REQUEST_CONTROL_DEFAULT_COOLDOWN,
+    REQUEST_CONTROL_DEFAULT_IMMEDIATE,
+    REQUEST_CONTROL_DEFAULT_MAX_WAIT,
+    STATUS_MAX_INTERVAL,
+    STATUS_MIN_INTERVAL,
+    UPDATE_INTERVAL,
+    VERIFY_DEFAULT_DELAY,
+    VERIFY_DEFAULT_RETRIES,
+)
 
 # Regular expressions to validate user input
 API_TOKEN_RE = re.compile(r"[0-9A-z]{40,}$")
@@ -29,6 +58,9 @@ async def validate_input(data: dict, hass: HomeAssistant) -> dict[str, Any]:
     """Validate the user input allows us to connect.
 
     Data has the keys from DATA_SCHEMA with values provided by the user.
+    The info returned includes the site and configuration fetched, for
+    the flow to keep with async_add_validated_site() once it is sure
+    to create or update an entry.
     """
     if not API_TOKEN_RE.match(data["api_token"]):
         raise InvalidToken
@@ -36,14 +68,43 @@ async def validate_input(data: dict, hass: HomeAssistant) -> dict[str, Any]:
     if not SYSTEM_ID_RE.match(data["system_id"]):
         raise InvalidSystemId
 
+    host = data.get(CONF_URL, netzero.DEFAULT_HOST)
+    try:
+        cv.url(host)
+    except vol.Invalid as e:
+        raise InvalidUrl from e
+
     # Verify we can connect to Netzero with the key and id
     try:
-        _, _ = await async_get_config(hass, data["api_token"], data["system_id"])
+        site, config = await async_get_config(
+            hass, data["api_token"], data["system_id"], host
+        )
     except aiohttp.ClientResponseError as e:
         raise CannotConnect from e
 
     # Return info we want stored in the config entry
-    return {"title": "Energy site " + data["system_id"], "system_id": data["system_id"]}
+    return {
+        "title": "Energy site " + data["system_id"],
+        "system_id": data["system_id"],
+        "host": host,
+        "site": site,
+        "config": config,
+    }
+
+
+@callback
+def _async_keep_validated_site(
+    hass: HomeAssistant, data: dict[str, Any], info: dict[str, Any]
+) -> None:
+    """Let the config entry setup reuse what validate_input() fetched."""
+    async_add_validated_site(
+        hass,
+        data["api_token"],
+        info["system_id"],
+        info["site"],
+        info["config"],
+        host=info["host"],
+    )
 
 
 class PwCtrlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -54,6 +115,14 @@ class PwCtrlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Create the options flow."""
+        return PwCtrlOptionsFlow()
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
         """Handle a flow initiated by the user."""
         errors = {}
@@ -66,24 +135,31 @@ class PwCtrlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 # Abort the flow if a config entry with the same unique ID exists
                 self._abort_if_unique_id_configured()
 
+                _async_keep_validated_site(self.hass, user_input, info)
                 return self.async_create_entry(title=info["title"], data=user_input)
             except InvalidToken:
                 errors["base"] = "invalid_token"
             except InvalidSystemId:
                 errors["base"] = "invalid_system_id"
+            except InvalidUrl:
+                errors["base"] = "invalid_url"
             except CannotConnect:
                 errors["base"] = "cannot_connect"
 
+        schema = {
+            vol.Required("api_token"): str,
+            vol.Required("system_id"): str,
+        }
+        # Only advanced users route requests somewhere else, such as
+        # a caching proxy.
+        if self.show_advanced_options:
+            schema[vol.Optional(CONF_URL, default=netzero.DEFAULT_HOST)] = str
+
         # Either initial call or validation failed.
         # Show the form
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema(
-                {
-                    vol.Required("api_token"): str,
-                    vol.Required("system_id"): str,
-                }
-            ),
+            data_schema=vol.Schema(schema),
             errors=errors,
         )
 
@@ -92,8 +168,9 @@ class PwCtrlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         if user_input is not None:
             try:
-                _ = await validate_input(user_input, self.hass)
+                info = await validate_input(user_input, self.hass)
 
+                _async_keep_validated_site(self.hass, user_input, info)
                 return self.async_update_reload_and_abort(
                     self._get_reconfigure_entry(), data_updates=user_input
                 )
@@ -101,26 +178,119 @@ class PwCtrlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "invalid_token"
             except InvalidSystemId:
                 errors["base"] = "invalid_system_id"
+            except InvalidUrl:
+                errors["base"] = "invalid_url"
             except CannotConnect:
                 errors["base"] = "cannot_connect"
 
         # Get defaults from the existing entry. System ID is the unique ID,
         # so don't allow that to change.
         config_entry = self._get_reconfigure_entry()
+        schema = {
+            vol.Required("api_token", default=config_entry.data["api_token"]): str,
+            vol.Optional(
+                "system_id", default=config_entry.data["system_id"]
+            ): TextSelector(TextSelectorConfig(read_only=True)),
+        }
+        if self.show_advanced_options:
+            schema[
+                vol.Optional(
+                    CONF_URL,
+                    default=config_entry.data.get(CONF_URL, netzero.DEFAULT_HOST),
+                )
+            ] = str
 
         # Either initial call or validation failed.
         # Show the form
         return self.async_show_form(
             step_id="reconfigure",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(
-                        "api_token", default=config_entry.data["api_token"]
-                    ): str,
-                    vol.Optional(
-                        "system_id", default=config_entry.data["system_id"]
-                    ): TextSelector(TextSelectorConfig(read_only=True)),
-                }
+            data_schema=vol.Schema(schema),
+            errors=errors,
+        )
+
+
+def _seconds_selector(minimum: int, maximum: int) -> NumberSelector:
+    """Return a selector for a number of seconds."""
+    return NumberSelector(
+        NumberSelectorConfig(
+            min=minimum,
+            max=maximum,
+            step=1,
+            unit_of_measurement="s",
+            mode=NumberSelectorMode.BOX,
+        )
+    )
+
+
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(
+            CONF_CONTROL_COOLDOWN, default=REQUEST_CONTROL_DEFAULT_COOLDOWN
+        ): _seconds_selector(0, 300),
+        vol.Required(
+            CONF_CONTROL_IMMEDIATE, default=REQUEST_CONTROL_DEFAULT_IMMEDIATE
+        ): BooleanSelector(),
+        vol.Required(
+            CONF_CONTROL_MAX_WAIT, default=REQUEST_CONTROL_DEFAULT_MAX_WAIT
+        ): _seconds_selector(0, 600),
+        vol.Required(
+            CONF_UPDATE_INTERVAL, default=UPDATE_INTERVAL.total_seconds() / 60
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=5,
+                max=1440,
+                step=1,
+                unit_of_measurement="min",
+                mode=NumberSelectorMode.BOX,
+            )
+        ),
+        vol.Required(
+            CONF_STATUS_MIN_INTERVAL, default=STATUS_MIN_INTERVAL.total_seconds()
+        ): _seconds_selector(10, 3600),
+        vol.Required(
+            CONF_STATUS_MAX_INTERVAL, default=STATUS_MAX_INTERVAL.total_seconds()
+        ): _seconds_selector(10, 3600),
+        vol.Required(
+            CONF_VERIFY_DELAY,
+            default=(
+                VERIFY_DEFAULT_DELAY.total_seconds() if VERIFY_DEFAULT_DELAY else 0
+            ),
+        ): _seconds_selector(0, 3600),
+        vol.Required(
+            CONF_VERIFY_RETRIES, default=VERIFY_DEFAULT_RETRIES
+        ): NumberSelector(
+            NumberSelectorConfig(min=0, max=5, step=1, mode=NumberSelectorMode.BOX)
+        ),
+    }
+)
+
+
+class PwCtrlOptionsFlow(config_entries.OptionsFlow):
+    """Powerwall Control options flow.
+
+    The options trade how quickly changes and readings are seen
+    against the number of calls made to Netzero. They are applied
+    without reloading the entry.
+    """
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None):
+        """Manage the options."""
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_CONTROL_MAX_WAIT] < user_input[CONF_CONTROL_COOLDOWN]:
+                errors["base"] = "invalid_max_wait"
+            elif (
+                user_input[CONF_STATUS_MIN_INTERVAL]
+                > user_input[CONF_STATUS_MAX_INTERVAL]
+            ):
+                errors["base"] = "invalid_status_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, user_input or self.config_entry.options
             ),
             errors=errors,
         )
@@ -134,5 +304,9 @@ class InvalidSystemId(exceptions.HomeAssistantError):
     """Error to indicate the System ID is invalid."""
 
 
+class InvalidUrl(exceptions.HomeAssistantError):
+    """Error to indicate the API base URL is invalid."""
+
+
 class CannotConnect(exceptions.HomeAssistantError):
     """Error to indicate we can't connect to Netzero."""
@@ -6,3 +6,16 @@ import logging
 DOMAIN = "powerwall_control"
 
 LOGGER = logging.getLogger(__package__)
+
+# Config entry options
+CONF_CONTROL_COOLDOWN = "control_cooldown"
+CONF_CONTROL_IMMEDIATE = "control_immediate"
+CONF_CONTROL_MAX_WAIT = "control_max_wait"
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_STATUS_MIN_INTERVAL = "status_min_interval"
+CONF_STATUS_MAX_INTERVAL = "status_max_interval"
+CONF_VERIFY_DELAY = "verify_delay"
+CONF_VERIFY_RETRIES = "verify_retries"
+
+# Fired when the grid status, island status or storm mode changes
+EVENT_STATUS_CHANGED = f"{DOMAIN}_status_changed"
@@ -1,13 +1,19 @@
 """Data update coordinator."""
 
+import asyncio
+from collections.abc import Callable, Iterable
 from datetime import timedelta
+from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.debounce import Debouncer
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from . import netzero
-from .const import DOMAIN, LOGGER
+from .const import DOMAIN, EVENT_STATUS_CHANGED, LOGGER
+from .debounce import MaxWaitDebouncer
 
 # This integration is making configuration data available, which
 # generally shouldn't be changing, except where an automation is
@@ -16,6 +22,32 @@ UPDATE_INTERVAL = timedelta(minutes=720)
 
 REQUEST_CONTROL_DEFAULT_COOLDOWN = 15
 REQUEST_CONTROL_DEFAULT_IMMEDIATE = False
+# Control changes are always sent within this many seconds, even while
+# further changes keep restarting the cooldown.
+REQUEST_CONTROL_DEFAULT_MAX_WAIT = 60
+
+# Applied changes are only verified against a later read of the
+# configuration if a delay is set. After the retries, changes which
+# still don't match are reported with a repair issue.
+VERIFY_DEFAULT_DELAY: timedelta | None = None
+VERIFY_DEFAULT_RETRIES = 1
+
+# Limits of the live status polling interval. It is shortened to the
+# minimum while readings change quickly, and backs off towards the
+# maximum while they are steady.
+STATUS_MIN_INTERVAL = timedelta(seconds=30)
+STATUS_MAX_INTERVAL = timedelta(minutes=5)
+
+# Change in battery, grid or load power (in W) between polls which
+# counts as the readings changing quickly.
+STATUS_POWER_SWING = 500
+
+# Live status fields for which transitions fire EVENT_STATUS_CHANGED
+STATUS_EVENT_FIELDS = ("grid_status", "island_status", "storm_mode_active")
+
+# Seconds to wait before writing a changed configuration snapshot, so
+# a burst of changes only writes once.
+SNAPSHOT_SAVE_DELAY = 10
 
 
 class PwCtrlCoordinator(DataUpdateCoordinator[netzero.EnergySiteConfig]):
@@ -29,56 +61,766 @@ class PwCtrlCoordinator(DataUpdateCoordinator[netzero.EnergySiteConfig]):
     In addition, the API allows all configs to be updated at
     once. Ideally this will accumulate these modifications into a
     single call.
+
+    Listeners may be registered against a set of EnergySiteConfig
+    field names, either with async_add_field_listener(), or by passing
+    a frozenset of names as the context to async_add_listener() (as
+    CoordinatorEntity does with its coordinator_context). These are
+    only called when one of their fields changes, or the availability
+    of the data changes.
+
+    Listeners may show requested changes optimistically, using
+    requested_value() and is_pending(). Listeners for the fields of a
+    request are called when it is made, and again when it is applied
+    or fails. Failed changes are rolled back rather than retried.
+
+    Reads of the configuration which were sent before a POST was
+    applied are dropped, as they may be older than its result.
+
+    If given a store, the last configuration read from netzero is
+    saved as a snapshot. Data restored from the snapshot with
+    async_set_stored_data() is marked stale until it is replaced by
+    data from netzero.
+
+    If verify_delay is set, applied changes are checked against the
+    configuration netzero returns at least that long after the last
+    POST, in case something else changed the site. If the status
+    coordinator's next poll is due within verify_delay after that, it
+    is used, so verification costs no extra calls. Otherwise a single
+    read is requested for all changes awaiting verification, through
+    the refresh debouncer. Changes which don't match are re-applied up
+    to verify_retries times, then reported with a repair issue.
     """
 
-    def __init__(self, hass: HomeAssistant, site: netzero.EnergySite) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        site: netzero.EnergySite,
+        store: Store[dict[str, Any]] | None = None,
+    ) -> None:
         """Initialize coordinator."""
         super().__init__(
             hass,
             logger=LOGGER,
             name=DOMAIN,
             update_interval=UPDATE_INTERVAL,
-            update_method=site.async_get_config,
-            # Filter out no-op updates
-            always_update=False,
+            # No-op updates are filtered per field in async_update_listeners
+            always_update=True,
         )
         # This object contains async functions to get updated data,
         # and set desired state.
         self.site = site
 
-        # List of things we want to set on the next config call
-        self._reconfig_dict = {}
+        # Snapshot of the last good configuration, and the
+        # configuration last written to it.
+        self._store = store
+        self._saved_data: netzero.EnergySiteConfig | None = None
+
+        # Whether data is from the snapshot rather than netzero.
+        self.stale = False
+
+        # Data, availability and staleness as last seen by listeners, and the
+        # fields changed since then. None means everything changed.
+        self._notified_data: netzero.EnergySiteConfig | None = None
+        self._notified_success = False
+        self._notified_stale = False
+        self._changed_fields: frozenset[str] | None = None
+
+        # Fields of batches applied since listeners were last called,
+        # which listeners showing them as pending need to know about.
+        self._requested_fields: set[str] = set()
+
+        # Changes to set are double buffered. Requests accumulate in
+        # _pending, which is swapped out whole to become the in-flight
+        # batch when it is sent. Anything requested while a batch is
+        # in flight accumulates in the new _pending, and rolls into
+        # the next batch.
+        self._pending: dict[str, Any] = {}
+        self._inflight: dict[str, Any] | None = None
+
+        # Held while a batch is being sent, so batches are applied in
+        # the order they were requested.
+        self._control_lock = asyncio.Lock()
+
+        # Number of async_set_config_now() calls waiting to send the
+        # pending changes, which the debouncer mustn't take from them.
+        self._flushing = 0
 
-        self._debounced_control = Debouncer(
+        # Generation of the latest control request, and of the latest
+        # request known to have been applied by netzero.
+        self.requested_generation = 0
+        self.applied_generation = 0
+
+        # Number of POSTs applied. A read which was sent before one was
+        # applied may be older than its result, so isn't used.
+        self.applied_posts = 0
+
+        # Number of requested field changes dropped because they
+        # matched the known configuration, so needed no POST.
+        self.suppressed_writes = 0
+
+        # Applied changes awaiting verification, whether the next data
+        # from netzero should be checked against them, and the number
+        # of times they have been re-applied.
+        self.verify_delay = VERIFY_DEFAULT_DELAY
+        self.verify_retries = VERIFY_DEFAULT_RETRIES
+        self._verify_expected: dict[str, Any] = {}
+        self._verify_due = False
+        self._verify_attempts = 0
+        self._unsub_verify: CALLBACK_TYPE | None = None
+        # Event loop time by which a status poll must be due to be
+        # used for verification, rather than requesting a read.
+        self._verify_deadline = 0.0
+        # Coordinator polling the live status, which passes on the
+        # configuration, set by the status coordinator itself.
+        self.status_coordinator: PwCtrlStatusCoordinator | None = None
+        self._verify_job = HassJob(
+            self._async_verify_due,
+            f"{self.name} verify",
+            cancel_on_shutdown=True,
+        )
+
+        self._debounced_control = MaxWaitDebouncer(
             hass,
             logger=LOGGER,
             cooldown=REQUEST_CONTROL_DEFAULT_COOLDOWN,
             immediate=REQUEST_CONTROL_DEFAULT_IMMEDIATE,
+            max_wait=REQUEST_CONTROL_DEFAULT_MAX_WAIT,
             function=self._async_control,
         )
 
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates.
+
+        A context which is a frozenset is treated as the field names
+        the listener depends on.
+        """
+        if isinstance(context, frozenset):
+            return self.async_add_field_listener(context, update_callback)
+        return super().async_add_listener(update_callback, context)
+
+    @callback
+    def async_add_field_listener(
+        self, fields: Iterable[str], update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for data updates which change any of the given fields."""
+        fields = frozenset(fields)
+        if unknown := fields - netzero.CONFIG_FIELDS:
+            raise ValueError(f"Unknown config fields {sorted(unknown)}")
+
+        # A new listener hasn't seen any data yet, so always gets the
+        # next update.
+        seen = False
+
+        @callback
+        def _field_listener() -> None:
+            nonlocal seen
+            changed = self._changed_fields
+            if not seen or changed is None or not fields.isdisjoint(changed):
+                seen = True
+                update_callback()
+
+        return super().async_add_listener(_field_listener, fields)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, working out which fields have changed."""
+        previous = self._notified_data
+        if (
+            previous is None
+            or self.data is None
+            or self.last_update_success != self._notified_success
+            or self.stale != self._notified_stale
+        ):
+            self._changed_fields = None
+        else:
+            self._changed_fields = self.data.diff(previous) | self._requested_fields
+        self._requested_fields.clear()
+        self._notified_data = self.data
+        self._notified_success = self.last_update_success
+        self._notified_stale = self.stale
+
+        super().async_update_listeners()
+
+    async def _async_update_data(self) -> netzero.EnergySiteConfig:
+        """Fetch the configuration from netzero."""
+        applied_posts = self.applied_posts
+        config = await self.site.async_get_config()
+        if self.applied_posts != applied_posts and self.data is not None:
+            # Keep the newer configuration returned by the POST
+            return self.data
+        return config
+
+    @callback
+    def async_set_read_data(
+        self, data: netzero.EnergySiteConfig, applied_posts: int
+    ) -> None:
+        """Update listeners with data read from netzero by someone else.
+
+        applied_posts is the value of the attribute when the read was
+        sent. If a POST has been applied since, its result may be
+        newer than the data, which is dropped.
+        """
+        if self.applied_posts != applied_posts:
+            self.logger.debug(
+                "%s configuration read overlapped a POST, so was dropped", self.name
+            )
+            return
+        self.async_set_updated_data(data)
+
+    @callback
+    def async_set_stored_data(self, data: netzero.EnergySiteConfig) -> None:
+        """Update listeners with data restored from the snapshot.
+
+        The data is treated as stale until netzero next returns data.
+        """
+        self.stale = True
+        self._saved_data = data
+        super().async_set_updated_data(data)
+
+    @callback
+    def async_set_updated_data(self, data: netzero.EnergySiteConfig) -> None:
+        """Update listeners with data from netzero, and save a snapshot."""
+        self.stale = False
+        super().async_set_updated_data(data)
+        self._async_save_snapshot()
+        self._async_check_verify()
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Handle a refresh from netzero finishing."""
+        if self.last_update_success and self.data is not None:
+            self.stale = False
+            self._async_save_snapshot()
+            self._async_check_verify()
+
+    @callback
+    def _async_save_snapshot(self) -> None:
+        """Schedule a snapshot save if the configuration has changed."""
+        if self._store is None or self.data is None or self.data == self._saved_data:
+            return
+        self._saved_data = self.data
+        self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the snapshot to be written to the store."""
+        return {
+            "site_id": self._saved_data.site_id,
+            "config": self._saved_data.raw_data,
+        }
+
+    @callback
+    def async_set_options(
+        self,
+        *,
+        update_interval: timedelta,
+        cooldown: float,
+        immediate: bool,
+        max_wait: float | None,
+        verify_delay: timedelta | None,
+        verify_retries: int,
+    ) -> None:
+        """Apply new polling, control debounce and verification options.
+
+        These take effect straight away. The next poll is rescheduled
+        for the new interval, and the debouncer uses the new cooldown,
+        edge and maximum wait from the next control request. Turning
+        verification off drops any changes awaiting it.
+        """
+        self._debounced_control.cooldown = cooldown
+        self._debounced_control.immediate = immediate
+        self._debounced_control.max_wait = max_wait
+        self.verify_delay = verify_delay
+        self.verify_retries = verify_retries
+        if verify_delay is None:
+            self._async_cancel_verify()
+        if update_interval != self.update_interval:
+            self.update_interval = update_interval
+            if self._listeners:
+                self._schedule_refresh()
+
     async def async_shutdown(self) -> None:
         """Cancel any scheduled call, and ignore new runs."""
         await super().async_shutdown()
         self._debounced_control.async_shutdown()
+        self._async_cancel_verify()
 
     async def async_request_control(self, **kwargs) -> None:
         """Pass requests for control to netzero.
 
-        Add the request to a list, and then set a debounce to actually
-        make the change.
+        Add the request to the pending changes, and then set a
+        debounce to actually make the change. Changes to the value
+        the site already has (or will have once the in-flight batch
+        is applied) are dropped, cancelling any pending change to
+        that field. While changes wait out the debounce, a connection
+        to netzero is opened, ready to send them.
+        """
+        if not kwargs:
+            return
+        self.requested_generation += 1
+        queued = bool(self._pending)
+
+        for name, value in kwargs.items():
+            if self._is_expected_value(name, value):
+                self._pending.pop(name, None)
+                self.suppressed_writes += 1
+            else:
+                self._pending[name] = value
+        self._async_update_requested(kwargs)
+
+        if self._pending:
+            await self._debounced_control.async_call()
+            if self._pending and not queued:
+                self._async_prewarm()
+        elif self._inflight is None:
+            # Nothing to send, so the site is already as requested
+            self.applied_generation = self.requested_generation
+
+    @callback
+    def _async_prewarm(self) -> None:
+        """Open a connection while queued changes wait out the cooldown.
+
+        After a long idle period the pooled connections have expired,
+        so this saves the handshakes from delaying the POST.
+        """
+        self.hass.async_create_background_task(
+            self.site.async_prewarm(), f"{self.name} prewarm"
+        )
+
+    def requested_value(self, name: str) -> Any:
+        """Return the value of a field, once requested changes are applied."""
+        if name in self._pending:
+            return self._pending[name]
+        if self._inflight is not None and name in self._inflight:
+            return self._inflight[name]
+        return None if self.data is None else getattr(self.data, name)
+
+    def is_pending(self, name: str) -> bool:
+        """Whether a change to a field has not been applied yet."""
+        return name in self._pending or (
+            self._inflight is not None and name in self._inflight
+        )
+
+    @callback
+    def _async_update_requested(self, names: Iterable[str]) -> None:
+        """Call the field listeners for fields whose requested value changed.
+
+        The data hasn't changed, so other listeners aren't called.
+        """
+        changed_fields = self._changed_fields
+        self._changed_fields = frozenset(names)
+        try:
+            for update_callback, context in list(self._listeners.values()):
+                if isinstance(context, frozenset):
+                    update_callback()
+        finally:
+            self._changed_fields = changed_fields
+
+    def _is_expected_value(self, name: str, value: Any) -> bool:
+        """Whether a field is expected to have the value without a new POST."""
+        if self._inflight is not None and name in self._inflight:
+            return self._inflight[name] == value
+        return self.data is not None and getattr(self.data, name) == value
+
+    @callback
+    def _async_control(self) -> None:
+        """Start sending the pending changes to netzero.
+
+        This only swaps the pending changes for the in-flight batch,
+        so the debouncer is never held up by the request. If a batch
+        is already in flight, the pending changes are scheduled again
+        when it completes. Nothing is sent while async_set_config_now()
+        is waiting to send the pending changes itself; it schedules
+        anything left over when it is done.
         """
-        self._reconfig_dict.update(kwargs)
-        await self._debounced_control.async_call()
+        if self._shutdown_requested or self._inflight is not None or self._flushing:
+            return
+
+        # The data may have been refreshed since the changes were
+        # requested, so check for no-op changes again.
+        for name, value in list(self._pending.items()):
+            if self._is_expected_value(name, value):
+                del self._pending[name]
+                self.suppressed_writes += 1
+        if not self._pending:
+            self.applied_generation = self.requested_generation
+            return
+
+        self._inflight, self._pending = self._pending, {}
+        self.hass.async_create_task(
+            self._async_send_control(self.requested_generation),
+            f"{self.name} control",
+            eager_start=True,
+        )
+
+    async def _async_send_control(self, generation: int) -> None:
+        """Send the in-flight batch, and update listeners with the result."""
+        batch = self._inflight
+        try:
+            async with self._control_lock:
+                # Pass the accumulated configuration changes to netzero
+                updated_config = await self.site.async_set_config(**batch)
+        except Exception:
+            # Roll back the batch, leaving anything requested since
+            self._inflight = None
+            self.logger.exception("Error setting %s configuration", self.name)
+            self._async_update_requested(batch)
+        else:
+            self._inflight = None
+            self.applied_generation = generation
+            self.applied_posts += 1
+            self._async_schedule_verify(batch)
+
+            # Update listeners with any new values, and those showing
+            # the batch as pending.
+            self._requested_fields.update(batch)
+            self.async_set_updated_data(updated_config)
+
+        # Send anything requested while this batch was in flight
+        if self.requested_generation > generation:
+            self._debounced_control.async_schedule_call()
+
+    async def async_set_config_now(self, **kwargs) -> netzero.EnergySiteConfig:
+        """Send changes to netzero immediately, without debouncing.
+
+        The changes are merged with any pending changes, and sent in a
+        single POST once any in-flight batch completes. Changes which
+        match the known configuration are dropped as no-ops. Returns
+        the updated configuration. If the POST fails, the changes are
+        rolled back, and the exception is raised.
+        """
+        self.requested_generation += 1
+        generation = self.requested_generation
+        self._pending |= kwargs
+        self._debounced_control.async_cancel()
+        self._async_update_requested(kwargs)
+
+        self._flushing += 1
+        try:
+            async with self._control_lock:
+                for name, value in list(self._pending.items()):
+                    if self._is_expected_value(name, value):
+                        del self._pending[name]
+                        self.suppressed_writes += 1
+                if not self._pending:
+                    self.applied_generation = generation
+                    return self.data
+
+                batch = self._inflight = self._pending
+                self._pending = {}
+                try:
+                    updated_config = await self.site.async_set_config(**batch)
+                except Exception:
+                    self._inflight = None
+                    self._async_update_requested(batch)
+                    raise
+                self._inflight = None
+                self.applied_generation = generation
+                self.applied_posts += 1
+                self._async_schedule_verify(batch)
+                self._requested_fields.update(batch)
+                self.async_set_updated_data(updated_config)
+                return updated_config
+        finally:
+            self._flushing -= 1
+            # Send anything requested while this batch was in flight
+            if self.requested_generation > generation:
+                self._debounced_control.async_schedule_call()
+
+    @callback
+    def _async_schedule_verify(self, batch: dict[str, Any]) -> None:
+        """Add an applied batch to the changes awaiting verification.
+
+        Verification of all the changes is put off until verify_delay
+        after this batch, so they are all checked with a single read.
+        """
+        if self.verify_delay is None:
+            return
+        self._verify_expected |= batch
+        self._verify_due = False
+        if self._unsub_verify is not None:
+            self._unsub_verify()
+        delay = self.verify_delay.total_seconds()
+        self._verify_deadline = self.hass.loop.time() + 2 * delay
+        self._unsub_verify = async_call_later(self.hass, delay, self._verify_job)
+
+    @callback
+    def _async_cancel_verify(self) -> None:
+        """Drop any changes awaiting verification."""
+        if self._unsub_verify is not None:
+            self._unsub_verify()
+            self._unsub_verify = None
+        self._verify_expected.clear()
+        self._verify_due = False
+        self._verify_attempts = 0
+
+    async def _async_verify_due(self, _now: Any) -> None:
+        """Verify changes against the next configuration from netzero.
+
+        If a status poll is due before verify_delay has passed again,
+        its configuration is used. Otherwise a read is requested.
+        Refresh requests are debounced, and the refresh puts off the
+        next scheduled poll. If the read fails, the next data from
+        netzero is used instead.
+        """
+        self._unsub_verify = None
+        self._verify_due = True
+        if self.status_coordinator is not None:
+            next_poll = self.status_coordinator.next_poll_time()
+            if next_poll is not None and next_poll <= self._verify_deadline:
+                return
+        await self.async_request_refresh()
+
+    @callback
+    def _async_check_verify(self) -> None:
+        """Check data from netzero against the changes awaiting verification.
+
+        Fields with a change pending are skipped, as they will be
+        verified once that is applied.
+        """
+        if not self._verify_due or self.data is None:
+            return
+        expected = self._verify_expected
+        self._verify_expected = {}
+        self._verify_due = False
+        drift = {
+            name: value
+            for name, value in expected.items()
+            if not self.is_pending(name) and getattr(self.data, name) != value
+        }
+        issue_id = f"config_drift_{self.data.site_id}"
+        if not drift:
+            self._verify_attempts = 0
+            ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+            return
 
-    async def _async_control(self) -> None:
-        """Invoke the control call, and update listeners with result."""
-        if self._shutdown_requested:
+        if self._verify_attempts < self.verify_retries:
+            self._verify_attempts += 1
+            self.logger.warning(
+                "%s configuration differs from the changes applied, re-applying %s",
+                self.name,
+                drift,
+            )
+            self.hass.async_create_task(
+                self.async_request_control(**drift),
+                f"{self.name} re-apply",
+                eager_start=True,
+            )
             return
 
-        # Pass the accumulated configuration changes to netzero
-        updated_config = await self.site.async_set_config(**self._reconfig_dict)
-        self._reconfig_dict.clear()
+        self._verify_attempts = 0
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="config_drift",
+            translation_placeholders={
+                "site_id": str(self.data.site_id),
+                "fields": ", ".join(sorted(drift)),
+            },
+        )
+
+
+class PwCtrlStatusCoordinator(DataUpdateCoordinator[netzero.EnergySiteStatus | None]):
+    """Class used to poll the live status of the site.
+
+    Netzero only returns the live status along with the configuration,
+    so each poll also passes the configuration on to the configuration
+    coordinator. That puts off its own (much less frequent) polling,
+    so the two don't make duplicate calls.
+
+    The polling interval adapts to the readings. It drops to
+    min_interval while they are changing quickly, or the site is off
+    grid, and doubles towards max_interval on each poll while they are
+    steady.
+
+    When the grid status, island status or storm mode changes between
+    polls, an EVENT_STATUS_CHANGED event is fired for each field that
+    changed, after listeners have been updated. Status restored from
+    the snapshot isn't compared against.
+
+    Listeners may be registered against a single wall connector, by
+    passing its DIN as the context to async_add_listener() (as
+    CoordinatorEntity does with its coordinator_context). These are
+    only called when that wall connector appears or changes, or the
+    availability of the data changes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_coordinator: PwCtrlCoordinator,
+        min_interval: timedelta = STATUS_MIN_INTERVAL,
+        max_interval: timedelta = STATUS_MAX_INTERVAL,
+    ) -> None:
+        """Initialize coordinator."""
+        super().__init__(
+            hass,
+            logger=LOGGER,
+            name=f"{DOMAIN} status",
+            update_interval=min_interval,
+        )
+        self.config_coordinator = config_coordinator
+        config_coordinator.status_coordinator = self
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        # Data, availability and staleness as last seen by listeners,
+        # and the wall connectors added or changed since then. None
+        # means everything changed.
+        self._notified_data: netzero.EnergySiteStatus | None = None
+        self._notified_success = False
+        self._notified_stale = False
+        self._changed_wall_connectors: frozenset[str] | None = None
+
+        # Status last checked for transitions
+        self._event_status: netzero.EnergySiteStatus | None = None
+
+        # Event loop time the next poll is scheduled for
+        self._next_poll = 0.0
+
+    @property
+    def stale(self) -> bool:
+        """Whether data is from the snapshot rather than netzero."""
+        return self.config_coordinator.stale
+
+    async def _async_update_data(self) -> netzero.EnergySiteStatus | None:
+        """Fetch the live status, and pass on the configuration with it."""
+        applied_posts = self.config_coordinator.applied_posts
+        config = await self.config_coordinator.site.async_get_config()
+        self.config_coordinator.async_set_read_data(config, applied_posts)
+
+        status = config.live_status
+        self.update_interval = self._next_interval(self.data, status)
+        return status
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll, and note when it is due."""
+        super()._schedule_refresh()
+        if self.update_interval is not None:
+            self._next_poll = (
+                self.hass.loop.time() + self.update_interval.total_seconds()
+            )
+
+    @callback
+    def next_poll_time(self) -> float | None:
+        """Return the event loop time of the next poll, if one is scheduled.
+
+        This is within a second of the actual time, which the base
+        class spreads out.
+        """
+        if self._unsub_refresh is None:
+            return None
+        return self._next_poll
+
+    @callback
+    def async_set_intervals(
+        self, min_interval: timedelta, max_interval: timedelta
+    ) -> None:
+        """Apply new polling interval limits.
+
+        The current interval is brought within the new limits, and the
+        next poll rescheduled if that changes it.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        interval = min(max(self.update_interval, min_interval), max_interval)
+        if interval != self.update_interval:
+            self.update_interval = interval
+            if self._listeners:
+                self._schedule_refresh()
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates.
+
+        A context which is a str is treated as the DIN of the wall
+        connector the listener depends on.
+        """
+        if not isinstance(context, str):
+            return super().async_add_listener(update_callback, context)
+
+        # Wall connector entities are added once there is data, and
+        # start from it, so only need later changes.
+        @callback
+        def _wall_connector_listener() -> None:
+            changed = self._changed_wall_connectors
+            if changed is None or context in changed:
+                update_callback()
+
+        return super().async_add_listener(_wall_connector_listener, context)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, then fire events for any transitions."""
+        previous = self._notified_data
+        if (
+            previous is None
+            or self.data is None
+            or self.last_update_success != self._notified_success
+            or self.stale != self._notified_stale
+        ):
+            self._changed_wall_connectors = None
+        else:
+            diff = self.data.diff_wall_connectors(previous)
+            self._changed_wall_connectors = diff.added | diff.changed
+        self._notified_data = self.data
+        self._notified_success = self.last_update_success
+        self._notified_stale = self.stale
+
+        super().async_update_listeners()
+
+        previous, status = self._event_status, self.data
+        # Data restored from the snapshot may be long out of date, so
+        # transitions are only tracked from the first data from netzero.
+        if status is None or self.stale:
+            return
+        self._event_status = status
+        if previous is None or previous is status:
+            return
+        for name in STATUS_EVENT_FIELDS:
+            old, new = getattr(previous, name), getattr(status, name)
+            if old != new:
+                self.hass.bus.async_fire(
+                    EVENT_STATUS_CHANGED,
+                    {
+                        "site_id": status.site_id,
+                        "field": name,
+                        "old_value": old,
+                        "new_value": new,
+                    },
+                )
 
-        # Update listeners with any new values
-        self.async_set_updated_data(updated_config)
+    def _next_interval(
+        self,
+        previous: netzero.EnergySiteStatus | None,
+        status: netzero.EnergySiteStatus | None,
+    ) -> timedelta:
+        """Return the interval until the poll after a new status."""
+        if status is None:
+            # Nothing to watch
+            return self.max_interval
+        if (
+            status.grid_status != netzero.GridStatus.ACTIVE
+            or status.island_status != netzero.IslandStatus.ON_GRID
+            or previous is None
+            or previous.grid_status != status.grid_status
+            or previous.island_status != status.island_status
+            or previous.storm_mode_active != status.storm_mode_active
+            or any(
+                abs(getattr(status, name) - getattr(previous, name))
+                >= STATUS_POWER_SWING
+                for name in ("battery_power", "grid_power", "load_power")
+            )
+        ):
+            return self.min_interval
+        return min(self.update_interval * 2, self.max_interval)
@@ -0,0 +1,146 @@
+"""Debouncer with a bound on how long calls wait."""
+
+import asyncio
+from collections.abc import Callable
+from logging import Logger
+from typing import Any
+
+from homeassistant.core import HassJob, HomeAssistant, callback
+
+
+class MaxWaitDebouncer:
+    """Class to coalesce calls to a function, within a maximum latency.
+
+    Each call restarts the cooldown, so a burst of calls results in a
+    single call of the function once the calls stop for cooldown
+    seconds. However long the burst goes on, the function is called
+    within max_wait seconds of the first call it has not yet served.
+    A max_wait of None leaves that unbounded.
+
+    If immediate is set, a call after a quiet period of at least
+    cooldown seconds calls the function straight away, and any further
+    calls are then debounced as above.
+
+    The function may be a callback or a coroutine function. Only one
+    run of the function happens at a time. Calls which become due
+    while it is running are served when it completes.
+
+    This has the interface of Home Assistant's Debouncer used by the
+    coordinator, and its cooldown, immediate and max_wait attributes
+    may be changed at any time.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: Logger,
+        *,
+        cooldown: float,
+        immediate: bool,
+        max_wait: float | None,
+        function: Callable[[], Any],
+    ) -> None:
+        """Initialize debounce."""
+        self.hass = hass
+        self.logger = logger
+        self.cooldown = cooldown
+        self.immediate = immediate
+        self.max_wait = max_wait
+        self._job: HassJob[[], Any] | None = HassJob(
+            function, f"debouncer cooldown={cooldown}, max_wait={max_wait}"
+        )
+
+        # Loop time of the first call not yet served, None if there
+        # is no such call.
+        self._pending_since: float | None = None
+        # Loop time until which a call can't fire on the leading edge
+        self._quiet_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: asyncio.Future | None = None
+        self._shutdown_requested = False
+
+    @property
+    def pending(self) -> bool:
+        """Whether there is a call waiting for the function to run."""
+        return self._pending_since is not None
+
+    async def async_call(self) -> None:
+        """Call the function, subject to the debounce."""
+        self.async_schedule_call()
+
+    @callback
+    def async_schedule_call(self) -> None:
+        """Schedule a call to the function."""
+        if self._shutdown_requested:
+            self.logger.debug("Debouncer call ignored as shutdown has been requested.")
+            return
+
+        now = self.hass.loop.time()
+        leading = now >= self._quiet_until
+        self._quiet_until = now + self.cooldown
+        if self._pending_since is None:
+            self._pending_since = now
+            if self.immediate and leading and self._running is None:
+                self._async_run()
+                return
+
+        due = now + self.cooldown
+        if self.max_wait is not None:
+            due = min(due, self._pending_since + self.max_wait)
+        self._async_cancel_timer()
+        self._timer = self.hass.loop.call_at(due, self._async_on_timer)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel any scheduled call."""
+        self._async_cancel_timer()
+        self._pending_since = None
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel any scheduled call, and prevent new runs."""
+        self._shutdown_requested = True
+        self.async_cancel()
+        # Release the reference to the function
+        self._job = None
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the timer, if running."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    @callback
+    def _async_on_timer(self) -> None:
+        """Run the function for the pending calls, when the timer fires."""
+        self._timer = None
+        # If the function is running, this runs when it completes
+        if self._running is None:
+            self._async_run()
+
+    @callback
+    def _async_run(self) -> None:
+        """Run the function, serving all the pending calls."""
+        if self._pending_since is None or self._job is None:
+            return
+        self._pending_since = None
+        self._quiet_until = self.hass.loop.time() + self.cooldown
+        try:
+            task = self.hass.async_run_hass_job(self._job)
+        except Exception:
+            self.logger.exception("Unexpected exception from %s", self._job)
+            return
+        if task is not None:
+            self._running = task
+            task.add_done_callback(self._async_run_done)
+
+    @callback
+    def _async_run_done(self, task: asyncio.Future) -> None:
+        """Handle the function completing."""
+        self._running = None
+        if not task.cancelled() and (err := task.exception()) is not None:
+            self.logger.error("Unexpected exception from %s", self._job, exc_info=err)
+        # Serve calls which became due while it was running
+        if self._timer is None:
+            self._async_run()
@@ -0,0 +1,31 @@
+"""Diagnostics support for Tesla Powerwall Control."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant
+
+from . import PwCtrlConfigEntry
+
+TO_REDACT = {"api_token"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: PwCtrlConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "config": None if coordinator.data is None else coordinator.data.raw_data,
+        "stale": coordinator.stale,
+        "control": {
+            "requested_generation": coordinator.requested_generation,
+            "applied_generation": coordinator.applied_generation,
+            "applied_posts": coordinator.applied_posts,
+            "suppressed_writes": coordinator.suppressed_writes,
+        },
+    }
@@ -0,0 +1,55 @@
+"""Base entity for Powerwall Control."""
+
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import PwCtrlCoordinator, PwCtrlStatusCoordinator
+
+
+class PwCtrlEntity[_CoordinatorT: PwCtrlCoordinator | PwCtrlStatusCoordinator](
+    CoordinatorEntity[_CoordinatorT]
+):
+    """Base class for entities driven by a coordinator.
+
+    While the coordinator only has data restored from the snapshot,
+    entities stay available with that data, and have a stale
+    attribute set. Entities whose fields have a control change which
+    hasn't been confirmed yet have a pending attribute set.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: _CoordinatorT,
+        device_info: DeviceInfo,
+        fields: Iterable[str] | None = None,
+    ) -> None:
+        """Initialize the entity.
+
+        If fields are given, the entity is only woken up when any of
+        those fields change.
+        """
+        self._attr_device_info = device_info
+        self._fields = frozenset(fields or ())
+        super().__init__(coordinator, None if fields is None else frozenset(fields))
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available or self.coordinator.stale
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the state attributes."""
+        attrs: dict[str, Any] = {}
+        if self.coordinator.stale:
+            attrs["stale"] = True
+        if isinstance(self.coordinator, PwCtrlCoordinator) and any(
+            self.coordinator.is_pending(name) for name in self._fields
+        ):
+            attrs["pending"] = True
+        return attrs or None
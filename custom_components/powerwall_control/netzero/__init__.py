@@ -1,13 +1,33 @@
 """Netzero Developer API package."""
 
 from .netzero import (
+    CONFIG_FIELDS as CONFIG_FIELDS,
+    DEFAULT_FLEET_CONCURRENCY as DEFAULT_FLEET_CONCURRENCY,
+    DEFAULT_FLEET_TIMEOUT as DEFAULT_FLEET_TIMEOUT,
+    DEFAULT_HOST as DEFAULT_HOST,
+    DEFAULT_RATE_LIMIT as DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT_BURST as DEFAULT_RATE_LIMIT_BURST,
+    AiohttpTransport as AiohttpTransport,
     Auth as Auth,
+    ConnectionOptions as ConnectionOptions,
     EnergyExportMode as EnergyExportMode,
     EnergySite as EnergySite,
     EnergySiteConfig as EnergySiteConfig,
+    EnergySiteFleet as EnergySiteFleet,
     EnergySiteStatus as EnergySiteStatus,
+    FleetResult as FleetResult,
     GridStatus as GridStatus,
     IslandStatus as IslandStatus,
+    MemoryRequest as MemoryRequest,
+    MemoryResponse as MemoryResponse,
+    MemoryTransport as MemoryTransport,
     OperationalMode as OperationalMode,
+    RateLimiter as RateLimiter,
+    Response as Response,
+    RetryPolicy as RetryPolicy,
+    Transport as Transport,
     WallConnector as WallConnector,
+    WallConnectorDiff as WallConnectorDiff,
+    create_session as create_session,
+    outcome_unknown as outcome_unknown,
 )
@@ -1,10 +1,33 @@
 """API library for access to Netzero Developer API."""
 
-from datetime import datetime
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from enum import StrEnum
-from typing import Any
-
-from aiohttp import ClientResponse, ClientSession
+from http import HTTPStatus
+import json as jsonlib
+import random
+from types import MappingProxyType
+from typing import Any, ClassVar, Protocol, Self
+from weakref import WeakValueDictionary
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientConnectorError,
+    ClientError,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    ConnectionTimeoutError,
+    RequestInfo,
+    TCPConnector,
+    hdrs,
+)
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
 
 
 class OperationalMode(StrEnum):
@@ -37,35 +60,565 @@ class IslandStatus(StrEnum):
     OFF_GRID = "off_grid"
 
 
-class Auth:
-    """Class to make authenticated requests."""
+@dataclass(frozen=True, slots=True)
+class ConnectionOptions:
+    """Tuning for a dedicated connection pool to the Netzero API.
+
+    Attributes:
+        limit_per_host: Maximum simultaneous connections to the API host.
+        ttl_dns_cache: Seconds to cache DNS lookups for.
+        keepalive_timeout: Seconds to keep an idle connection open for
+            reuse.
+    """
+
+    limit_per_host: int = 4
+    ttl_dns_cache: int = 300
+    keepalive_timeout: float = 120
+
+
+def create_session(options: ConnectionOptions | None = None) -> ClientSession:
+    """Create a ClientSession with a connection pool tuned for the API.
+
+    Must be called from a coroutine. The caller is responsible for
+    closing the session.
+    """
+    if options is None:
+        options = ConnectionOptions()
+    connector = TCPConnector(
+        limit_per_host=options.limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=options.ttl_dns_cache,
+        keepalive_timeout=options.keepalive_timeout,
+    )
+    return ClientSession(connector=connector)
+
+
+class Response(Protocol):
+    """Response to a request made through a Transport.
+
+    aiohttp's ClientResponse is one.
+    """
+
+    @property
+    def status(self) -> int:
+        """HTTP status."""
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        """Response headers, with case insensitive names."""
+
+    def raise_for_status(self) -> None:
+        """Raise ClientResponseError if the status is 400 or over."""
+
+    async def json(self) -> Any:
+        """Decode the body as JSON."""
+
+    def release(self) -> Any:
+        """Release the connection, without reading the body."""
+
+
+class Transport(Protocol):
+    """How Auth sends requests.
+
+    Implementations raise the aiohttp exceptions for failures, so the
+    retry policy applies to them as it does to AiohttpTransport.
+    """
+
+    async def async_request(self, method: str, url: str, **kwargs) -> Response:
+        """Send a request, with the keyword arguments of ClientSession.request."""
+
+    async def async_close(self) -> None:
+        """Release any resources held by the transport."""
+
+
+class AiohttpTransport:
+    """Transport sending requests with an aiohttp ClientSession."""
+
+    def __init__(self, websession: ClientSession, *, owns_session: bool) -> None:
+        """Initialize the transport.
+
+        If owns_session is set, the session is closed with the
+        transport.
+        """
+        self.websession = websession
+        self._owns_session = owns_session
+
+    async def async_request(self, method: str, url: str, **kwargs) -> Response:
+        """Send a request through the session."""
+        return await self.websession.request(method, url, **kwargs)
+
+    async def async_close(self) -> None:
+        """Close the session, if it is owned by the transport."""
+        if self._owns_session:
+            await self.websession.close()
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryRequest:
+    """Request passed to the handler of a MemoryTransport."""
+
+    method: str
+    url: URL
+    headers: CIMultiDictProxy[str]
+    json: Any = None
+
+
+@dataclass(slots=True)
+class MemoryResponse:
+    """Response returned by the handler of a MemoryTransport.
+
+    Attributes:
+        status: HTTP status.
+        body: Encoded body, decoded by json().
+        headers: Response headers.
+        request: The request responded to, set by the transport.
+    """
+
+    status: int
+    body: bytes = b""
+    headers: CIMultiDict[str] = field(default_factory=CIMultiDict)
+    request: MemoryRequest | None = None
+
+    @classmethod
+    def from_json(
+        cls, data: Any, status: int = 200, headers: Mapping[str, str] | None = None
+    ) -> "MemoryResponse":
+        """Return a response with a JSON body."""
+        headers = CIMultiDict(headers or {})
+        headers.setdefault(hdrs.CONTENT_TYPE, "application/json")
+        return cls(status, jsonlib.dumps(data).encode(), headers)
+
+    def raise_for_status(self) -> None:
+        """Raise ClientResponseError if the status is 400 or over."""
+        if self.status < 400:
+            return
+        request = self.request
+        url = URL() if request is None else request.url
+        raise ClientResponseError(
+            RequestInfo(
+                url,
+                "" if request is None else request.method,
+                CIMultiDictProxy(CIMultiDict()) if request is None else request.headers,
+                url,
+            ),
+            (),
+            status=self.status,
+            message=HTTPStatus(self.status).phrase,
+            headers=CIMultiDictProxy(self.headers),
+        )
+
+    async def json(self) -> Any:
+        """Decode the body as JSON."""
+        return jsonlib.loads(self.body)
+
+    def release(self) -> None:
+        """Do nothing, as there is no connection."""
+
+
+class MemoryTransport:
+    """Transport calling a handler in the same process, without sockets.
+
+    This is intended for tests and benchmarks. The handler is passed
+    each request, and returns the response. It may raise aiohttp
+    exceptions, such as ClientConnectionError, to simulate failures.
+    A timeout's total or sock_read, whichever is shorter, is applied
+    to the handler, as there is no connection to wait for. Other
+    keyword arguments used only by aiohttp, such as ssl, are ignored.
+    """
+
+    def __init__(
+        self, handler: Callable[[MemoryRequest], Awaitable[MemoryResponse]]
+    ) -> None:
+        """Initialize the transport with the handler for requests."""
+        self.handler = handler
+
+    async def async_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        json: Any = None,
+        timeout: ClientTimeout | None = None,
+        **kwargs,
+    ) -> Response:
+        """Pass a request to the handler."""
+        request = MemoryRequest(
+            method.upper(),
+            URL(url),
+            CIMultiDictProxy(CIMultiDict(headers or {})),
+            # Pass a copy, as the body would be over the network
+            None if json is None else jsonlib.loads(jsonlib.dumps(json)),
+        )
+        limit = None
+        if timeout is not None:
+            limits = [t for t in (timeout.total, timeout.sock_read) if t is not None]
+            limit = min(limits, default=None)
+        async with asyncio.timeout(limit):
+            response = await self.handler(request)
+        response.request = request
+        return response
+
+    async def async_close(self) -> None:
+        """Do nothing, as there is nothing to release."""
+
+
+# Base URL of the Netzero Developer API
+DEFAULT_HOST = "https://api.netzero.energy/api/v1"
+
+# Default requests per second allowed for each API token, and the
+# size of burst allowed
+DEFAULT_RATE_LIMIT = 1.0
+DEFAULT_RATE_LIMIT_BURST = 10
+
+# Default sites an EnergySiteFleet calls at once, and seconds allowed
+# for each site's call
+DEFAULT_FLEET_CONCURRENCY = 8
+DEFAULT_FLEET_TIMEOUT = 30.0
+
+# Methods which can always be repeated safely
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Statuses which mean the server did not act on the request, so that
+# any request can be retried safely
+UNPROCESSED_STATUSES = frozenset({429, 503})
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """How Auth.request retries failed requests.
+
+    Delays use capped exponential backoff with full jitter, unless the
+    response has a Retry-After header.
+
+    Attributes:
+        attempts: Maximum number of attempts, including the first. Set
+            to 1 to disable retries.
+        base_delay: Maximum delay in seconds before the first retry,
+            doubling for each further retry.
+        max_delay: Cap on any delay, in seconds. A Retry-After longer
+            than this is not waited for, and the response is returned.
+        retry_statuses: HTTP statuses which may be retried.
+    """
+
+    attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay after a number of failed attempts."""
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+    def retry_after(self, value: str | None, attempt: int) -> float | None:
+        """Return the delay for a Retry-After header value.
 
-    def __init__(self, websession: ClientSession, access_token: str) -> None:
+        Falls back to backoff() if there is no usable header. Returns
+        None if the server asked for a longer delay than max_delay.
+        """
+        if value is None:
+            return self.backoff(attempt)
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return self.backoff(attempt)
+            delay = (when - datetime.now(UTC)).total_seconds()
+        if delay > self.max_delay:
+            return None
+        return max(delay, 0)
+
+
+class RateLimiter:
+    """Token bucket rate limiter for API requests.
+
+    Up to capacity requests may be made in a burst, after which
+    requests are admitted at rate per second, in the order they
+    arrived. Waiting requests sleep on a future; a single timer wakes
+    the head of the queue when the next token is due.
+
+    Auth uses the limiter shared by all users of its access token (see
+    for_token()), so that several config entries using the same token
+    can't burst together.
+
+    Attributes:
+        rate: Tokens added to the bucket per second.
+        capacity: Maximum tokens in the bucket, i.e. the burst size.
+        acquired: Number of requests admitted.
+        waited: Number of requests which had to queue.
+        total_wait: Total time in seconds spent queueing.
+        max_wait: Longest time in seconds a request queued for.
+        max_queue_depth: Most requests queued at once.
+    """
+
+    _shared: ClassVar[WeakValueDictionary[str, "RateLimiter"]] = WeakValueDictionary()
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE_LIMIT,
+        capacity: float = DEFAULT_RATE_LIMIT_BURST,
+    ) -> None:
+        """Initialize a limiter with a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated: float | None = None
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queue_depth = 0
+
+    @classmethod
+    def for_token(cls, access_token: str) -> "RateLimiter":
+        """Return the limiter shared by all users of an access token.
+
+        The limiter lasts as long as something refers to it.
+        """
+        limiter = cls._shared.get(access_token)
+        if limiter is None:
+            limiter = cls()
+            cls._shared[access_token] = limiter
+        return limiter
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests currently waiting."""
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Wait until a request may be made."""
+        loop = asyncio.get_running_loop()
+        self._refill(loop.time())
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self.acquired += 1
+            return
+
+        start = loop.time()
+        future = loop.create_future()
+        self._waiters.append(future)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        self._schedule(loop)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future in self._waiters:
+                self._waiters.remove(future)
+            elif not future.cancelled():
+                # Granted a token just as we were cancelled, so hand it on
+                self._tokens += 1
+                self._wake(loop)
+            raise
+
+        wait = loop.time() - start
+        self.acquired += 1
+        self.waited += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens due since the last refill."""
+        if self._updated is not None:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+        self._updated = now
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Set a timer for when the head of the queue can have a token."""
+        if self._timer is None and self._waiters:
+            delay = max(0.0, (1 - self._tokens) / self.rate)
+            self._timer = loop.call_later(delay, self._wake, loop)
+
+    def _wake(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Hand out available tokens to waiters, in order."""
+        self._timer = None
+        self._refill(loop.time())
+        while self._waiters and self._tokens >= 1:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        self._schedule(loop)
+
+
+class Auth:
+    """Class to make authenticated requests.
+
+    Requests are sent through the transport passed in, or by default
+    an AiohttpTransport using the websession passed in. If websession
+    is None, Auth creates and owns a dedicated session, using
+    create_session() with the given connection options. A dedicated
+    session (or the transport) must be closed with async_close(), or
+    by using the Auth as an async context manager.
+
+    Each request (including retries) first waits for the rate limiter,
+    which by default is shared with every other Auth using the same
+    access token.
+
+    Requests go to paths under host, which defaults to the Netzero
+    API. Another host, such as a local emulator, may be given.
+    """
+
+    def __init__(
+        self,
+        websession: ClientSession | None,
+        access_token: str,
+        *,
+        connection_options: ConnectionOptions | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        host: str = DEFAULT_HOST,
+        transport: Transport | None = None,
+    ) -> None:
         """Initialize the auth."""
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        if rate_limiter is None:
+            rate_limiter = RateLimiter.for_token(access_token)
+        self.rate_limiter = rate_limiter
+        if transport is None:
+            owns_session = websession is None
+            if websession is None:
+                websession = create_session(connection_options)
+            transport = AiohttpTransport(websession, owns_session=owns_session)
+        self.transport = transport
         self.websession = websession
-        self.host = "https://api.netzero.energy/api/v1"
+        self.host = host.rstrip("/")
         self.access_token = access_token
 
-    async def request(self, method: str, path: str, **kwargs) -> ClientResponse:
-        """Make a request."""
-        if headers := kwargs.pop("headers", {}):
-            headers = dict(headers)
-        headers["authorization"] = f"Bearer {self.access_token}"
+    async def __aenter__(self) -> Self:
+        """Use the Auth as an async context manager."""
+        return self
 
-        return await self.websession.request(
-            method,
-            f"{self.host}/{path}",
-            **kwargs,
-            headers=headers,
-        )
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close any dedicated session when leaving the context."""
+        await self.async_close()
 
+    async def async_close(self) -> None:
+        """Close the transport, and any session owned by the Auth."""
+        await self.transport.async_close()
 
-class WallConnector:
-    """Class that represents a Tesla Wall Connector."""
+    async def async_prewarm(self, **kwargs) -> bool:
+        """Open a connection to the API host, ready for the first request.
+
+        This pays for the DNS lookup, and the TCP and TLS handshakes
+        up front. The response is ignored, and the connection is kept
+        in the pool. Returns whether a connection could be made.
+        """
+        try:
+            resp = await self.transport.async_request("HEAD", self.host, **kwargs)
+        except ClientError:
+            return False
+        resp.release()
+        return True
+
+    async def request(
+        self, method: str, path: str, *, idempotent: bool | None = None, **kwargs
+    ) -> Response:
+        """Make a request.
+
+        Failures are retried according to the retry policy. Idempotent
+        requests (by default, those using an idempotent method) are
+        retried on any connection error, timeout or retryable status.
+        Other requests are only retried when the server cannot have
+        acted on them: when no connection could be made, or the
+        status is in UNPROCESSED_STATUSES.
+
+        If the retries are used up, the last response is returned, or
+        the last exception raised.
+        """
+        if headers := kwargs.pop("headers", {}):
+            headers = dict(headers)
+        headers["authorization"] = f"Bearer {self.access_token}"
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        policy = self.retry_policy
+
+        attempt = 0
+        while True:
+            attempt += 1
+            await self.rate_limiter.acquire()
+            try:
+                resp = await self.transport.async_request(
+                    method,
+                    f"{self.host}/{path}",
+                    **kwargs,
+                    headers=headers,
+                )
+            except (ClientConnectionError, TimeoutError) as err:
+                if attempt >= policy.attempts or not (
+                    idempotent or isinstance(err, ClientConnectorError)
+                ):
+                    raise
+                delay = policy.backoff(attempt)
+            else:
+                if (
+                    resp.status not in policy.retry_statuses
+                    or attempt >= policy.attempts
+                    or not (idempotent or resp.status in UNPROCESSED_STATUSES)
+                ):
+                    return resp
+                delay = policy.retry_after(resp.headers.get(hdrs.RETRY_AFTER), attempt)
+                if delay is None:
+                    return resp
+                resp.release()
+
+            await asyncio.sleep(delay)
+
+
+class _FrozenModel:
+    """Base class for immutable API model objects.
+
+    Subclasses decode the API response once in __init__, storing typed
+    values in __slots__. After that the object cannot be modified, so
+    the values can be read, compared and shared freely.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Prevent modification of the model."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Prevent modification of the model."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class WallConnector(_FrozenModel):
+    """Class that represents a Tesla Wall Connector.
+
+    Attributes:
+        din: Identifying number.
+        state: State.
+        fault_state: Fault state.
+        power: Power being pulled in W.
+    """
+
+    # TODO: translate state and fault_state to enums with descriptive states
+    __slots__ = ("din", "fault_state", "power", "state")
+
+    din: str
+    state: int
+    fault_state: int
+    power: int
 
     def __init__(self, raw_data: dict[str, Any]) -> None:
         """Initialize a Wall Connector object."""
-        self.raw_data = raw_data
+        _set = object.__setattr__
+        _set(self, "din", raw_data["din"])
+        _set(self, "state", raw_data["wall_connector_state"])
+        _set(self, "fault_state", raw_data["wall_connector_fault_state"])
+        _set(self, "power", raw_data["wall_connector_power"])
 
     def __eq__(self, other: "WallConnector"):
         """Compare WallConnector objects."""
@@ -78,36 +631,117 @@ class WallConnector:
             )
         return NotImplemented
 
-    @property
-    def din(self) -> str:
-        """Identifying number."""
-        return self.raw_data["din"]
-
-    @property
-    def state(self) -> int:
-        """State."""
-        # TODO: translate to enums with descriptive states
-        return self.raw_data["wall_connector_state"]
-
-    @property
-    def fault_state(self) -> int:
-        """Fault state."""
-        # TODO: translate to enums with descriptive states
-        return self.raw_data["wall_connector_fault_state"]
+    def __hash__(self) -> int:
+        """Hash on the values compared by __eq__."""
+        return hash((self.din, self.state, self.fault_state, self.power))
 
     @property
-    def power(self) -> int:
-        """Power being pulled in W."""
-        return self.raw_data["wall_connector_power"]
-
+    def raw_data(self) -> dict[str, Any]:
+        """The wall connector in API (JSON) form.
 
-class EnergySiteStatus:
-    """Class that represents an energy site's current status."""
+        This is rebuilt from the decoded values on each access.
+        """
+        return {
+            "din": self.din,
+            "wall_connector_state": self.state,
+            "wall_connector_fault_state": self.fault_state,
+            "wall_connector_power": self.power,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class WallConnectorDiff:
+    """Wall connector DINs which differ between two status snapshots."""
+
+    added: frozenset[str]
+    removed: frozenset[str]
+    changed: frozenset[str]
+
+    def __bool__(self) -> bool:
+        """Whether anything differs."""
+        return bool(self.added or self.removed or self.changed)
+
+
+class EnergySiteStatus(_FrozenModel):
+    """Class that represents an energy site's current status.
+
+    Attributes:
+        site_id: The energy site the status belongs to.
+        percentage_charged: Percentage charge of the batteries at the
+            energy site.
+        solar_power: Current solar power generation in W.
+        battery_power: Current battery power output in W. While
+            charging, this value will be negative.
+        load_power: Current site load in W. Energy consumption of the
+            site, ignoring any local power generation and battery
+            usage (for power or storage).
+        grid_power: Current grid power usage in W. Positive when
+            importing energy from the grid, and negative when
+            exporting energy to the grid.
+        generator_power: Current generator power in W. Power from other
+            energy generation sources.
+        grid_status: Current grid status. Either active or inactive.
+        island_status: Current island status. Either on grid or off
+            grid.
+        storm_mode_active: Whether storm mode is currently active.
+        timestamp: Time associated with current site readings.
+        wall_connectors: Associated wall connector state, as a
+            read-only mapping indexed by DIN.
+    """
+
+    __slots__ = (
+        "battery_power",
+        "generator_power",
+        "grid_power",
+        "grid_status",
+        "island_status",
+        "load_power",
+        "percentage_charged",
+        "site_id",
+        "solar_power",
+        "storm_mode_active",
+        "timestamp",
+        "wall_connectors",
+    )
+
+    site_id: str
+    percentage_charged: float
+    solar_power: int
+    battery_power: int
+    load_power: int
+    grid_power: int
+    generator_power: int
+    grid_status: GridStatus
+    island_status: IslandStatus
+    storm_mode_active: bool
+    timestamp: datetime
+    wall_connectors: Mapping[str, WallConnector]
 
     def __init__(self, site_id: str, raw_data: dict[str, Any]) -> None:
         """Initialize a status object."""
-        self.site_id = site_id
-        self.raw_data = raw_data
+        _set = object.__setattr__
+        _set(self, "site_id", site_id)
+        _set(self, "percentage_charged", float(raw_data["percentage_charged"]))
+        _set(self, "solar_power", raw_data["solar_power"])
+        _set(self, "battery_power", raw_data["battery_power"])
+        _set(self, "load_power", raw_data["load_power"])
+        _set(self, "grid_power", raw_data["grid_power"])
+        _set(self, "generator_power", raw_data["generator_power"])
+        _set(self, "grid_status", GridStatus(raw_data["grid_status"]))
+        _set(self, "island_status", IslandStatus(raw_data["island_status"]))
+        _set(self, "storm_mode_active", raw_data["storm_mode_active"])
+        _set(self, "timestamp", datetime.fromisoformat(raw_data["timestamp"]))
+        # Index the list of wall connectors by id, once per snapshot.
+        _set(
+            self,
+            "wall_connectors",
+            MappingProxyType(
+                {
+                    j["din"]: WallConnector(j)
+                    for j in raw_data.get("wall_connectors", ())
+                }
+            ),
+        )
 
     def __eq__(self, other: "EnergySiteStatus"):
         """Compare EnergySiteStatus objects."""
@@ -128,94 +762,129 @@ class EnergySiteStatus:
             )
         return NotImplemented
 
-    @property
-    def percentage_charged(self) -> float:
-        """Percentage charge of the batteries at the energy site."""
-        return float(self.raw_data["percentage_charged"])
-
-    @property
-    def solar_power(self) -> int:
-        """Current solar power generation in W."""
-        return self.raw_data["solar_power"]
-
-    @property
-    def battery_power(self) -> int:
-        """Current battery power output in W.
-
-        While charging, this value will be negative.
-        """
-        return self.raw_data["battery_power"]
-
-    @property
-    def load_power(self) -> int:
-        """Current site load in W.
-
-        Energy consumption of the site, ignoring any local power generation
-        and battery usage (for power or storage).
-        """
-        return self.raw_data["load_power"]
-
-    @property
-    def grid_power(self) -> int:
-        """Current grid power usage in W.
-
-        Positive when importing energy from the grid, and negative
-        when exporting energy to the grid.
-        """
-        return self.raw_data["grid_power"]
-
-    @property
-    def generator_power(self) -> int:
-        """Current generator power in W.
-
-        Power from other energy generation sources.
-        """
-        return self.raw_data["generator_power"]
+    def __hash__(self) -> int:
+        """Hash on the values compared by __eq__."""
+        return hash(
+            (
+                self.site_id,
+                self.percentage_charged,
+                self.solar_power,
+                self.battery_power,
+                self.load_power,
+                self.grid_power,
+                self.generator_power,
+                self.grid_status,
+                self.island_status,
+                self.storm_mode_active,
+            )
+        )
 
-    @property
-    def grid_status(self) -> GridStatus:
-        """Current grid status.
+    def diff_wall_connectors(
+        self, previous: "EnergySiteStatus | None"
+    ) -> WallConnectorDiff:
+        """Return the wall connectors that differ from a previous snapshot.
 
-        Either active or inactive.
+        If there is no previous snapshot, all wall connectors are
+        reported as added.
         """
-        return GridStatus(self.raw_data["grid_status"])
+        current = self.wall_connectors
+        if previous is None:
+            return WallConnectorDiff(frozenset(current), frozenset(), frozenset())
+        before = previous.wall_connectors
+        return WallConnectorDiff(
+            added=frozenset(current.keys() - before.keys()),
+            removed=frozenset(before.keys() - current.keys()),
+            changed=frozenset(
+                din
+                for din, wc in current.items()
+                if din in before and before[din] is not wc and before[din] != wc
+            ),
+        )
 
     @property
-    def island_status(self) -> IslandStatus:
-        """Current island status.
+    def raw_data(self) -> dict[str, Any]:
+        """The status in API (JSON) form.
 
-        Either on grid or off grid.
+        This is rebuilt from the decoded values on each access.
         """
-        return IslandStatus(self.raw_data["island_status"])
-
-    @property
-    def storm_mode_active(self) -> bool:
-        """Whether storm mode is currently active."""
-        return self.raw_data["storm_mode_active"]
-
-    @property
-    def timestamp(self) -> datetime:
-        """Time associated with current site readings."""
-        return datetime.fromisoformat(self.raw_data["timestamp"])
-
-    @property
-    def wall_connectors(self) -> dict[str, WallConnector]:
-        """Return associated wall connector state."""
-        # Convert the list of wall connectors to a dictionary indexed
-        # by id.
-        wcdict = {}
-        for j in self.raw_data["wall_connectors"]:
-            wcdict[j["din"]] = WallConnector(j)
-        return wcdict
-
-
-class EnergySiteConfig:
-    """Class that represents an energy site's configuration."""
+        return {
+            "percentage_charged": self.percentage_charged,
+            "solar_power": self.solar_power,
+            "battery_power": self.battery_power,
+            "load_power": self.load_power,
+            "grid_power": self.grid_power,
+            "generator_power": self.generator_power,
+            "grid_status": str(self.grid_status),
+            "island_status": str(self.island_status),
+            "storm_mode_active": self.storm_mode_active,
+            "timestamp": self.timestamp.isoformat(),
+            "wall_connectors": [wc.raw_data for wc in self.wall_connectors.values()],
+        }
+
+
+# Names of the EnergySiteConfig fields compared by EnergySiteConfig.diff()
+CONFIG_FIELDS = frozenset(
+    {
+        "backup_reserve_percent",
+        "energy_exports",
+        "grid_charging",
+        "live_status",
+        "operational_mode",
+    }
+)
+
+
+class EnergySiteConfig(_FrozenModel):
+    """Class that represents an energy site's configuration.
+
+    Attributes:
+        site_id: The energy site the configuration belongs to.
+        backup_reserve_percent: The backup reserve as a percentage.
+        operational_mode: The operational mode of the site. This may be
+            either autonomous or self_supported.
+        energy_exports: The grid export mode of the site. This may be
+            one of never, pv_only, or battery_ok. The API may also
+            return null, which is represented by None.
+        grid_charging: Whether grid charging is enabled.
+        live_status: A class from which live status of the site can be
+            queried. None if the response did not include it.
+    """
+
+    __slots__ = (
+        "backup_reserve_percent",
+        "energy_exports",
+        "grid_charging",
+        "live_status",
+        "operational_mode",
+        "site_id",
+    )
+
+    site_id: str
+    backup_reserve_percent: int
+    operational_mode: OperationalMode
+    energy_exports: EnergyExportMode | None
+    grid_charging: bool
+    live_status: EnergySiteStatus | None
 
     def __init__(self, site_id: str, raw_data: dict[str, Any]) -> None:
         """Initialize a config object."""
-        self.site_id = site_id
-        self.raw_data = raw_data
+        _set = object.__setattr__
+        _set(self, "site_id", site_id)
+        _set(self, "backup_reserve_percent", raw_data["backup_reserve_percent"])
+        _set(self, "operational_mode", OperationalMode(raw_data["operational_mode"]))
+        exports = raw_data.get("energy_exports")
+        _set(
+            self,
+            "energy_exports",
+            None if exports is None else EnergyExportMode(exports),
+        )
+        _set(self, "grid_charging", raw_data["grid_charging"])
+        status = raw_data.get("live_status")
+        _set(
+            self,
+            "live_status",
+            None if status is None else EnergySiteStatus(site_id, status),
+        )
 
     def __eq__(self, other: "EnergySiteConfig"):
         """Compare EnergySiteConfig objects."""
@@ -229,40 +898,50 @@ class EnergySiteConfig:
             )
         return NotImplemented
 
-    @property
-    def backup_reserve_percent(self) -> int:
-        """The backup reserve as a percentage."""
-        return self.raw_data["backup_reserve_percent"]
-
-    @property
-    def operational_mode(self) -> OperationalMode:
-        """The operational mode of the site.
+    def diff(self, other: "EnergySiteConfig | None") -> frozenset[str]:
+        """Return the names of the fields which differ from another config.
 
-        This may be either autonomous or self_supported.
+        The names are those of the attributes, and include live_status.
+        Every field is reported as changed when other is None, or is
+        for a different site.
         """
-        return OperationalMode(self.raw_data["operational_mode"])
-
-    @property
-    def energy_exports(self) -> EnergyExportMode | None:
-        """The grid export mode of the site.
+        if other is None or self.site_id != other.site_id:
+            return CONFIG_FIELDS
+        return frozenset(
+            name
+            for name in CONFIG_FIELDS
+            if getattr(self, name) != getattr(other, name)
+        )
 
-        This may be one of never, pv_only, or battery_ok.
-        The API may also return null.
-        """
-        value = self.raw_data["energy_exports"]
-        if value is None:
-            return None
-        return EnergyExportMode(value)
+    def __hash__(self) -> int:
+        """Hash on the values compared by __eq__."""
+        return hash(
+            (
+                self.site_id,
+                self.backup_reserve_percent,
+                self.operational_mode,
+                self.energy_exports,
+                self.grid_charging,
+            )
+        )
 
     @property
-    def grid_charging(self) -> bool:
-        """Whether grid charging is enabled."""
-        return self.raw_data["grid_charging"]
+    def raw_data(self) -> dict[str, Any]:
+        """The configuration in API (JSON) form.
 
-    @property
-    def live_status(self) -> EnergySiteStatus:
-        """A class from which live status of the site can be queried."""
-        return EnergySiteStatus(self.site_id, self.raw_data["live_status"])
+        This is rebuilt from the decoded values on each access.
+        """
+        raw_data = {
+            "backup_reserve_percent": self.backup_reserve_percent,
+            "operational_mode": str(self.operational_mode),
+            "energy_exports": (
+                None if self.energy_exports is None else str(self.energy_exports)
+            ),
+            "grid_charging": self.grid_charging,
+        }
+        if self.live_status is not None:
+            raw_data["live_status"] = self.live_status.raw_data
+        return raw_data
 
 
 class EnergySite:
@@ -273,18 +952,96 @@ class EnergySite:
         self.auth = auth
         self.site_id = site_id
 
-    async def async_get_config(self) -> EnergySiteConfig:
-        """Return the energy site configuration."""
-        resp = await self.auth.request("GET", f"{self.site_id}/config")
-        resp.raise_for_status()
-        return EnergySiteConfig(self.site_id, await resp.json())
+        # Request in flight for async_get_config, shared by all callers
+        self._get_config_task: asyncio.Task[EnergySiteConfig] | None = None
+
+        # Latest configuration received, and when (in event loop time)
+        self._config: EnergySiteConfig | None = None
+        self._config_time = 0.0
+
+        # Number of configurations received from async_set_config. A
+        # read sent before one was received may be older than it.
+        self._set_count = 0
+
+    async def async_prewarm(self) -> bool:
+        """Open a connection to the API host, ready for the next request.
 
-    async def async_set_config(self, **kwargs) -> EnergySiteConfig:
+        See Auth.async_prewarm().
+        """
+        return await self.auth.async_prewarm()
+
+    async def async_get_config(
+        self, max_age: float | None = None, *, timeout: float | None = None
+    ) -> EnergySiteConfig:
+        """Return the energy site configuration.
+
+        Concurrent calls share a single request, and all receive the
+        same EnergySiteConfig. Cancelling one caller doesn't cancel
+        the request for the others.
+
+        Callers which can accept slightly stale data may pass max_age,
+        in seconds. If the site's configuration was received (from
+        either a get or a set) within that time, it is returned
+        without making a request.
+
+        timeout, in seconds, limits each attempt at the request, from
+        when the rate limiter admits it; an attempt which takes longer
+        fails with TimeoutError. It is set by the call which starts
+        the request, and ignored by calls sharing it.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            max_age is not None
+            and self._config is not None
+            and loop.time() - self._config_time <= max_age
+        ):
+            return self._config
+
+        if self._get_config_task is None:
+            self._get_config_task = loop.create_task(self._async_fetch_config(timeout))
+            # Retrieve any exception, in case every caller was cancelled
+            self._get_config_task.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+        return await asyncio.shield(self._get_config_task)
+
+    async def _async_fetch_config(self, timeout: float | None) -> EnergySiteConfig:
+        """Request the energy site configuration."""
+        kwargs = {}
+        if timeout is not None:
+            kwargs["timeout"] = ClientTimeout(total=timeout)
+        set_count = self._set_count
+        try:
+            resp = await self.auth.request("GET", f"{self.site_id}/config", **kwargs)
+            resp.raise_for_status()
+            config = EnergySiteConfig(self.site_id, await resp.json())
+            if self._set_count == set_count:
+                self._remember(config)
+            return config
+        finally:
+            self._get_config_task = None
+
+    def _remember(self, config: EnergySiteConfig) -> EnergySiteConfig:
+        """Keep the latest configuration for async_get_config(max_age)."""
+        self._config = config
+        self._config_time = asyncio.get_running_loop().time()
+        return config
+
+    async def async_set_config(
+        self, *, timeout: float | None = None, **kwargs
+    ) -> EnergySiteConfig:
         """Reconfigure the energy site with new parameters.
 
         Each parameter can be changed individually, or together.
         The response includes the updated state of the energy site.
 
+        timeout, in seconds, limits the time each attempt may take to
+        get a connection, from when the rate limiter admits it, and
+        then to receive the response. The body isn't cut off part way
+        through sending, but a response which doesn't arrive in time
+        fails with TimeoutError, leaving unknown whether the change
+        was applied (see outcome_unknown()).
+
         Accepted kwargs parameters are
         backup_reserve_percent (int)
         grid_charging (bool)
@@ -304,7 +1061,201 @@ class EnergySite:
         value = kwargs.get("operational_mode")
         if value is not None:
             json["operational_mode"] = str(value)
-        resp = await self.auth.request("POST", f"{self.site_id}/config", json=json)
+        request_kwargs = {}
+        if timeout is not None:
+            request_kwargs["timeout"] = ClientTimeout(
+                total=None, connect=timeout, sock_read=timeout
+            )
+        # The request sets absolute values, so is safe to repeat
+        resp = await self.auth.request(
+            "POST",
+            f"{self.site_id}/config",
+            idempotent=True,
+            json=json,
+            **request_kwargs,
+        )
         resp.raise_for_status()
 
-        return EnergySiteConfig(self.site_id, await resp.json())
+        self._set_count += 1
+        return self._remember(EnergySiteConfig(self.site_id, await resp.json()))
+
+
+def outcome_unknown(err: BaseException) -> bool:
+    """Return whether a change failing with err may have been applied.
+
+    This is so when the request may have been sent, but no response
+    was received: after a timeout or connection error, other than a
+    failure to connect.
+    """
+    return isinstance(err, (ClientConnectionError, TimeoutError)) and not isinstance(
+        err, (ClientConnectorError, ConnectionTimeoutError)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class FleetResult:
+    """Outcome of an EnergySiteFleet call for one site.
+
+    Attributes:
+        site_id: The energy site.
+        config: The site configuration, if the call succeeded.
+        error: The exception raised, if the call failed. A request
+            which took longer than the fleet's timeout fails with
+            TimeoutError.
+        elapsed: Seconds the call took, not counting time waiting for
+            the fleet's concurrency limit.
+        outcome_unknown: Whether a change which failed may have been
+            applied anyway, as its request may have been sent but no
+            response was received. The site should be read to find out.
+    """
+
+    site_id: str
+    config: EnergySiteConfig | None = None
+    error: Exception | None = None
+    elapsed: float = 0.0
+    outcome_unknown: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call succeeded."""
+        return self.error is None
+
+
+class EnergySiteFleet:
+    """Class making the same call to many energy sites at once.
+
+    Calls are made to up to concurrency sites at a time. Results are
+    yielded as each site finishes, so a slow site doesn't hold up the
+    others. A failure at one site is reported in its FleetResult, and
+    doesn't affect the others.
+
+    Sites may use different access tokens. Sites sharing a token also
+    share its rate limiter, which may limit them more than concurrency.
+    The timeout is passed to each site's request, so it starts once
+    the rate limiter admits the request, rather than counting time
+    queued behind other sites. A change which times out waiting for
+    its response is reported with outcome_unknown set.
+
+    Leaving the iteration early cancels the reads still outstanding,
+    and changes still waiting for the concurrency limit. Changes which
+    have started may have been sent, so are given up to the timeout
+    (or DEFAULT_FLEET_TIMEOUT, if there is none) to finish before they
+    are cancelled too. Use contextlib.aclosing()
+    to do this promptly.
+    """
+
+    def __init__(
+        self,
+        sites: Iterable[EnergySite],
+        *,
+        concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+        timeout: float | None = DEFAULT_FLEET_TIMEOUT,
+    ) -> None:
+        """Initialize the fleet."""
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.sites = list(sites)
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    @classmethod
+    def for_tokens(
+        cls,
+        websession: ClientSession | None,
+        site_tokens: Mapping[str, str],
+        *,
+        concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+        timeout: float | None = DEFAULT_FLEET_TIMEOUT,
+        **auth_kwargs,
+    ) -> "EnergySiteFleet":
+        """Create a fleet from a mapping of site IDs to access tokens.
+
+        Sites with the same token share an Auth, created with the
+        websession and auth_kwargs. Pass a websession to pool
+        connections for the whole fleet; if it is None, each Auth has
+        a dedicated session, to be closed with async_close().
+        """
+        auths: dict[str, Auth] = {}
+        sites = []
+        for site_id, access_token in site_tokens.items():
+            auth = auths.get(access_token)
+            if auth is None:
+                auth = Auth(websession, access_token, **auth_kwargs)
+                auths[access_token] = auth
+            sites.append(EnergySite(auth, site_id))
+        return cls(sites, concurrency=concurrency, timeout=timeout)
+
+    async def async_close(self) -> None:
+        """Close the Auth of every site."""
+        auths = {id(site.auth): site.auth for site in self.sites}
+        await asyncio.gather(*(auth.async_close() for auth in auths.values()))
+
+    def async_get_config(
+        self, max_age: float | None = None
+    ) -> AsyncIterator[FleetResult]:
+        """Get the configuration of every site, yielding results as they finish.
+
+        max_age is passed to EnergySite.async_get_config().
+        """
+        return self._async_call(
+            lambda site: site.async_get_config(max_age, timeout=self.timeout),
+            writes=False,
+        )
+
+    def async_set_config(self, **kwargs) -> AsyncIterator[FleetResult]:
+        """Reconfigure every site, yielding results as they finish.
+
+        Accepts the same parameters as EnergySite.async_set_config().
+        """
+        return self._async_call(
+            lambda site: site.async_set_config(timeout=self.timeout, **kwargs),
+            writes=True,
+        )
+
+    async def _async_call(
+        self,
+        call: Callable[[EnergySite], Awaitable[EnergySiteConfig]],
+        *,
+        writes: bool,
+    ) -> AsyncIterator[FleetResult]:
+        """Make a call for every site, yielding results as they finish."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started: set[asyncio.Task[FleetResult] | None] = set()
+
+        async def call_site(site: EnergySite) -> FleetResult:
+            async with semaphore:
+                started.add(asyncio.current_task())
+                start = loop.time()
+                try:
+                    config = await call(site)
+                except Exception as err:  # noqa: BLE001
+                    return FleetResult(
+                        site.site_id,
+                        error=err,
+                        elapsed=loop.time() - start,
+                        outcome_unknown=writes and outcome_unknown(err),
+                    )
+                return FleetResult(
+                    site.site_id, config=config, elapsed=loop.time() - start
+                )
+
+        tasks = [loop.create_task(call_site(site)) for site in self.sites]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            sent = [task for task in tasks if writes and task in started]
+            for task in tasks:
+                if task not in sent:
+                    task.cancel()
+            try:
+                if sent:
+                    grace = self.timeout
+                    if grace is None:
+                        grace = DEFAULT_FLEET_TIMEOUT
+                    await asyncio.wait(sent, timeout=grace)
+            finally:
+                for task in sent:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
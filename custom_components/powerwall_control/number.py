@@ -13,29 +13,30 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.icon import icon_for_battery_level
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import PwCtrlConfigEntry
 from .coordinator import PwCtrlCoordinator
+from .entity import PwCtrlEntity
 
 
-class PwCtrlBackupReserveNumberEntity(CoordinatorEntity, NumberEntity):
+class PwCtrlBackupReserveNumberEntity(PwCtrlEntity, NumberEntity):
     """Backup Reserve number entity class."""
 
-    _attr_has_entity_name = True
     _attr_native_step = PRECISION_WHOLE
     _attr_native_min_value = 0
     _attr_native_max_value = 100
     _attr_device_class = NumberDeviceClass.BATTERY
     _attr_native_unit_of_measurement = PERCENTAGE
-    _attr_unique_id = "backup_reserve"
-    _attr_translation_key = _attr_unique_id
+    _attr_translation_key = "backup_reserve"
     _attr_entity_category = EntityCategory.CONFIG
 
-    def __init__(self, coordinator: PwCtrlCoordinator, device_info: DeviceInfo) -> None:
+    def __init__(
+        self, coordinator: PwCtrlCoordinator, device_info: DeviceInfo, system_id: str
+    ) -> None:
         """Initialize the number entity."""
-        self._attr_device_info = device_info
-        super().__init__(coordinator)
+        self._attr_unique_id = f"{system_id}_{self._attr_translation_key}"
+        # Only woken up when backup_reserve_percent changes
+        super().__init__(coordinator, device_info, {"backup_reserve_percent"})
 
         # Need initial values
         self._attr_native_value = 20
@@ -44,7 +45,9 @@ class PwCtrlBackupReserveNumberEntity(CoordinatorEntity, NumberEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.data.backup_reserve_percent
+        self._attr_native_value = self.coordinator.requested_value(
+            "backup_reserve_percent"
+        )
         self._attr_icon = icon_for_battery_level(self._attr_native_value)
         self.async_write_ha_state()
 
@@ -64,7 +67,9 @@ async def async_setup_entry(
     entities: list[NumberEntity] = []
     entities.append(
         PwCtrlBackupReserveNumberEntity(
-            entry.runtime_data.coordinator, entry.runtime_data.device_info
+            entry.runtime_data.coordinator,
+            entry.runtime_data.device_info,
+            entry.data["system_id"],
         )
     )
     async_add_entities(entities)
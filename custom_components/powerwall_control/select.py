@@ -13,26 +13,27 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import PwCtrlConfigEntry
 from .coordinator import PwCtrlCoordinator
+from .entity import PwCtrlEntity
 from .netzero import EnergyExportMode, OperationalMode
 
 
-class PwCtrlOperationalModeSelectEntity(CoordinatorEntity, SelectEntity):
+class PwCtrlOperationalModeSelectEntity(PwCtrlEntity, SelectEntity):
     """Operational mode select entity class."""
 
-    _attr_has_entity_name = True
-    _attr_unique_id = "operational_mode"
-    _attr_translation_key = _attr_unique_id
+    _attr_translation_key = "operational_mode"
     _attr_entity_category = EntityCategory.CONFIG
     _attr_options: list[str] = ["auto", "backup", "self"]
 
-    def __init__(self, coordinator: PwCtrlCoordinator, device_info: DeviceInfo) -> None:
+    def __init__(
+        self, coordinator: PwCtrlCoordinator, device_info: DeviceInfo, system_id: str
+    ) -> None:
         """Initialize the number entity."""
-        self._attr_device_info = device_info
-        super().__init__(coordinator)
+        self._attr_unique_id = f"{system_id}_{self._attr_translation_key}"
+        # Only woken up when operational_mode changes
+        super().__init__(coordinator, device_info, {"operational_mode"})
 
         # Need an initial value
         self._attr_current_option = "auto"
@@ -40,7 +41,7 @@ class PwCtrlOperationalModeSelectEntity(CoordinatorEntity, SelectEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        mode = self.coordinator.data.operational_mode
+        mode = self.coordinator.requested_value("operational_mode")
         if mode == OperationalMode.AUTONOMOUS:
             self._attr_current_option = "auto"
         elif mode == OperationalMode.BACKUP:
@@ -67,19 +68,20 @@ class PwCtrlOperationalModeSelectEntity(CoordinatorEntity, SelectEntity):
         # When set the coordinator will call _handle_coordinator_update
 
 
-class PwCtrlExportModeSelectEntity(CoordinatorEntity, SelectEntity):
+class PwCtrlExportModeSelectEntity(PwCtrlEntity, SelectEntity):
     """Export mode select entity class."""
 
-    _attr_has_entity_name = True
-    _attr_unique_id = "export_mode"
-    _attr_translation_key = _attr_unique_id
+    _attr_translation_key = "export_mode"
     _attr_entity_category = EntityCategory.CONFIG
     _attr_options: list[str] = ["never", "pv_only", "battery_ok"]
 
-    def __init__(self, coordinator: PwCtrlCoordinator, device_info: DeviceInfo) -> None:
+    def __init__(
+        self, coordinator: PwCtrlCoordinator, device_info: DeviceInfo, system_id: str
+    ) -> None:
         """Initialize the select entity."""
-        self._attr_device_info = device_info
-        super().__init__(coordinator)
+        self._attr_unique_id = f"{system_id}_{self._attr_translation_key}"
+        # Only woken up when energy_exports changes
+        super().__init__(coordinator, device_info, {"energy_exports"})
 
         # Need an initial value
         self._attr_current_option = "never"
@@ -87,7 +89,7 @@ class PwCtrlExportModeSelectEntity(CoordinatorEntity, SelectEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        mode = self.coordinator.data.energy_exports
+        mode = self.coordinator.requested_value("energy_exports")
         if mode is None:
             return
         if mode == EnergyExportMode.BATTERY_OK:
@@ -119,12 +121,16 @@ async def async_setup_entry(
     entities: list[SelectEntity] = []
     entities.append(
         PwCtrlOperationalModeSelectEntity(
-            entry.runtime_data.coordinator, entry.runtime_data.device_info
+            entry.runtime_data.coordinator,
+            entry.runtime_data.device_info,
+            entry.data["system_id"],
         )
     )
     entities.append(
         PwCtrlExportModeSelectEntity(
-            entry.runtime_data.coordinator, entry.runtime_data.device_info
+            entry.runtime_data.coordinator,
+            entry.runtime_data.device_info,
+            entry.data["system_id"],
         )
     )
     async_add_entities(entities)
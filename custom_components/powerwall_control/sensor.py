@@ -0,0 +1,245 @@
+"""Define Powerwall Control sensor entities.
+
+This is a Home Assistant defined file that specifies all sensor
+entities for an integration. A sensor has a read-only value.
+
+Powerwall Control defines sensors for the live status of the energy
+site, which Netzero returns along with the site configuration. These
+are polled by the status coordinator, which passes the configuration
+on to the configuration entities, so both come from the same API
+calls.
+
+Each Wall Connector reported in the live status gets its own device,
+with sensors added and removed as the Wall Connectors come and go.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfPower
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from . import PwCtrlConfigEntry
+from .const import DOMAIN
+from .coordinator import PwCtrlStatusCoordinator
+from .entity import PwCtrlEntity
+from .netzero import EnergySiteStatus, WallConnector
+
+
+@dataclass(frozen=True, kw_only=True)
+class PwCtrlSensorEntityDescription(SensorEntityDescription):
+    """Describes a live status sensor entity."""
+
+    value_fn: Callable[[EnergySiteStatus], StateType | datetime]
+
+
+def _power_sensor(key: str) -> PwCtrlSensorEntityDescription:
+    """Describe a sensor for one of the power readings, in W."""
+    return PwCtrlSensorEntityDescription(
+        key=key,
+        translation_key=key,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        value_fn=lambda status: getattr(status, key),
+    )
+
+
+SENSORS: tuple[PwCtrlSensorEntityDescription, ...] = (
+    PwCtrlSensorEntityDescription(
+        key="percentage_charged",
+        translation_key="percentage_charged",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=0,
+        value_fn=lambda status: status.percentage_charged,
+    ),
+    _power_sensor("solar_power"),
+    _power_sensor("battery_power"),
+    _power_sensor("load_power"),
+    _power_sensor("grid_power"),
+    _power_sensor("generator_power"),
+    PwCtrlSensorEntityDescription(
+        key="status_timestamp",
+        translation_key="status_timestamp",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda status: status.timestamp,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class PwCtrlWallConnectorSensorEntityDescription(SensorEntityDescription):
+    """Describes a Wall Connector sensor entity."""
+
+    value_fn: Callable[[WallConnector], StateType]
+
+
+WALL_CONNECTOR_SENSORS: tuple[PwCtrlWallConnectorSensorEntityDescription, ...] = (
+    PwCtrlWallConnectorSensorEntityDescription(
+        key="wall_connector_power",
+        translation_key="wall_connector_power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        value_fn=lambda wc: wc.power,
+    ),
+    PwCtrlWallConnectorSensorEntityDescription(
+        key="wall_connector_state",
+        translation_key="wall_connector_state",
+        value_fn=lambda wc: wc.state,
+    ),
+    PwCtrlWallConnectorSensorEntityDescription(
+        key="wall_connector_fault_state",
+        translation_key="wall_connector_fault_state",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda wc: wc.fault_state,
+    ),
+)
+
+
+class PwCtrlLiveStatusSensorEntity(PwCtrlEntity[PwCtrlStatusCoordinator], SensorEntity):
+    """Live status sensor entity class."""
+
+    entity_description: PwCtrlSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: PwCtrlStatusCoordinator,
+        device_info: DeviceInfo,
+        system_id: str,
+        description: PwCtrlSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor entity."""
+        self.entity_description = description
+        self._attr_unique_id = f"{system_id}_{description.key}"
+        super().__init__(coordinator, device_info)
+
+    @property
+    def available(self) -> bool:
+        """Return if the live status was included in the last response."""
+        return super().available and self.coordinator.data is not None
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the value from the live status."""
+        return self.entity_description.value_fn(self.coordinator.data)
+
+
+class PwCtrlWallConnectorSensorEntity(
+    PwCtrlEntity[PwCtrlStatusCoordinator], SensorEntity
+):
+    """Wall Connector sensor entity class."""
+
+    entity_description: PwCtrlWallConnectorSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: PwCtrlStatusCoordinator,
+        device_info: DeviceInfo,
+        din: str,
+        description: PwCtrlWallConnectorSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor entity."""
+        self.entity_description = description
+        self._din = din
+        self._attr_unique_id = f"{din}_{description.key}"
+        super().__init__(coordinator, device_info)
+        # Only woken up when this wall connector changes
+        self.coordinator_context = din
+
+    @property
+    def available(self) -> bool:
+        """Return if the wall connector was included in the last response."""
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and self._din in self.coordinator.data.wall_connectors
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value from the wall connector."""
+        return self.entity_description.value_fn(
+            self.coordinator.data.wall_connectors[self._din]
+        )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: PwCtrlConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up sensor platform from a config entry."""
+    coordinator = entry.runtime_data.status_coordinator
+    system_id = entry.data["system_id"]
+    async_add_entities(
+        PwCtrlLiveStatusSensorEntity(
+            coordinator, entry.runtime_data.device_info, system_id, description
+        )
+        for description in SENSORS
+    )
+
+    # Wall connectors with entities, and those left in the device
+    # registry from a previous run, which are removed if they aren't
+    # in the first status.
+    device_registry = dr.async_get(hass)
+    known: set[str] = set()
+    previous_run = {
+        din
+        for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id)
+        for domain, din in device.identifiers
+        if domain == DOMAIN and din != system_id
+    }
+
+    @callback
+    def _async_update_wall_connectors() -> None:
+        """Add entities for new wall connectors, and remove old ones."""
+        if coordinator.data is None:
+            return
+        current = coordinator.data.wall_connectors
+
+        if added := current.keys() - known:
+            known.update(added)
+            async_add_entities(
+                PwCtrlWallConnectorSensorEntity(
+                    coordinator,
+                    DeviceInfo(
+                        identifiers={(DOMAIN, din)},
+                        manufacturer="Tesla",
+                        model="Wall Connector",
+                        name=f"Wall Connector {din}",
+                        serial_number=din,
+                        via_device=(DOMAIN, system_id),
+                    ),
+                    din,
+                    description,
+                )
+                for din in sorted(added)
+                for description in WALL_CONNECTOR_SENSORS
+            )
+
+        removed = (known | previous_run) - current.keys()
+        known.difference_update(removed)
+        previous_run.clear()
+        # Removing the device removes its entities
+        for din in removed:
+            if device := device_registry.async_get_device(identifiers={(DOMAIN, din)}):
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry.entry_id
+                )
+
+    _async_update_wall_connectors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_wall_connectors))
@@ -0,0 +1,91 @@
+"""Powerwall Control services."""
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.selector import ConfigEntrySelector
+
+from . import netzero
+from .const import DOMAIN
+
+SERVICE_SET_CONFIG = "set_config"
+
+# The EnergySiteConfig fields which may be set
+SET_CONFIG_FIELDS = (
+    "backup_reserve_percent",
+    "operational_mode",
+    "energy_exports",
+    "grid_charging",
+)
+
+SET_CONFIG_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CONFIG_ENTRY_ID): ConfigEntrySelector(
+                {"integration": DOMAIN}
+            ),
+            vol.Optional("backup_reserve_percent"): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=100)
+            ),
+            vol.Optional("operational_mode"): vol.Coerce(netzero.OperationalMode),
+            vol.Optional("energy_exports"): vol.Coerce(netzero.EnergyExportMode),
+            vol.Optional("grid_charging"): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key(*SET_CONFIG_FIELDS),
+)
+
+
+async def _async_set_config(call: ServiceCall) -> ServiceResponse:
+    """Send configuration changes to a site immediately.
+
+    The changes are sent together with any changes waiting for the
+    control debounce, in a single POST.
+    """
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    entry = call.hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_found",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"title": entry.title},
+        )
+
+    changes = {name: call.data[name] for name in SET_CONFIG_FIELDS if name in call.data}
+    try:
+        config = await entry.runtime_data.coordinator.async_set_config_now(**changes)
+    except Exception as err:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="set_config_failed",
+            translation_placeholders={"error": str(err)},
+        ) from err
+    return config.raw_data
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Powerwall Control services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_CONFIG,
+        _async_set_config,
+        schema=SET_CONFIG_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -12,25 +12,26 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import PwCtrlConfigEntry
 from .coordinator import PwCtrlCoordinator
+from .entity import PwCtrlEntity
 
 
-class PwCtrlGridChargingSwitch(CoordinatorEntity, SwitchEntity):
+class PwCtrlGridChargingSwitch(PwCtrlEntity, SwitchEntity):
     """Grid Charging switch entity class."""
 
-    _attr_has_entity_name = True
     _attr_device_class = SwitchDeviceClass.SWITCH
-    _attr_unique_id = "grid_charging"
-    _attr_translation_key = _attr_unique_id
+    _attr_translation_key = "grid_charging"
     _attr_entity_category = EntityCategory.CONFIG
 
-    def __init__(self, coordinator: PwCtrlCoordinator, device_info: DeviceInfo) -> None:
+    def __init__(
+        self, coordinator: PwCtrlCoordinator, device_info: DeviceInfo, system_id: str
+    ) -> None:
         """Initialize the switch entity."""
-        self._attr_device_info = device_info
-        super().__init__(coordinator)
+        self._attr_unique_id = f"{system_id}_{self._attr_translation_key}"
+        # Only woken up when grid_charging changes
+        super().__init__(coordinator, device_info, {"grid_charging"})
 
         # Need an initial value
         self._is_on = False
@@ -43,7 +44,7 @@ class PwCtrlGridChargingSwitch(CoordinatorEntity, SwitchEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._is_on = self.coordinator.data.grid_charging
+        self._is_on = self.coordinator.requested_value("grid_charging")
         self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs) -> None:
@@ -68,7 +69,9 @@ async def async_setup_entry(
 
     entities.append(
         PwCtrlGridChargingSwitch(
-            entry.runtime_data.coordinator, entry.runtime_data.device_info
+            entry.runtime_data.coordinator,
+            entry.runtime_data.device_info,
+            entry.data["system_id"],
         )
     )
 
@@ -11,19 +11,60 @@ The JSON file for the system_json positional argument should look like:
         "api_token": "abcedf",
         "system_id": "12345"
     }
+
+It may also have a "url" for the API, as with --url.
+
+Several JSON files, or directories of them, may be given to run the
+same request against every system, as a batch. Up to --concurrency
+systems are called at once, over a shared connection pool, and a JSON
+record is printed for each system as it finishes (NDJSON), e.g.
+
+    {"system_id": "12345", "file": "sites/home.json", "ok": true,
+     "elapsed_ms": 412.5, "finished_ms": 415.1, "config": {...}}
+
+A failed system has "ok": false, and "error_type" and "error" in
+place of "config". A change which timed out after being sent also has
+"outcome_unknown": true, as it may have been applied; read the system
+to find out. The exit status is 1 if any system failed.
+
+Systems sharing an API token share its rate limit, set with
+--rate-limit and --burst. Requests beyond the burst wait their turn,
+and --timeout only starts once a request is allowed through, so a
+large batch on one token is slower rather than failing.
 """
 
 import argparse
 import asyncio
+from dataclasses import dataclass
 import json
 import pathlib
 import sys
 
-import aiohttp
-
 import netzero
 
 
+@dataclass(frozen=True, slots=True)
+class System:
+    """A system to control, and the file it was read from."""
+
+    api_token: str
+    system_id: str
+    url: str
+    source: str | None = None
+
+
+def system_files(names: list[str]) -> list[pathlib.Path]:
+    """Return the JSON files named, expanding directories."""
+    paths = []
+    for name in names:
+        path = pathlib.Path(name)
+        if path.is_dir():
+            paths.extend(sorted(path.glob("*.json")))
+        else:
+            paths.append(path)
+    return paths
+
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -45,10 +86,52 @@ def parse_args():
         help="System to control. Overrides system_json if both specified.",
     )
     parser.add_argument(
-        "system_json",
-        nargs="?",
+        "--url",
+        "-u",
         default=None,
-        help="JSON file containing API token and System ID",
+        help="Base URL of the API, for example to go through a proxy or "
+        "emulator. Overrides system_json if both specified. Defaults to "
+        f"{netzero.DEFAULT_HOST}",
+    )
+    parser.add_argument(
+        "system_json",
+        nargs="*",
+        default=[],
+        help="JSON files containing API token and System ID, or directories "
+        "of them. More than one system is run as a batch.",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Print a JSON record per system, as for a batch, even for one",
+    )
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=netzero.DEFAULT_FLEET_CONCURRENCY,
+        help="Maximum systems to call at once in a batch",
+    )
+    parser.add_argument(
+        "--timeout",
+        "-t",
+        type=float,
+        default=netzero.DEFAULT_FLEET_TIMEOUT,
+        help="Seconds allowed for each request in a batch to connect, and "
+        "then to respond, once the rate limit allows it",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        "-r",
+        type=float,
+        default=netzero.DEFAULT_RATE_LIMIT,
+        help="Requests per second allowed for each API token",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=netzero.DEFAULT_RATE_LIMIT_BURST,
+        help="Requests each API token may make at once, before the rate limit applies",
     )
 
     parser.add_argument(
@@ -81,31 +164,101 @@ def parse_args():
     )
 
     args = parser.parse_args()
-    if args.system_json:
-        with pathlib.Path(args.system_json).open(encoding="utf-8") as f:
-            data = json.load(f)
-            if args.api_token is None:
-                args.api_token = data["api_token"]
-            if args.system_id is None:
-                args.system_id = data["system_id"]
-
-    if not (args.api_token and args.system_id):
-        print(
-            "error: API token and System ID must be specified, either by "
-            "--system-json or --api-token and system-id"
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.rate_limit <= 0:
+        parser.error("--rate-limit must be positive")
+    if args.burst < 1:
+        parser.error("--burst must be at least 1")
+
+    files = system_files(args.system_json)
+    if len(files) > 1 and args.system_id is not None:
+        parser.error("--system-id can't be used with more than one system_json")
+    args.systems = []
+    for path in files or [None]:
+        data = {}
+        if path is not None:
+            with path.open(encoding="utf-8") as f:
+                data = json.load(f)
+        system = System(
+            args.api_token if args.api_token is not None else data.get("api_token"),
+            args.system_id if args.system_id is not None else data.get("system_id"),
+            args.url or data.get("url") or netzero.DEFAULT_HOST,
+            None if path is None else str(path),
         )
-        sys.exit(1)
+        if not (system.api_token and system.system_id):
+            print(
+                "error: API token and System ID must be specified, either by "
+                "--system-json or --api-token and system-id"
+            )
+            sys.exit(1)
+        args.systems.append(system)
 
     return args
 
 
+async def run_batch(args: argparse.Namespace, changes: dict) -> int:
+    """Run the request against every system, printing NDJSON records."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    # One connection pool for every system, large enough for the batch
+    websession = netzero.create_session(
+        netzero.ConnectionOptions(limit_per_host=args.concurrency)
+    )
+    limiters: dict[str, netzero.RateLimiter] = {}
+    auths: dict[tuple[str, str], netzero.Auth] = {}
+    sites = []
+    sources = {}
+    for system in args.systems:
+        key = (system.api_token, system.url)
+        if (auth := auths.get(key)) is None:
+            if (limiter := limiters.get(system.api_token)) is None:
+                limiter = netzero.RateLimiter(args.rate_limit, args.burst)
+                limiters[system.api_token] = limiter
+            auth = netzero.Auth(
+                websession, system.api_token, rate_limiter=limiter, host=system.url
+            )
+            auths[key] = auth
+        sites.append(netzero.EnergySite(auth, system.system_id))
+        sources[system.system_id] = system.source
+    fleet = netzero.EnergySiteFleet(
+        sites, concurrency=args.concurrency, timeout=args.timeout
+    )
+
+    failed = False
+    async with websession:
+        if changes:
+            results = fleet.async_set_config(**changes)
+        else:
+            results = fleet.async_get_config()
+        async for result in results:
+            record = {
+                "system_id": result.site_id,
+                "file": sources[result.site_id],
+                "ok": result.ok,
+                "elapsed_ms": round(result.elapsed * 1000, 1),
+                "finished_ms": round((loop.time() - start) * 1000, 1),
+            }
+            if result.ok:
+                record["config"] = result.config.raw_data
+            else:
+                record["error_type"] = type(result.error).__name__
+                record["error"] = str(result.error)
+                if result.outcome_unknown:
+                    record["outcome_unknown"] = True
+                failed = True
+            print(json.dumps(record), flush=True)
+
+    return 1 if failed else 0
+
+
 async def main():
     """Main script entry point."""
     args = parse_args()
     request = ""
     operational_mode = None
     export_mode = None
-    if args.set_backup:
+    if args.set_backup is not None:
         request += f" Backup reserve {args.set_backup}\n"
 
     if args.set_mode:
@@ -129,19 +282,33 @@ async def main():
         else:
             export_mode = netzero.EnergyExportMode.NEVER
 
-    async with aiohttp.ClientSession() as session:
-        auth = netzero.Auth(session, args.api_token)
-        site = netzero.EnergySite(auth, args.system_id)
+    changes = {
+        name: value
+        for name, value in (
+            ("backup_reserve_percent", args.set_backup),
+            ("grid_charging", args.grid_charging),
+            ("energy_exports", export_mode),
+            ("operational_mode", operational_mode),
+        )
+        if value is not None
+    }
+    if args.ndjson or len(args.systems) > 1:
+        return await run_batch(args, changes)
+
+    (system,) = args.systems
+    # Use a dedicated connection pool, closed on leaving the context
+    async with netzero.Auth(
+        None,
+        system.api_token,
+        rate_limiter=netzero.RateLimiter(args.rate_limit, args.burst),
+        host=system.url,
+    ) as auth:
+        site = netzero.EnergySite(auth, system.system_id)
 
         config = None
         if request:
             print(f"Changing Powerwall state...\n{request}")
-            config = await site.async_set_config(
-                backup_reserve_percent=args.set_backup,
-                grid_charging=args.grid_charging,
-                energy_exports=export_mode,
-                operational_mode=operational_mode,
-            )
+            config = await site.async_set_config(**changes)
 
         else:
             print("Reading Powerwall state...")
@@ -154,7 +321,10 @@ async def main():
   Grid export mode:       {config.energy_exports}
   Grid charging emabled:  {config.grid_charging}""")
         status = config.live_status
-        print(f"""Live status:
+        if status is None:
+            print("No live status reported")
+        else:
+            print(f"""Live status:
   Battery percentage charged: {status.percentage_charged:.1f}%
   Solar power:                {status.solar_power}W
   Battery power:              {status.battery_power}W
@@ -166,10 +336,10 @@ async def main():
   Storm mode:                 {"Active" if status.storm_mode_active else "Inactive"}
   Timestamp:                  {status.timestamp}""")
 
-        wcs = status.wall_connectors
-        print(f"Wall connectors: {len(wcs)}")
-        for w in wcs:
-            print(f"""  DIN: {w.din}
+            wcs = status.wall_connectors
+            print(f"Wall connectors: {len(wcs)}")
+            for w in wcs.values():
+                print(f"""  DIN: {w.din}
     State:       {w.state}
     Fault state: {w.fault_state}
     Power usage: {w.power}W
@@ -28,6 +28,18 @@ DEFAULT_GET_CONFIG = {
     "energy_exports": "pv_only",
     "grid_charging": False,
 }
+DEFAULT_LIVE_STATUS = {
+    "percentage_charged": 64.5,
+    "solar_power": 4140,
+    "battery_power": -2520,
+    "load_power": 1620,
+    "grid_power": 110,
+    "generator_power": 0,
+    "grid_status": "Active",
+    "island_status": "on_grid",
+    "storm_mode_active": False,
+    "timestamp": "2020-12-31T23:59:59.900Z",
+}
 DEFAULT_SET_CONFIG = {
     "backup_reserve_percent": 70,
     "operational_mode": "self_consumption",
@@ -60,3 +72,23 @@ async def mock_energysite_fixture(hass: HomeAssistant) -> AsyncMock:
         assert await hass.config_entries.async_setup(entry.entry_id)
         await hass.async_block_till_done()
         yield mock_energysite
+
+
+@pytest.fixture(name="mock_live_energysite")
+async def mock_live_energysite_fixture(hass: HomeAssistant) -> AsyncMock:
+    """Set up an entry whose configuration includes the live status."""
+    config = EnergySiteConfig(
+        123456, {**DEFAULT_GET_CONFIG, "live_status": DEFAULT_LIVE_STATUS}
+    )
+    site = await _mock_energysite_get_config(config, config)
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={"api_token": "ABCDEFG", "system_id": "123456"}
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        yield site
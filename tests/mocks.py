@@ -2,7 +2,7 @@
 
 from unittest.mock import AsyncMock
 
-from custom_components.powerwall_control.netzero import EnergySite
+from custom_components.powerwall_control.netzero import EnergySite, EnergySiteConfig
 
 
 async def _mock_energysite_get_config(get_config, set_config):
@@ -14,3 +14,8 @@ async def _mock_energysite_get_config(get_config, set_config):
     energysite_mock.async_set_config.return_value = set_config
 
     return energysite_mock
+
+
+def _config_with_changes(config: EnergySiteConfig, **kwargs) -> EnergySiteConfig:
+    """Copy an immutable EnergySiteConfig, replacing some API values."""
+    return EnergySiteConfig(config.site_id, {**config.raw_data, **kwargs})
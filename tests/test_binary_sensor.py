@@ -0,0 +1,145 @@
+"""Test binary sensor platform for powerwall_control integration."""
+
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.powerwall_control import STORAGE_VERSION
+from custom_components.powerwall_control.const import DOMAIN, EVENT_STATUS_CHANGED
+from custom_components.powerwall_control.netzero import EnergySiteConfig
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+
+from .conftest import DEFAULT_GET_CONFIG, DEFAULT_LIVE_STATUS
+from .mocks import _config_with_changes, _mock_energysite_get_config
+
+
+async def test_binary_sensor(hass: HomeAssistant, mock_live_energysite) -> None:
+    """Test binary sensors report the live status."""
+    assert hass.states.get("binary_sensor.powerwall_grid").state == "on"
+    assert hass.states.get("binary_sensor.powerwall_off_grid").state == "off"
+    assert hass.states.get("binary_sensor.powerwall_storm_mode").state == "off"
+
+
+async def test_binary_sensor_without_live_status(
+    hass: HomeAssistant, mock_energysite
+) -> None:
+    """Test binary sensors are unavailable when there is no live status."""
+    state = hass.states.get("binary_sensor.powerwall_grid")
+    assert state.state == STATE_UNAVAILABLE
+
+
+async def test_status_changed_events(hass: HomeAssistant, mock_live_energysite) -> None:
+    """Test events are only fired on transitions."""
+    status_coordinator = hass.config_entries.async_entries(DOMAIN)[
+        0
+    ].runtime_data.status_coordinator
+    config = status_coordinator.config_coordinator.data
+    events = async_capture_events(hass, EVENT_STATUS_CHANGED)
+
+    async def _poll(**kwargs):
+        mock_live_energysite.async_get_config.return_value = _config_with_changes(
+            config, live_status={**DEFAULT_LIVE_STATUS, **kwargs}
+        )
+        await status_coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    # Power changes alone don't fire events
+    await _poll(grid_power=2000)
+    assert events == []
+
+    # The grid going down
+    await _poll(grid_status="Inactive", island_status="off_grid")
+    assert [e.data for e in events] == [
+        {
+            "site_id": 123456,
+            "field": "grid_status",
+            "old_value": "Active",
+            "new_value": "Inactive",
+        },
+        {
+            "site_id": 123456,
+            "field": "island_status",
+            "old_value": "on_grid",
+            "new_value": "off_grid",
+        },
+    ]
+    # The entities are updated too
+    assert hass.states.get("binary_sensor.powerwall_grid").state == "off"
+    assert hass.states.get("binary_sensor.powerwall_off_grid").state == "on"
+
+    # Staying down doesn't fire again
+    events.clear()
+    await _poll(grid_status="Inactive", island_status="off_grid", grid_power=0)
+    assert events == []
+
+    # Nor does a failed poll
+    mock_live_energysite.async_get_config.side_effect = TimeoutError
+    await status_coordinator.async_refresh()
+    mock_live_energysite.async_get_config.side_effect = None
+    await hass.async_block_till_done()
+    assert events == []
+
+    await _poll(storm_mode_active=True)
+    assert [(e.data["field"], e.data["new_value"]) for e in events] == [
+        ("grid_status", "Active"),
+        ("island_status", "on_grid"),
+        ("storm_mode_active", True),
+    ]
+
+
+async def test_status_changed_events_after_snapshot(
+    hass: HomeAssistant, hass_storage
+) -> None:
+    """Test the status in the snapshot isn't compared against."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"api_token": "ABCDEFG", "system_id": "123456"},
+        entry_id="snapshot",
+    )
+    entry.add_to_hass(hass)
+    # Saved during an outage
+    hass_storage[f"{DOMAIN}.snapshot"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.snapshot",
+        "data": {
+            "site_id": 123456,
+            "config": {
+                **DEFAULT_GET_CONFIG,
+                "live_status": {
+                    **DEFAULT_LIVE_STATUS,
+                    "grid_status": "Inactive",
+                    "island_status": "off_grid",
+                },
+            },
+        },
+    }
+    config = EnergySiteConfig(
+        123456, {**DEFAULT_GET_CONFIG, "live_status": DEFAULT_LIVE_STATUS}
+    )
+    site = await _mock_energysite_get_config(config, config)
+    events = async_capture_events(hass, EVENT_STATUS_CHANGED)
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    site.async_get_config.assert_awaited_once()
+    assert hass.states.get("binary_sensor.powerwall_grid").state == "on"
+    assert events == []
+
+    # Transitions from the first poll are reported
+    status_coordinator = entry.runtime_data.status_coordinator
+    site.async_get_config.return_value = _config_with_changes(
+        config, live_status={**DEFAULT_LIVE_STATUS, "storm_mode_active": True}
+    )
+    await status_coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert [(e.data["field"], e.data["new_value"]) for e in events] == [
+        ("storm_mode_active", True)
+    ]
@@ -1,15 +1,25 @@
 """Tests for the config flow."""
 
+from datetime import timedelta
 from unittest.mock import patch
 
 import aiohttp
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.powerwall_control import (
+    VALIDATED_SITE_TIMEOUT,
+    _async_pop_validated_site,
+    async_add_validated_site,
+)
 from custom_components.powerwall_control.const import DOMAIN
+from custom_components.powerwall_control.netzero import EnergySiteConfig
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from .conftest import DEFAULT_GET_CONFIG
+from .mocks import _mock_energysite_get_config
+
 VALID_INPUT = {
     "api_token": "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789ABCD",
     "system_id": "1234567",
@@ -265,3 +275,236 @@ async def test_flow_reconfigure_step_cannot_connect(hass: HomeAssistant) -> None
         await hass.async_block_till_done()
 
     assert result["errors"] == {"base": "cannot_connect"}
+
+
+async def test_flow_user_step_single_fetch(hass: HomeAssistant) -> None:
+    """Test the entry setup reuses the configuration the flow fetched."""
+    site = await _mock_energysite_get_config(
+        EnergySiteConfig(1234567, DEFAULT_GET_CONFIG), None
+    )
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input=VALID_INPUT
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].state is config_entries.ConfigEntryState.LOADED
+    site.async_get_config.assert_awaited_once()
+    assert hass.states.get("number.powerwall_backup_reserve").state == "80"
+
+
+async def test_flow_user_step_duplicate(hass: HomeAssistant) -> None:
+    """Test a flow aborted as a duplicate doesn't keep the site it fetched."""
+    MockConfigEntry(
+        domain=DOMAIN, data=VALID_INPUT, unique_id=VALID_INPUT["system_id"]
+    ).add_to_hass(hass)
+    site = await _mock_energysite_get_config(
+        EnergySiteConfig(1234567, DEFAULT_GET_CONFIG), None
+    )
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input=VALID_INPUT
+        )
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    assert (
+        _async_pop_validated_site(
+            hass, VALID_INPUT["api_token"], VALID_INPUT["system_id"]
+        )
+        is None
+    )
+
+
+async def test_flow_user_step_url(hass: HomeAssistant) -> None:
+    """Test advanced users can set the API base URL."""
+    site = await _mock_energysite_get_config(
+        EnergySiteConfig(1234567, DEFAULT_GET_CONFIG), None
+    )
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_USER, "show_advanced_options": True},
+    )
+    assert "url" in result["data_schema"].schema
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={**VALID_INPUT, "url": "not a url"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_url"}
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ) as mock_site:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={**VALID_INPUT, "url": "http://proxy.local/api/v1"},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"]["url"] == "http://proxy.local/api/v1"
+    assert mock_site.call_args.args[0].host == "http://proxy.local/api/v1"
+    # The validated site was for the same URL, so was reused
+    site.async_get_config.assert_awaited_once()
+
+
+async def test_flow_reconfigure_step_single_fetch(hass: HomeAssistant) -> None:
+    """Test the entry reload reuses the configuration the flow fetched."""
+    site = await _mock_energysite_get_config(
+        EnergySiteConfig(1234567, DEFAULT_GET_CONFIG), None
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=VALID_INPUT["system_id"],
+        data={"api_token": "ABCDEFG", "system_id": VALID_INPUT["system_id"]},
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        site.async_get_config.reset_mock()
+
+        result = await entry.start_reconfigure_flow(hass)
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input=VALID_INPUT
+        )
+        await hass.async_block_till_done()
+
+    assert result["reason"] == "reconfigure_successful"
+    assert entry.state is config_entries.ConfigEntryState.LOADED
+    site.async_get_config.assert_awaited_once()
+
+
+async def test_validated_site_expires(hass: HomeAssistant) -> None:
+    """Test a validated site is only reused shortly after, for the same entry."""
+    site = await _mock_energysite_get_config(None, None)
+    config = EnergySiteConfig(1234567, DEFAULT_GET_CONFIG)
+    token = VALID_INPUT["api_token"]
+
+    async_add_validated_site(hass, token, "1234567", site, config)
+    assert _async_pop_validated_site(hass, "other", "1234567") is None
+    # Only used once
+    assert _async_pop_validated_site(hass, token, "1234567") is None
+
+    async_add_validated_site(hass, token, "1234567", site, config)
+    assert (
+        _async_pop_validated_site(hass, token, "1234567", host="http://proxy") is None
+    )
+
+    async_add_validated_site(hass, token, "1234567", site, config)
+    assert _async_pop_validated_site(hass, token, "1234567") == (site, config)
+
+    async_add_validated_site(hass, token, "1234567", site, config)
+    with patch.object(
+        hass.loop, "time", return_value=hass.loop.time() + VALIDATED_SITE_TIMEOUT + 1
+    ):
+        assert _async_pop_validated_site(hass, token, "1234567") is None
+
+
+async def test_options_flow(hass: HomeAssistant, mock_energysite) -> None:
+    """Test the options are applied without reloading the entry."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    coordinator = entry.runtime_data.coordinator
+    status_coordinator = entry.runtime_data.status_coordinator
+    debouncer = coordinator._debounced_control  # noqa: SLF001
+    assert debouncer.cooldown == 15
+    assert not debouncer.immediate
+    assert coordinator.verify_delay is None
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    with patch(
+        "custom_components.powerwall_control.async_setup_entry"
+    ) as mock_setup_entry:
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                "control_cooldown": 2,
+                "control_immediate": True,
+                "control_max_wait": 10,
+                "update_interval": 60,
+                "status_min_interval": 60,
+                "status_max_interval": 120,
+                "verify_delay": 45,
+                "verify_retries": 2,
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    mock_setup_entry.assert_not_called()
+    assert entry.runtime_data.coordinator is coordinator
+    assert debouncer.cooldown == 2
+    assert debouncer.immediate
+    assert debouncer.max_wait == 10
+    assert coordinator.update_interval == timedelta(minutes=60)
+    assert status_coordinator.min_interval == timedelta(seconds=60)
+    assert status_coordinator.max_interval == timedelta(seconds=120)
+    assert status_coordinator.update_interval == timedelta(seconds=60)
+    assert coordinator.verify_delay == timedelta(seconds=45)
+    assert coordinator.verify_retries == 2
+
+
+async def test_options_flow_invalid_status_interval(
+    hass: HomeAssistant, mock_energysite
+) -> None:
+    """Test the minimum status interval can't be above the maximum."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            "control_cooldown": 15,
+            "control_immediate": False,
+            "update_interval": 720,
+            "status_min_interval": 600,
+            "status_max_interval": 300,
+        },
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_status_interval"}
+    assert entry.options == {}
+
+
+async def test_options_flow_invalid_max_wait(
+    hass: HomeAssistant, mock_energysite
+) -> None:
+    """Test the control maximum wait can't be less than the cooldown."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            "control_cooldown": 15,
+            "control_immediate": False,
+            "control_max_wait": 10,
+            "update_interval": 720,
+            "status_min_interval": 30,
+            "status_max_interval": 300,
+        },
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_max_wait"}
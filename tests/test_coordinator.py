@@ -4,17 +4,34 @@ This does not re-test the functionality inheritted from the
 DataUpdatecoordinator.
 """
 
+import asyncio
 from datetime import timedelta
+import random
 from unittest.mock import patch
 
+import aiohttp
 import pytest
-from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
-from custom_components.powerwall_control import netzero
-from custom_components.powerwall_control.coordinator import PwCtrlCoordinator
+from custom_components.powerwall_control import PwCtrlRuntimeData, netzero
+from custom_components.powerwall_control.const import DOMAIN
+from custom_components.powerwall_control.coordinator import (
+    PwCtrlCoordinator,
+    PwCtrlStatusCoordinator,
+)
+from custom_components.powerwall_control.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.powerwall_control.netzero import EnergySiteConfig
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.util.dt import utcnow
 
+from .mocks import _config_with_changes
+
 control_cooldown_interval = timedelta(seconds=15)
 
 
@@ -111,3 +128,664 @@ async def test_shutdown(hass: HomeAssistant, crd: PwCtrlCoordinator) -> None:
 
     # No updates
     assert len(updates) == 0
+
+
+async def test_field_listeners(hass: HomeAssistant, crd: PwCtrlCoordinator) -> None:
+    """Test listeners are only called when their fields change."""
+    await crd.async_refresh()
+    config = crd.data
+
+    calls = {"grid": 0, "modes": 0, "all": 0}
+
+    def grid_callback():
+        calls["grid"] += 1
+
+    def modes_callback():
+        calls["modes"] += 1
+
+    def all_callback():
+        calls["all"] += 1
+
+    unsub_grid = crd.async_add_field_listener({"grid_charging"}, grid_callback)
+    unsub_modes = crd.async_add_listener(
+        modes_callback, frozenset({"operational_mode", "energy_exports"})
+    )
+    unsub_all = crd.async_add_listener(all_callback)
+
+    with pytest.raises(ValueError):
+        crd.async_add_field_listener({"bananas"}, grid_callback)
+
+    # The first update listeners see wakes everything
+    crd.async_set_updated_data(config)
+    assert calls == {"grid": 1, "modes": 1, "all": 1}
+
+    # Same values only wakes listeners without fields
+    crd.async_set_updated_data(EnergySiteConfig(config.site_id, config.raw_data))
+    assert calls == {"grid": 1, "modes": 1, "all": 2}
+
+    crd.async_set_updated_data(_config_with_changes(config, grid_charging=True))
+    assert calls == {"grid": 2, "modes": 1, "all": 3}
+
+    crd.async_set_updated_data(
+        _config_with_changes(config, grid_charging=True, energy_exports="never")
+    )
+    assert calls == {"grid": 2, "modes": 2, "all": 4}
+
+    # A change in availability wakes everything
+    crd.async_set_update_error(Exception("Boom"))
+    assert calls == {"grid": 3, "modes": 3, "all": 5}
+    crd.async_set_updated_data(crd.data)
+    assert calls == {"grid": 4, "modes": 4, "all": 6}
+
+    unsub_grid()
+    unsub_modes()
+    unsub_all()
+    crd.async_set_updated_data(config)
+    assert calls == {"grid": 4, "modes": 4, "all": 6}
+
+
+class SlowEnergySite:
+    """Stub EnergySite whose set_config takes a while to respond."""
+
+    def __init__(self, delay: float, fail: bool = False) -> None:
+        """Initialize with the site state from the default config."""
+        self.delay = delay
+        self.fail = fail
+        self.state = {
+            "backup_reserve_percent": 80,
+            "operational_mode": "autonomous",
+            "energy_exports": "pv_only",
+            "grid_charging": False,
+        }
+        self.posts: list[dict] = []
+        self.gets = 0
+        self.prewarms = 0
+
+    async def async_prewarm(self) -> bool:
+        """Count connections opened ahead of requests."""
+        self.prewarms += 1
+        return True
+
+    async def async_get_config(self) -> EnergySiteConfig:
+        """Return the current config."""
+        self.gets += 1
+        return EnergySiteConfig(123456, self.state)
+
+    async def async_set_config(self, **kwargs) -> EnergySiteConfig:
+        """Apply the changes after a delay."""
+        self.posts.append(kwargs)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise aiohttp.ClientResponseError(None, (), status=502)
+        self.state |= {k: str(v) if k in STR_FIELDS else v for k, v in kwargs.items()}
+        return EnergySiteConfig(123456, self.state)
+
+
+STR_FIELDS = {"operational_mode", "energy_exports"}
+
+
+async def test_control_changes_during_post(hass: HomeAssistant) -> None:
+    """Test changes requested while a batch is in flight go in the next batch."""
+    site = SlowEnergySite(delay=0.05)
+    crd = PwCtrlCoordinator(hass, site)
+    await crd.async_refresh()
+
+    await crd.async_request_control(backup_reserve_percent=50)
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await asyncio.sleep(0)
+    assert site.posts == [{"backup_reserve_percent": 50}]
+
+    # Request while the POST is in flight
+    await crd.async_request_control(grid_charging=True)
+    await crd.async_request_control(backup_reserve_percent=40)
+    await hass.async_block_till_done()
+    assert crd.data.backup_reserve_percent == 50
+    assert crd.applied_generation == 1
+
+    async_fire_time_changed(hass, utcnow() + 2 * control_cooldown_interval)
+    await hass.async_block_till_done()
+
+    assert site.posts == [
+        {"backup_reserve_percent": 50},
+        {"grid_charging": True, "backup_reserve_percent": 40},
+    ]
+    assert crd.data.backup_reserve_percent == 40
+    assert crd.data.grid_charging
+    assert crd.applied_generation == crd.requested_generation == 3
+
+    await crd.async_shutdown()
+
+
+async def test_control_prewarms(hass: HomeAssistant) -> None:
+    """Test a connection is opened while changes wait out the cooldown."""
+    site = SlowEnergySite(delay=0)
+    crd = PwCtrlCoordinator(hass, site)
+    await crd.async_refresh()
+
+    # Once for the changes waiting together
+    await crd.async_request_control(backup_reserve_percent=50)
+    await crd.async_request_control(grid_charging=True)
+    await hass.async_block_till_done()
+    assert site.prewarms == 1
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await hass.async_block_till_done()
+    assert len(site.posts) == 1
+
+    await crd.async_shutdown()
+
+    # Not when the change is sent straight away
+    site = SlowEnergySite(delay=0)
+    crd = PwCtrlCoordinator(hass, site)
+    crd.async_set_options(
+        update_interval=crd.update_interval,
+        cooldown=15,
+        immediate=True,
+        max_wait=60,
+        verify_delay=None,
+        verify_retries=0,
+    )
+    await crd.async_refresh()
+    await crd.async_request_control(backup_reserve_percent=40)
+    await hass.async_block_till_done()
+    assert len(site.posts) == 1
+    assert site.prewarms == 0
+
+    await crd.async_shutdown()
+
+
+async def test_control_failure_rolls_back(hass: HomeAssistant) -> None:
+    """Test a failed batch is rolled back, keeping later changes."""
+    site = SlowEnergySite(delay=0.05, fail=True)
+    crd = PwCtrlCoordinator(hass, site)
+    await crd.async_refresh()
+
+    seen = []
+    crd.async_add_field_listener(
+        {"backup_reserve_percent", "grid_charging"},
+        lambda: seen.append(
+            (
+                crd.requested_value("backup_reserve_percent"),
+                crd.requested_value("grid_charging"),
+                crd.is_pending("backup_reserve_percent"),
+            )
+        ),
+    )
+
+    # Listeners see the requested values straight away
+    await crd.async_request_control(backup_reserve_percent=50, grid_charging=True)
+    assert seen == [(50, True, True)]
+
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await asyncio.sleep(0)
+    assert len(site.posts) == 1
+    # Requested while the POST is in flight
+    await crd.async_request_control(backup_reserve_percent=30)
+    await hass.async_block_till_done()
+    assert crd.applied_generation == 0
+
+    # The failed grid_charging change is rolled back, but not the later
+    # backup reserve change.
+    assert seen[-1] == (30, False, True)
+    assert not crd.is_pending("grid_charging")
+
+    site.fail = False
+    async_fire_time_changed(hass, utcnow() + 2 * control_cooldown_interval)
+    await hass.async_block_till_done()
+    assert site.posts[-1] == {"backup_reserve_percent": 30}
+    assert crd.data.backup_reserve_percent == 30
+    assert not crd.data.grid_charging
+    assert seen[-1] == (30, False, False)
+
+    await crd.async_shutdown()
+
+
+async def test_control_stress(hass: HomeAssistant) -> None:
+    """Test many interleaved writes against a slow site lose nothing."""
+    site = SlowEnergySite(delay=0.02)
+    crd = PwCtrlCoordinator(hass, site)
+    crd._debounced_control.cooldown = 0.01
+    await crd.async_refresh()
+
+    rng = random.Random(1234)
+    expected = dict(site.state)
+    writes = 400
+    for _ in range(writes):
+        field = rng.choice(list(expected))
+        if field == "backup_reserve_percent":
+            value = rng.randrange(0, 101)
+        elif field == "grid_charging":
+            value = rng.choice([True, False])
+        elif field == "operational_mode":
+            value = rng.choice(list(netzero.OperationalMode))
+        else:
+            value = rng.choice(list(netzero.EnergyExportMode))
+        expected[field] = str(value) if field in STR_FIELDS else value
+        await crd.async_request_control(**{field: value})
+        await asyncio.sleep(rng.choice([0, 0, 0.001, 0.002]))
+
+    # Let the final batches go through
+    for _ in range(50):
+        await asyncio.sleep(0.02)
+        if crd.applied_generation == crd.requested_generation:
+            break
+    await hass.async_block_till_done()
+
+    assert crd.requested_generation == writes
+    assert crd.applied_generation == writes
+    assert site.state == expected
+    assert crd.data == EnergySiteConfig(123456, expected)
+    # Writes are coalesced into a small number of POSTs
+    assert len(site.posts) < writes / 10
+
+    await crd.async_shutdown()
+
+
+async def _suppressed_writes(hass: HomeAssistant, crd: PwCtrlCoordinator) -> int:
+    """Return the suppressed writes reported by the entry diagnostics."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.runtime_data = PwCtrlRuntimeData(crd, None, None)
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    return diagnostics["control"]["suppressed_writes"]
+
+
+async def test_control_suppresses_no_op_writes(hass: HomeAssistant) -> None:
+    """Test changes matching the known config don't cause a POST."""
+    site = SlowEnergySite(delay=0)
+    crd = PwCtrlCoordinator(hass, site)
+    await crd.async_refresh()
+
+    # Reasserting the current values
+    await crd.async_request_control(backup_reserve_percent=80, grid_charging=False)
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await hass.async_block_till_done()
+    assert site.posts == []
+    assert crd.suppressed_writes == 2
+    assert await _suppressed_writes(hass, crd) == 2
+    assert crd.applied_generation == crd.requested_generation
+
+    # Toggling back and forth within the debounce window
+    await crd.async_request_control(grid_charging=True)
+    await crd.async_request_control(
+        grid_charging=False, operational_mode=netzero.OperationalMode.BACKUP
+    )
+    async_fire_time_changed(hass, utcnow() + 2 * control_cooldown_interval)
+    await hass.async_block_till_done()
+    assert site.posts == [{"operational_mode": netzero.OperationalMode.BACKUP}]
+    assert crd.suppressed_writes == 3
+    assert await _suppressed_writes(hass, crd) == 3
+
+    # A refresh while changes are pending makes them no-ops
+    await crd.async_request_control(backup_reserve_percent=20)
+    site.state["backup_reserve_percent"] = 20
+    await crd.async_refresh()
+    async_fire_time_changed(hass, utcnow() + 3 * control_cooldown_interval)
+    await hass.async_block_till_done()
+    assert len(site.posts) == 1
+    assert crd.suppressed_writes == 4
+    assert await _suppressed_writes(hass, crd) == 4
+    assert crd.applied_generation == crd.requested_generation
+
+    await crd.async_shutdown()
+
+
+async def test_control_no_op_compares_in_flight(hass: HomeAssistant) -> None:
+    """Test no-op detection uses the in-flight batch when there is one."""
+    site = SlowEnergySite(delay=0.05)
+    crd = PwCtrlCoordinator(hass, site)
+    await crd.async_refresh()
+
+    await crd.async_request_control(grid_charging=True)
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await asyncio.sleep(0)
+    assert len(site.posts) == 1
+
+    # Reverting to the current value must still be sent, while asking
+    # for the in-flight value again needn't be.
+    await crd.async_request_control(grid_charging=True)
+    assert crd.suppressed_writes == 1
+    await crd.async_request_control(grid_charging=False)
+    assert crd.suppressed_writes == 1
+    assert await _suppressed_writes(hass, crd) == 1
+
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, utcnow() + 2 * control_cooldown_interval)
+    await hass.async_block_till_done()
+    assert site.posts == [{"grid_charging": True}, {"grid_charging": False}]
+    assert not crd.data.grid_charging
+
+    await crd.async_shutdown()
+
+
+def _status(**kwargs) -> dict:
+    """Return raw live status, with some readings changed."""
+    return {
+        "percentage_charged": 50.0,
+        "solar_power": 2000,
+        "battery_power": -1000,
+        "load_power": 1000,
+        "grid_power": 0,
+        "generator_power": 0,
+        "grid_status": "Active",
+        "island_status": "on_grid",
+        "storm_mode_active": False,
+        "timestamp": "2020-12-31T23:59:59Z",
+    } | kwargs
+
+
+class StatusEnergySite(SlowEnergySite):
+    """Energy site returning a live status which can be changed."""
+
+    def __init__(self) -> None:
+        """Initialize with a steady status."""
+        super().__init__(delay=0)
+        self.state["live_status"] = _status()
+
+
+async def test_status_interval_adapts(hass: HomeAssistant) -> None:
+    """Test the status poll interval backs off, and shortens on changes."""
+    site = StatusEnergySite()
+    crd = PwCtrlCoordinator(hass, site)
+    status = PwCtrlStatusCoordinator(
+        hass, crd, timedelta(seconds=30), timedelta(seconds=200)
+    )
+
+    # Steady readings back off to the maximum
+    intervals = []
+    for _ in range(5):
+        await status.async_refresh()
+        intervals.append(status.update_interval.total_seconds())
+    assert intervals == [30, 60, 120, 200, 200]
+
+    # A small change doesn't count
+    site.state["live_status"] = _status(battery_power=-1200)
+    await status.async_refresh()
+    assert status.update_interval == timedelta(seconds=200)
+
+    # A battery swing polls quickly again
+    site.state["live_status"] = _status(battery_power=2000)
+    await status.async_refresh()
+    assert status.update_interval == timedelta(seconds=30)
+    await status.async_refresh()
+    assert status.update_interval == timedelta(seconds=60)
+
+    # As does the grid going down, for as long as it is down
+    site.state["live_status"] = _status(grid_status="Inactive")
+    for _ in range(3):
+        await status.async_refresh()
+        assert status.update_interval == timedelta(seconds=30)
+
+    site.state["live_status"] = _status()
+    await status.async_refresh()
+    await status.async_refresh()
+    assert status.update_interval == timedelta(seconds=60)
+
+
+async def test_status_feeds_config(hass: HomeAssistant) -> None:
+    """Test status polls update the configuration, without duplicate calls."""
+    site = StatusEnergySite()
+    crd = PwCtrlCoordinator(hass, site)
+    status = PwCtrlStatusCoordinator(hass, crd, timedelta(hours=1), timedelta(hours=1))
+    await crd.async_refresh()
+    assert site.gets == 1
+
+    config_updates = []
+    crd.async_add_field_listener(
+        {"backup_reserve_percent"}, lambda: config_updates.append(crd.data)
+    )
+    status.async_add_listener(lambda: None)
+
+    # Poll for longer than the configuration update interval
+    site.state["backup_reserve_percent"] = 30
+    now = utcnow()
+    for hour in range(1, 14):
+        async_fire_time_changed(hass, now + timedelta(hours=hour, seconds=1))
+        await hass.async_block_till_done()
+
+    # Every call was a status poll, which passed on the configuration
+    assert site.gets == 1 + 13
+    assert [c.backup_reserve_percent for c in config_updates] == [30]
+    assert crd.data.live_status == status.data
+
+    await status.async_shutdown()
+    await crd.async_shutdown()
+
+
+class GatedEnergySite(StatusEnergySite):
+    """Energy site whose reads wait to return the state when they were sent."""
+
+    def __init__(self) -> None:
+        """Initialize with reads returning straight away."""
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def async_get_config(self) -> EnergySiteConfig:
+        """Return the config from when the read was sent, once released."""
+        config = await super().async_get_config()
+        await self.gate.wait()
+        return config
+
+
+@pytest.mark.parametrize("poller", ["config", "status"])
+async def test_read_overlapping_post_dropped(hass: HomeAssistant, poller) -> None:
+    """Test a read sent before a POST doesn't replace its newer result."""
+    site = GatedEnergySite()
+    crd = PwCtrlCoordinator(hass, site)
+    status = PwCtrlStatusCoordinator(hass, crd)
+    await crd.async_refresh()
+
+    site.gate.clear()
+    refresh = hass.async_create_task(
+        (crd if poller == "config" else status).async_refresh()
+    )
+    await asyncio.sleep(0)
+    assert site.gets == 2
+    await crd.async_set_config_now(backup_reserve_percent=50)
+
+    # The read returns the configuration from before the POST
+    site.gate.set()
+    await refresh
+    assert crd.data.backup_reserve_percent == 50
+    assert site.state["backup_reserve_percent"] == 50
+
+    # So changing back isn't mistaken for a no-op
+    await crd.async_request_control(backup_reserve_percent=80)
+    assert crd.suppressed_writes == 0
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await hass.async_block_till_done()
+    assert site.posts[-1] == {"backup_reserve_percent": 80}
+
+    # Later reads are used
+    site.state["grid_charging"] = True
+    await status.async_refresh()
+    assert crd.data.grid_charging
+
+    await status.async_shutdown()
+    await crd.async_shutdown()
+
+
+async def test_set_config_now_waits_for_in_flight(hass: HomeAssistant) -> None:
+    """Test immediate changes are sent after the in-flight batch, in one POST."""
+    site = SlowEnergySite(delay=0.05)
+    crd = PwCtrlCoordinator(hass, site)
+    await crd.async_refresh()
+
+    await crd.async_request_control(backup_reserve_percent=50)
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await asyncio.sleep(0)
+    assert site.posts == [{"backup_reserve_percent": 50}]
+
+    # Requested while the POST is in flight, then flushed
+    await crd.async_request_control(grid_charging=True)
+    config = await crd.async_set_config_now(backup_reserve_percent=30)
+
+    assert site.posts == [
+        {"backup_reserve_percent": 50},
+        {"grid_charging": True, "backup_reserve_percent": 30},
+    ]
+    assert config.backup_reserve_percent == 30
+    assert config.grid_charging
+    assert crd.data == config
+    assert crd.applied_generation == crd.requested_generation == 3
+
+    # Nothing is left for the debouncer to send
+    async_fire_time_changed(hass, utcnow() + 2 * control_cooldown_interval)
+    await hass.async_block_till_done()
+    assert len(site.posts) == 2
+
+    await crd.async_shutdown()
+
+
+async def test_set_config_now_immediate(hass: HomeAssistant) -> None:
+    """Test immediate changes aren't taken by a leading edge debounce."""
+    site = SlowEnergySite(delay=0.05)
+    crd = PwCtrlCoordinator(hass, site)
+    crd.async_set_options(
+        update_interval=crd.update_interval,
+        cooldown=0.01,
+        immediate=True,
+        max_wait=None,
+        verify_delay=None,
+        verify_retries=0,
+    )
+    await crd.async_refresh()
+
+    # Sent straight away
+    await crd.async_request_control(backup_reserve_percent=50)
+    assert site.posts == [{"backup_reserve_percent": 50}]
+
+    # Requested while the POST is in flight, after the cooldown ends
+    config = await crd.async_set_config_now(grid_charging=True)
+    assert site.posts == [{"backup_reserve_percent": 50}, {"grid_charging": True}]
+    assert config.grid_charging
+    assert crd.data == config
+    assert crd.applied_generation == crd.requested_generation == 2
+
+    await hass.async_block_till_done()
+    assert len(site.posts) == 2
+
+    await crd.async_shutdown()
+
+
+async def test_verify_after_write(hass: HomeAssistant) -> None:
+    """Test applied changes are verified together with a single read."""
+    site = SlowEnergySite(delay=0)
+    crd = PwCtrlCoordinator(hass, site)
+    crd.verify_delay = timedelta(seconds=30)
+    await crd.async_refresh()
+    assert site.gets == 1
+
+    await crd.async_request_control(backup_reserve_percent=50)
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await hass.async_block_till_done()
+    await crd.async_set_config_now(grid_charging=True)
+    assert len(site.posts) == 2
+
+    # Nothing is read until the delay after the last POST
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert site.gets == 1
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert site.gets == 2
+    assert len(site.posts) == 2
+    assert not crd._verify_expected
+
+    # Later polls don't verify again
+    await crd.async_refresh()
+    assert len(site.posts) == 2
+
+    await crd.async_shutdown()
+
+
+@pytest.mark.parametrize(
+    ("status_interval", "extra_gets"),
+    [(timedelta(seconds=45), 0), (timedelta(hours=1), 1)],
+)
+async def test_verify_with_status_polls(
+    hass: HomeAssistant, status_interval, extra_gets
+) -> None:
+    """Test verification uses a status poll due in time, rather than a read."""
+    site = StatusEnergySite()
+    crd = PwCtrlCoordinator(hass, site)
+    crd.verify_delay = timedelta(seconds=30)
+    status = PwCtrlStatusCoordinator(hass, crd, status_interval, status_interval)
+    await crd.async_refresh()
+    status.async_add_listener(lambda: None)
+
+    await crd.async_set_config_now(backup_reserve_percent=50)
+    assert site.gets == 1
+
+    # Only read here if the status poll isn't due before the deadline
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert site.gets == 1 + extra_gets
+
+    async_fire_time_changed(hass, utcnow() + status_interval + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert site.gets == 2 + extra_gets
+    assert not crd._verify_expected
+    assert len(site.posts) == 1
+
+    await status.async_shutdown()
+    await crd.async_shutdown()
+
+
+async def test_verify_drift(hass: HomeAssistant) -> None:
+    """Test drifted changes are re-applied, then raise a repair issue."""
+    site = SlowEnergySite(delay=0)
+    crd = PwCtrlCoordinator(hass, site)
+    crd.verify_delay = timedelta(seconds=30)
+    crd.verify_retries = 1
+    await crd.async_refresh()
+    issue_registry = ir.async_get(hass)
+
+    await crd.async_set_config_now(backup_reserve_percent=50, grid_charging=True)
+    # Something else changes the backup reserve
+    site.state = {**site.state, "backup_reserve_percent": 100}
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert site.gets == 2
+    assert crd.requested_value("backup_reserve_percent") == 50
+    assert crd.is_pending("backup_reserve_percent")
+
+    # Only the drifted field is re-applied
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=46))
+    await hass.async_block_till_done()
+    assert site.posts[-1] == {"backup_reserve_percent": 50}
+    assert issue_registry.async_get_issue(DOMAIN, "config_drift_123456") is None
+
+    # It changes again, so once the retries are used up an issue is raised
+    site.state = {**site.state, "backup_reserve_percent": 100}
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=100))
+    await hass.async_block_till_done()
+    assert len(site.posts) == 2
+    assert crd.data.backup_reserve_percent == 100
+    issue = issue_registry.async_get_issue(DOMAIN, "config_drift_123456")
+    assert issue is not None
+    assert issue.translation_placeholders["fields"] == "backup_reserve_percent"
+
+    # A change which is kept clears the issue
+    await crd.async_set_config_now(backup_reserve_percent=60)
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=200))
+    await hass.async_block_till_done()
+    assert crd.data.backup_reserve_percent == 60
+    assert issue_registry.async_get_issue(DOMAIN, "config_drift_123456") is None
+
+    await crd.async_shutdown()
+
+
+async def test_verify_off(hass: HomeAssistant) -> None:
+    """Test nothing is read back when verification is off."""
+    site = SlowEnergySite(delay=0)
+    crd = PwCtrlCoordinator(hass, site)
+    await crd.async_refresh()
+
+    await crd.async_set_config_now(backup_reserve_percent=50)
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=120))
+    await hass.async_block_till_done()
+    assert site.gets == 1
+
+    await crd.async_shutdown()
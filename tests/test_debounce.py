@@ -0,0 +1,209 @@
+"""Tests for the maximum wait debouncer.
+
+These run the event loop on a fake clock, so a simulated burst of
+calls lasting minutes takes no real time.
+"""
+
+import asyncio
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.powerwall_control.debounce import MaxWaitDebouncer
+from homeassistant.core import HomeAssistant
+from homeassistant.util.async_ import get_scheduled_timer_handles
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FakeClock:
+    """Fake event loop clock, which only moves when advanced."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Initialize the clock at the loop's time."""
+        self.loop = loop
+        self.now = loop.time()
+
+    def time(self) -> float:
+        """Return the fake time."""
+        return self.now
+
+    async def advance(self, seconds: float) -> None:
+        """Move the clock on, stopping at each timer due on the way."""
+        until = self.now + seconds
+        while True:
+            due = [
+                handle.when()
+                for handle in get_scheduled_timer_handles(self.loop)
+                if not handle.cancelled() and handle.when() <= until
+            ]
+            self.now = min(due, default=until)
+            await self._run_due()
+            if not due:
+                return
+
+    async def _run_due(self) -> None:
+        """Let the loop run the timers now due, and the tasks they start."""
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock(hass: HomeAssistant):
+    """Run the event loop on a fake clock."""
+    clock = FakeClock(hass.loop)
+    with patch.object(hass.loop, "time", clock.time):
+        yield clock
+
+
+class Recorder:
+    """Function to debounce, which records when it runs."""
+
+    def __init__(self, clock: FakeClock) -> None:
+        """Initialize with no runs."""
+        self.clock = clock
+        self.runs: list[float] = []
+
+    def __call__(self) -> None:
+        """Record a run."""
+        self.runs.append(self.clock.now)
+
+
+def _latencies(calls: list[float], runs: list[float]) -> list[float]:
+    """Return how long each call waited for a run to serve it."""
+    return [min(run for run in runs if run >= call) - call for call in calls]
+
+
+async def _ramp(
+    debouncer: MaxWaitDebouncer, clock: FakeClock, every: float, until: float
+) -> list[float]:
+    """Call the debouncer at a steady rate, and then let it settle."""
+    calls = []
+    start = clock.now
+    while clock.now - start < until:
+        calls.append(clock.now)
+        await debouncer.async_call()
+        await clock.advance(every)
+    await clock.advance(debouncer.cooldown + 1)
+    return calls
+
+
+async def test_coalesces_bursts(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test a burst of calls runs once, a cooldown after the last."""
+    recorder = Recorder(clock)
+    debouncer = MaxWaitDebouncer(
+        hass, _LOGGER, cooldown=15, immediate=False, max_wait=60, function=recorder
+    )
+
+    calls = await _ramp(debouncer, clock, every=1, until=10)
+
+    assert len(calls) == 10
+    assert recorder.runs == [calls[-1] + 15]
+    assert not debouncer.pending
+
+
+async def test_max_wait_bounds_latency(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test a steady stream of calls is served within the maximum wait."""
+    recorder = Recorder(clock)
+    debouncer = MaxWaitDebouncer(
+        hass, _LOGGER, cooldown=15, immediate=False, max_wait=60, function=recorder
+    )
+
+    # A slider dragged for five minutes, changing every second
+    calls = await _ramp(debouncer, clock, every=1, until=300)
+
+    latencies = _latencies(calls, recorder.runs)
+    assert max(latencies) <= 60
+    # One run per maximum wait, so still coalesced 60 to 1
+    assert len(recorder.runs) == 5
+    assert len(calls) / len(recorder.runs) == 60
+
+
+async def test_unbounded_wait(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test without a maximum wait, a steady stream postpones the call."""
+    recorder = Recorder(clock)
+    debouncer = MaxWaitDebouncer(
+        hass, _LOGGER, cooldown=15, immediate=False, max_wait=None, function=recorder
+    )
+
+    calls = await _ramp(debouncer, clock, every=1, until=300)
+
+    assert len(recorder.runs) == 1
+    assert max(_latencies(calls, recorder.runs)) == 314
+
+
+async def test_immediate(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test the leading edge after a quiet period runs straight away."""
+    recorder = Recorder(clock)
+    debouncer = MaxWaitDebouncer(
+        hass, _LOGGER, cooldown=15, immediate=True, max_wait=60, function=recorder
+    )
+    start = clock.now
+
+    await debouncer.async_call()
+    assert recorder.runs == [start]
+
+    # Further calls in the cooldown are debounced
+    await clock.advance(5)
+    await debouncer.async_call()
+    await clock.advance(5)
+    await debouncer.async_call()
+    assert recorder.runs == [start]
+    await clock.advance(15)
+    assert recorder.runs == [start, start + 25]
+
+    # Until it has been quiet for a cooldown
+    await clock.advance(15)
+    await debouncer.async_call()
+    assert recorder.runs == [start, start + 25, start + 40]
+
+
+async def test_calls_while_running(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test calls which become due while the function runs wait for it."""
+    release = asyncio.Event()
+    runs = []
+
+    async def _function() -> None:
+        runs.append(clock.now)
+        await release.wait()
+
+    debouncer = MaxWaitDebouncer(
+        hass, _LOGGER, cooldown=1, immediate=False, max_wait=5, function=_function
+    )
+    start = clock.now
+
+    await debouncer.async_call()
+    await clock.advance(1)
+    assert runs == [start + 1]
+
+    # Due while the first run is still going
+    await debouncer.async_call()
+    await clock.advance(10)
+    assert runs == [start + 1]
+
+    release.set()
+    await clock.advance(0)
+    assert runs == [start + 1, start + 11]
+    await hass.async_block_till_done()
+
+
+async def test_cancel_and_shutdown(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test cancelled and shut down debouncers don't run."""
+    recorder = Recorder(clock)
+    debouncer = MaxWaitDebouncer(
+        hass, _LOGGER, cooldown=1, immediate=False, max_wait=5, function=recorder
+    )
+
+    await debouncer.async_call()
+    assert debouncer.pending
+    debouncer.async_cancel()
+    assert not debouncer.pending
+    await clock.advance(10)
+
+    await debouncer.async_call()
+    debouncer.async_shutdown()
+    await debouncer.async_call()
+    await clock.advance(10)
+
+    assert recorder.runs == []
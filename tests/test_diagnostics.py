@@ -0,0 +1,53 @@
+"""Test diagnostics for powerwall_control integration."""
+
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.powerwall_control.const import DOMAIN
+from custom_components.powerwall_control.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.components.number import (
+    ATTR_VALUE,
+    DOMAIN as NUMBER_DOMAIN,
+    SERVICE_SET_VALUE,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+
+from .conftest import DEFAULT_GET_CONFIG
+
+control_cooldown_interval = timedelta(seconds=15)
+
+
+async def test_diagnostics(hass: HomeAssistant, mock_energysite) -> None:
+    """Test diagnostics report the configuration and suppressed writes."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+
+    # Setting the backup reserve it already has needs no POST
+    await hass.services.async_call(
+        NUMBER_DOMAIN,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 80.0, ATTR_ENTITY_ID: "number.powerwall_backup_reserve"},
+        blocking=True,
+    )
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await hass.async_block_till_done()
+    mock_energysite.async_set_config.assert_not_called()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["entry"]["data"] == {
+        "api_token": REDACTED,
+        "system_id": "123456",
+    }
+    assert diagnostics["config"] == DEFAULT_GET_CONFIG
+    assert diagnostics["stale"] is False
+    assert diagnostics["control"] == {
+        "requested_generation": 1,
+        "applied_generation": 1,
+        "applied_posts": 0,
+        "suppressed_writes": 1,
+    }
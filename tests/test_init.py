@@ -1,10 +1,216 @@
 """Test powerwall_control init."""
 
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import aiohttp
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.powerwall_control import STORAGE_VERSION
 from custom_components.powerwall_control.const import DOMAIN
+from custom_components.powerwall_control.coordinator import SNAPSHOT_SAVE_DELAY
+from custom_components.powerwall_control.netzero import EnergySiteConfig
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.setup import async_setup_component
+from homeassistant.util.dt import utcnow
+
+from .conftest import DEFAULT_GET_CONFIG, DEFAULT_LIVE_STATUS
+from .mocks import _mock_energysite_get_config
+
+ENTRY_DATA = {"api_token": "ABCDEFG", "system_id": "123456"}
 
 
 async def test_async_setup(hass: HomeAssistant) -> None:
     """Test async setup."""
     assert await async_setup_component(hass, DOMAIN, {})
+
+
+async def test_setup_from_snapshot(hass: HomeAssistant, hass_storage) -> None:
+    """Test entities are served from the snapshot until netzero responds."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA, entry_id="snapshot")
+    entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.snapshot"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.snapshot",
+        "data": {
+            "site_id": 123456,
+            "config": {**DEFAULT_GET_CONFIG, "backup_reserve_percent": 50},
+        },
+    }
+
+    # Netzero doesn't respond until released
+    release = asyncio.Event()
+    site = await _mock_energysite_get_config(None, None)
+
+    async def _get_config():
+        await release.wait()
+        return EnergySiteConfig(123456, DEFAULT_GET_CONFIG)
+
+    site.async_get_config.side_effect = _get_config
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=False)
+
+        state = hass.states.get("number.powerwall_backup_reserve")
+        assert state.state == "50"
+        assert state.attributes["stale"] is True
+
+        release.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get("number.powerwall_backup_reserve")
+    assert state.state == "80"
+    assert "stale" not in state.attributes
+    # The other entities are told the data is no longer stale too
+    assert "stale" not in hass.states.get("switch.powerwall_grid_charging").attributes
+
+
+async def test_setup_from_snapshot_unreachable(
+    hass: HomeAssistant, hass_storage
+) -> None:
+    """Test entities stay available from the snapshot if netzero fails."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA, entry_id="snapshot")
+    entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.snapshot"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.snapshot",
+        "data": {"site_id": 123456, "config": DEFAULT_GET_CONFIG},
+    }
+    site = await _mock_energysite_get_config(None, None)
+    site.async_get_config.side_effect = aiohttp.ClientConnectionError
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    site.async_get_config.assert_awaited_once()
+    state = hass.states.get("number.powerwall_backup_reserve")
+    assert state.state == "80"
+    assert state.attributes["stale"] is True
+
+
+async def test_setup_snapshot_other_site(hass: HomeAssistant, hass_storage) -> None:
+    """Test a snapshot of a different site is ignored."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA, entry_id="snapshot")
+    entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.snapshot"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.snapshot",
+        "data": {
+            "site_id": 654321,
+            "config": {**DEFAULT_GET_CONFIG, "backup_reserve_percent": 50},
+        },
+    }
+    site = await _mock_energysite_get_config(
+        EnergySiteConfig(123456, DEFAULT_GET_CONFIG), None
+    )
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    site.async_get_config.assert_awaited_once()
+    state = hass.states.get("number.powerwall_backup_reserve")
+    assert state.state == "80"
+    assert "stale" not in state.attributes
+
+
+async def test_snapshot_saved(hass: HomeAssistant, hass_storage) -> None:
+    """Test the configuration read from netzero is saved as a snapshot."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA, entry_id="saved")
+    entry.add_to_hass(hass)
+    site = await _mock_energysite_get_config(
+        EnergySiteConfig(123456, DEFAULT_GET_CONFIG), None
+    )
+
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY))
+    await hass.async_block_till_done()
+
+    assert hass_storage[f"{DOMAIN}.saved"]["data"] == {
+        "site_id": 123456,
+        "config": DEFAULT_GET_CONFIG,
+    }
+
+    # Removing the entry removes its snapshot
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.saved" not in hass_storage
+
+
+async def test_two_entries(hass: HomeAssistant) -> None:
+    """Test entries for two systems each get all their entities."""
+    site = await _mock_energysite_get_config(
+        EnergySiteConfig(
+            123456, {**DEFAULT_GET_CONFIG, "live_status": DEFAULT_LIVE_STATUS}
+        ),
+        None,
+    )
+    entries = [
+        MockConfigEntry(domain=DOMAIN, data={**ENTRY_DATA, "system_id": system_id})
+        for system_id in ("123456", "654321")
+    ]
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+    first, second = (
+        er.async_entries_for_config_entry(entity_registry, entry.entry_id)
+        for entry in entries
+    )
+    assert len(first) == len(second) > 10
+    assert all(entity.unique_id.startswith("654321_") for entity in second)
+    assert hass.states.get("sensor.powerwall_solar_power_2").state == "4140"
+
+
+async def test_unique_ids_migrated(hass: HomeAssistant) -> None:
+    """Test unique IDs from before they included the system ID are migrated."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "123456")}
+    )
+    entity_registry = er.async_get(hass)
+    old = entity_registry.async_get_or_create(
+        "number",
+        DOMAIN,
+        "backup_reserve",
+        config_entry=entry,
+        device_id=device.id,
+        suggested_object_id="my_reserve",
+    )
+    site = await _mock_energysite_get_config(
+        EnergySiteConfig(123456, DEFAULT_GET_CONFIG), None
+    )
+    with patch(
+        "custom_components.powerwall_control.netzero.EnergySite", return_value=site
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    # The entity keeps its ID, and no duplicate is created
+    assert entity_registry.async_get(old.entity_id).unique_id == "123456_backup_reserve"
+    assert hass.states.get("number.my_reserve").state == "80"
+    assert hass.states.get("number.powerwall_backup_reserve") is None
@@ -1,10 +1,18 @@
 """Test netzero API."""
 
+import asyncio
+import contextlib
 import datetime
+import email.utils
+from unittest.mock import patch
 
 import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from aioresponses import aioresponses
+import pytest
 
+from benchmarks.emulator import Emulator, EmulatorOptions
 import netzero
 
 
@@ -645,3 +653,1001 @@ def test_energy_wall_connector_eq():
 
         # Compare against another type
         assert wc != "Bananas"
+
+
+def test_energy_site_config_immutable():
+    """Test the model objects can't be modified after parsing."""
+    json_cfg = {
+        "backup_reserve_percent": 80,
+        "operational_mode": "autonomous",
+        "energy_exports": "pv_only",
+        "grid_charging": True,
+        "live_status": {
+            "percentage_charged": 100.0,
+            "solar_power": 4140,
+            "battery_power": -2520,
+            "load_power": 1620,
+            "grid_power": 110,
+            "generator_power": 40,
+            "grid_status": "Active",
+            "island_status": "on_grid",
+            "storm_mode_active": False,
+            "timestamp": "2020-12-31T23:59:59.900Z",
+            "wall_connectors": [
+                {
+                    "din": "abcd",
+                    "wall_connector_state": 1,
+                    "wall_connector_fault_state": 2,
+                    "wall_connector_power": 0,
+                },
+            ],
+        },
+    }
+    config = netzero.EnergySiteConfig(12345, json_cfg)
+    status = config.live_status
+    wc = status.wall_connectors["abcd"]
+
+    for obj, name in (
+        (config, "backup_reserve_percent"),
+        (status, "battery_power"),
+        (wc, "power"),
+    ):
+        with pytest.raises(AttributeError):
+            setattr(obj, name, 1)
+        with pytest.raises(AttributeError):
+            delattr(obj, name)
+        # No __dict__ for arbitrary attributes either
+        assert not hasattr(obj, "__dict__")
+
+    # The parsed values don't track changes to the source dictionary
+    json_cfg["backup_reserve_percent"] = 10
+    assert config.backup_reserve_percent == 80
+
+
+def test_energy_site_config_raw_data():
+    """Test raw_data rebuilds an equivalent API response."""
+    json_cfg = {
+        "backup_reserve_percent": 80,
+        "operational_mode": "autonomous",
+        "energy_exports": None,
+        "grid_charging": True,
+        "live_status": {
+            "percentage_charged": 13.0,
+            "solar_power": 3000,
+            "battery_power": 0,
+            "load_power": 1000,
+            "grid_power": 2500,
+            "generator_power": 100,
+            "grid_status": "Inactive",
+            "island_status": "off_grid",
+            "storm_mode_active": True,
+            "timestamp": "2021-01-01T01:00:00.000Z",
+            "wall_connectors": [
+                {
+                    "din": "efgh",
+                    "wall_connector_state": 2,
+                    "wall_connector_fault_state": 1,
+                    "wall_connector_power": 100,
+                },
+            ],
+        },
+    }
+    config = netzero.EnergySiteConfig(12345, json_cfg)
+    raw_data = config.raw_data
+
+    assert raw_data["backup_reserve_percent"] == 80
+    assert raw_data["operational_mode"] == "autonomous"
+    assert raw_data["energy_exports"] is None
+    assert raw_data["live_status"]["grid_status"] == "Inactive"
+    assert (
+        raw_data["live_status"]["wall_connectors"]
+        == (json_cfg["live_status"]["wall_connectors"])
+    )
+
+    # Parsing the rebuilt data gives the same values
+    copy = netzero.EnergySiteConfig(12345, raw_data)
+    assert copy == config
+    assert copy.live_status == config.live_status
+    assert copy.live_status.timestamp == config.live_status.timestamp
+    assert hash(copy) == hash(config)
+
+
+def test_energy_site_config_no_live_status():
+    """Test EnergySiteConfig without live_status in the response."""
+    json_cfg = {
+        "backup_reserve_percent": 80,
+        "operational_mode": "autonomous",
+        "energy_exports": "pv_only",
+        "grid_charging": True,
+    }
+    config = netzero.EnergySiteConfig(12345, json_cfg)
+    assert config.live_status is None
+    assert "live_status" not in config.raw_data
+
+
+def test_energy_site_status_wall_connectors_index():
+    """Test the wall connector index is built once and is read-only."""
+    json_status = {
+        "percentage_charged": 100.0,
+        "solar_power": 4140,
+        "battery_power": -2520,
+        "load_power": 1620,
+        "grid_power": 110,
+        "generator_power": 40,
+        "grid_status": "Active",
+        "island_status": "on_grid",
+        "storm_mode_active": False,
+        "timestamp": "2020-12-31T23:59:59.900Z",
+        "wall_connectors": [
+            {
+                "din": "abcd",
+                "wall_connector_state": 1,
+                "wall_connector_fault_state": 2,
+                "wall_connector_power": 0,
+            },
+        ],
+    }
+    status = netzero.EnergySiteStatus(12345, json_status)
+
+    # Each access returns the same index, and the same objects
+    assert status.wall_connectors is status.wall_connectors
+    assert status.wall_connectors["abcd"] is status.wall_connectors["abcd"]
+
+    with pytest.raises(TypeError):
+        status.wall_connectors["efgh"] = status.wall_connectors["abcd"]
+
+    # No wall connectors in the response gives an empty index
+    del json_status["wall_connectors"]
+    status = netzero.EnergySiteStatus(12345, json_status)
+    assert len(status.wall_connectors) == 0
+
+
+def test_energy_site_status_diff_wall_connectors():
+    """Test EnergySiteStatus diff_wall_connectors."""
+    json_status = {
+        "percentage_charged": 100.0,
+        "solar_power": 4140,
+        "battery_power": -2520,
+        "load_power": 1620,
+        "grid_power": 110,
+        "generator_power": 40,
+        "grid_status": "Active",
+        "island_status": "on_grid",
+        "storm_mode_active": False,
+        "timestamp": "2020-12-31T23:59:59.900Z",
+    }
+    json_wc = [
+        {
+            "din": "abcd",
+            "wall_connector_state": 1,
+            "wall_connector_fault_state": 2,
+            "wall_connector_power": 0,
+        },
+        {
+            "din": "efgh",
+            "wall_connector_state": 2,
+            "wall_connector_fault_state": 1,
+            "wall_connector_power": 100,
+        },
+        {
+            "din": "wc12345",
+            "wall_connector_state": 389,
+            "wall_connector_fault_state": 541,
+            "wall_connector_power": 73,
+        },
+    ]
+    status1 = netzero.EnergySiteStatus(
+        12345, {**json_status, "wall_connectors": json_wc[0:2]}
+    )
+    status2 = netzero.EnergySiteStatus(
+        12345,
+        {
+            **json_status,
+            "wall_connectors": [
+                {**json_wc[1], "wall_connector_power": 7000},
+                json_wc[2],
+            ],
+        },
+    )
+
+    # Everything is new when there's nothing to compare against
+    diff = status1.diff_wall_connectors(None)
+    assert diff.added == {"abcd", "efgh"}
+    assert not diff.removed
+    assert not diff.changed
+    assert diff
+
+    diff = status2.diff_wall_connectors(status1)
+    assert diff.added == {"wc12345"}
+    assert diff.removed == {"abcd"}
+    assert diff.changed == {"efgh"}
+
+    diff = status1.diff_wall_connectors(status2)
+    assert diff.added == {"abcd"}
+    assert diff.removed == {"wc12345"}
+    assert diff.changed == {"efgh"}
+
+    # No differences
+    diff = status2.diff_wall_connectors(
+        netzero.EnergySiteStatus(12345, status2.raw_data)
+    )
+    assert not diff
+
+
+def test_energy_site_config_diff():
+    """Test EnergySiteConfig diff."""
+    json_cfg = {
+        "backup_reserve_percent": 80,
+        "operational_mode": "autonomous",
+        "energy_exports": "pv_only",
+        "grid_charging": True,
+    }
+    json_status = {
+        "percentage_charged": 100.0,
+        "solar_power": 4140,
+        "battery_power": -2520,
+        "load_power": 1620,
+        "grid_power": 110,
+        "generator_power": 40,
+        "grid_status": "Active",
+        "island_status": "on_grid",
+        "storm_mode_active": False,
+        "timestamp": "2020-12-31T23:59:59.900Z",
+    }
+    config = netzero.EnergySiteConfig(12345, json_cfg)
+
+    assert config.diff(None) == netzero.CONFIG_FIELDS
+    assert config.diff(netzero.EnergySiteConfig(54321, json_cfg)) == (
+        netzero.CONFIG_FIELDS
+    )
+    assert config.diff(netzero.EnergySiteConfig(12345, json_cfg)) == set()
+
+    other = netzero.EnergySiteConfig(
+        12345, {**json_cfg, "grid_charging": False, "energy_exports": None}
+    )
+    assert config.diff(other) == {"grid_charging", "energy_exports"}
+    assert other.diff(config) == {"grid_charging", "energy_exports"}
+
+    # Status changes are reported against live_status, even though
+    # they don't affect EnergySiteConfig equality
+    with_status = netzero.EnergySiteConfig(
+        12345, {**json_cfg, "live_status": json_status}
+    )
+    assert with_status == config
+    assert with_status.diff(config) == {"live_status"}
+    changed_status = netzero.EnergySiteConfig(
+        12345, {**json_cfg, "live_status": {**json_status, "solar_power": 0}}
+    )
+    assert changed_status.diff(with_status) == {"live_status"}
+
+
+async def test_auth_dedicated_session():
+    """Test Auth creating and closing its own tuned session."""
+    options = netzero.ConnectionOptions(
+        limit_per_host=2, ttl_dns_cache=60, keepalive_timeout=30
+    )
+    async with netzero.Auth(
+        None, "TESTTOKENABCDEF12345", connection_options=options
+    ) as auth:
+        session = auth.websession
+        assert not session.closed
+        assert session.connector.limit_per_host == 2
+        assert session.connector.use_dns_cache
+
+        with aioresponses() as mock:
+            mock.head("https://api.netzero.energy/api/v1", status=404)
+            # Any response means we have a connection
+            assert await auth.async_prewarm()
+
+        with aioresponses() as mock:
+            mock.head(
+                "https://api.netzero.energy/api/v1",
+                exception=aiohttp.ClientConnectionError("Boom"),
+            )
+            assert not await auth.async_prewarm()
+
+    assert session.closed
+
+
+async def test_auth_borrowed_session():
+    """Test Auth doesn't close a session it was given."""
+    async with aiohttp.ClientSession() as session:
+        auth = netzero.Auth(session, "TESTTOKENABCDEF12345")
+        await auth.async_close()
+        assert not session.closed
+
+
+class FaultInjector:
+    """Local API server which fails requests according to a script.
+
+    Each entry in the script is a status to respond with, a
+    (status, headers) pair, or "reset" to drop the connection. Once
+    the script is used up, requests succeed.
+    """
+
+    def __init__(self, *script, delay: float = 0) -> None:
+        """Initialize with a script of faults, and a response delay."""
+        self.script = list(script)
+        self.delay = delay
+        self.requests: list[str] = []
+        self.app = web.Application()
+        self.app.router.add_route("*", "/api/v1/{site}/config", self.handle)
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """Handle a config request."""
+        self.requests.append(request.method)
+        fault = self.script.pop(0) if self.script else 200
+        await asyncio.sleep(self.delay)
+        if fault == "reset":
+            request.transport.close()
+            return web.Response()
+        status, headers = fault if isinstance(fault, tuple) else (fault, {})
+        body = {
+            "backup_reserve_percent": 80,
+            "operational_mode": "autonomous",
+            "energy_exports": "pv_only",
+            "grid_charging": True,
+        }
+        return web.json_response(body, status=status, headers=headers)
+
+
+FAST_RETRY = netzero.RetryPolicy(attempts=3, base_delay=0.01, max_delay=1)
+
+
+async def _site_for(server: TestServer, retry_policy=FAST_RETRY) -> netzero.EnergySite:
+    """Make an EnergySite which talks to a test server."""
+    auth = netzero.Auth(
+        None,
+        "TOKEN",
+        retry_policy=retry_policy,
+        rate_limiter=netzero.RateLimiter(rate=1000, capacity=1000),
+        host=str(server.make_url("/api/v1")),
+    )
+    return netzero.EnergySite(auth, 12345)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.parametrize(
+    "fault", [500, 502, 503, 504, 429, (429, {"Retry-After": "0"}), "reset"]
+)
+async def test_auth_retry_get(fault):
+    """Test GETs are retried on transient failures."""
+    injector = FaultInjector(fault, fault)
+    async with TestServer(injector.app) as server:
+        site = await _site_for(server)
+        async with site.auth:
+            config = await site.async_get_config()
+
+    assert config.backup_reserve_percent == 80
+    assert injector.requests == ["GET", "GET", "GET"]
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_auth_retry_exhausted():
+    """Test the last response is returned when retries are used up."""
+    injector = FaultInjector(502, 502, 502, 502)
+    async with TestServer(injector.app) as server:
+        site = await _site_for(server)
+        async with site.auth:
+            with pytest.raises(aiohttp.ClientResponseError) as err:
+                await site.async_get_config()
+
+    assert err.value.status == 502
+    assert len(injector.requests) == 3
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_auth_retry_not_found():
+    """Test statuses which won't get better are not retried."""
+    injector = FaultInjector(404)
+    async with TestServer(injector.app) as server:
+        site = await _site_for(server)
+        async with site.auth:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await site.async_get_config()
+
+    assert len(injector.requests) == 1
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_auth_retry_after_too_long():
+    """Test a Retry-After beyond max_delay isn't waited for."""
+    injector = FaultInjector((429, {"Retry-After": "3600"}))
+    async with TestServer(injector.app) as server:
+        site = await _site_for(server)
+        async with site.auth:
+            with pytest.raises(aiohttp.ClientResponseError) as err:
+                await site.async_get_config()
+
+    assert err.value.status == 429
+    assert len(injector.requests) == 1
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.parametrize(
+    ("fault", "retried"),
+    [(502, False), (500, False), ("reset", False), (429, True), (503, True)],
+)
+async def test_auth_retry_post(fault, retried):
+    """Test POSTs are only retried when the server can't have acted on them."""
+    injector = FaultInjector(fault)
+    async with TestServer(injector.app) as server:
+        site = await _site_for(server)
+        async with site.auth:
+            try:
+                resp = await site.auth.request("POST", "12345/config", json={})
+            except aiohttp.ClientConnectionError:
+                resp = None
+
+    assert injector.requests == (["POST", "POST"] if retried else ["POST"])
+    if retried:
+        assert resp.status == 200
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_energy_site_set_config_retried():
+    """Test async_set_config, which sets absolute values, is retried."""
+    injector = FaultInjector(502, "reset")
+    async with TestServer(injector.app) as server:
+        site = await _site_for(server)
+        async with site.auth:
+            config = await site.async_set_config(backup_reserve_percent=80)
+
+    assert config.backup_reserve_percent == 80
+    assert injector.requests == ["POST", "POST", "POST"]
+
+
+async def test_auth_retry_connect_error():
+    """Test requests are retried when no connection can be made."""
+    async with netzero.Auth(
+        None,
+        "TOKEN",
+        retry_policy=FAST_RETRY,
+        rate_limiter=netzero.RateLimiter(rate=1000, capacity=1000),
+    ) as auth:
+        with (
+            patch.object(
+                auth.websession,
+                "request",
+                side_effect=aiohttp.ClientConnectorError(None, OSError("Refused")),
+            ) as mock_request,
+            pytest.raises(aiohttp.ClientConnectorError),
+        ):
+            await auth.request("POST", "12345/config", json={})
+
+    assert mock_request.call_count == 3
+
+
+def test_retry_policy_delays():
+    """Test RetryPolicy backoff and Retry-After handling."""
+    policy = netzero.RetryPolicy(base_delay=1, max_delay=10)
+
+    for attempt, cap in ((1, 1), (2, 2), (3, 4), (4, 8), (5, 10), (10, 10)):
+        for _ in range(20):
+            assert 0 <= policy.backoff(attempt) <= cap
+
+    assert policy.retry_after("5", 1) == 5
+    assert policy.retry_after("-5", 1) == 0
+    assert policy.retry_after("11", 1) is None
+    assert 0 <= policy.retry_after(None, 1) <= 1
+    assert 0 <= policy.retry_after("soon", 1) <= 1
+
+    when = datetime.datetime.now(datetime.UTC) + datetime.timedelta(seconds=8)
+    delay = policy.retry_after(email.utils.format_datetime(when, usegmt=True), 1)
+    assert 6 <= delay <= 8
+
+
+async def test_rate_limiter_burst_then_rate():
+    """Test the token bucket allows a burst, then queues requests in order."""
+    limiter = netzero.RateLimiter(rate=50, capacity=2)
+    loop = asyncio.get_running_loop()
+    order = []
+
+    async def request(i):
+        await limiter.acquire()
+        order.append((i, loop.time()))
+
+    start = loop.time()
+    await asyncio.gather(*(request(i) for i in range(6)))
+
+    assert [i for i, _ in order] == list(range(6))
+    # Two in the burst, then one every 20ms
+    assert order[1][1] - start < order[2][1] - start
+    assert order[2][1] - start >= 0.015
+    assert order[5][1] - start >= 0.075
+    assert limiter.acquired == 6
+    assert limiter.waited == 4
+    assert limiter.max_queue_depth == 4
+    assert limiter.queue_depth == 0
+    assert 0.075 <= limiter.max_wait < 1
+    assert limiter.total_wait >= 0.02 + 0.04 + 0.06 + 0.075
+
+    # The bucket refills while idle
+    await asyncio.sleep(0.05)
+    await limiter.acquire()
+    assert limiter.waited == 4
+
+
+async def test_rate_limiter_cancel():
+    """Test a cancelled waiter doesn't hold up the queue."""
+    limiter = netzero.RateLimiter(rate=20, capacity=1)
+    await limiter.acquire()
+
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 2
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert limiter.queue_depth == 1
+
+    async with asyncio.timeout(0.2):
+        await second
+    assert limiter.acquired == 2
+
+
+async def test_rate_limiter_shared_per_token():
+    """Test every Auth using a token shares one limiter."""
+    async with aiohttp.ClientSession() as session:
+        auth1 = netzero.Auth(session, "SHAREDTOKEN1")
+        auth2 = netzero.Auth(session, "SHAREDTOKEN1")
+        auth3 = netzero.Auth(session, "SHAREDTOKEN2")
+
+        assert auth1.rate_limiter is auth2.rate_limiter
+        assert auth1.rate_limiter is not auth3.rate_limiter
+        assert auth1.rate_limiter.rate == netzero.netzero.DEFAULT_RATE_LIMIT
+
+        with aioresponses() as mock:
+            mock.get(
+                "https://api.netzero.energy/api/v1/12345/config",
+                payload={
+                    "backup_reserve_percent": 80,
+                    "operational_mode": "autonomous",
+                    "energy_exports": "pv_only",
+                    "grid_charging": True,
+                },
+                repeat=True,
+            )
+            await netzero.EnergySite(auth1, 12345).async_get_config()
+            await netzero.EnergySite(auth2, 12345).async_get_config()
+
+        assert auth1.rate_limiter.acquired == 2
+        assert auth3.rate_limiter.acquired == 0
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_energy_site_get_config_coalesced():
+    """Test concurrent async_get_config calls share one request."""
+    injector = FaultInjector(delay=0.05)
+    async with TestServer(injector.app) as server:
+        site = await _site_for(server)
+        async with site.auth:
+            configs = await asyncio.gather(*(site.async_get_config() for _ in range(5)))
+            assert injector.requests == ["GET"]
+            assert all(config is configs[0] for config in configs)
+
+            # Once complete, the next call makes a new request
+            config = await site.async_get_config()
+            assert injector.requests == ["GET", "GET"]
+            assert config is not configs[0]
+
+            # Cancelling one caller doesn't affect the others
+            first = asyncio.create_task(site.async_get_config())
+            second = asyncio.create_task(site.async_get_config())
+            await asyncio.sleep(0.01)
+            first.cancel()
+            config = await second
+            assert first.cancelled()
+            assert config.backup_reserve_percent == 80
+            assert injector.requests == ["GET", "GET", "GET"]
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_energy_site_get_config_coalesced_failure():
+    """Test a failed shared request fails every caller, and isn't kept."""
+    injector = FaultInjector(404, delay=0.05)
+    async with TestServer(injector.app) as server:
+        site = await _site_for(server)
+        async with site.auth:
+            results = await asyncio.gather(
+                *(site.async_get_config() for _ in range(3)),
+                return_exceptions=True,
+            )
+            assert injector.requests == ["GET"]
+            assert all(isinstance(r, aiohttp.ClientResponseError) for r in results)
+
+            config = await site.async_get_config()
+            assert config.backup_reserve_percent == 80
+            assert injector.requests == ["GET", "GET"]
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_energy_site_get_config_max_age():
+    """Test async_get_config can return recent config without a request."""
+    injector = FaultInjector()
+    async with TestServer(injector.app) as server:
+        site = await _site_for(server)
+        async with site.auth:
+            config = await site.async_get_config(max_age=10)
+            assert injector.requests == ["GET"]
+
+            assert await site.async_get_config(max_age=10) is config
+            assert injector.requests == ["GET"]
+
+            # Without max_age, or when too old, a request is made
+            await site.async_get_config()
+            await asyncio.sleep(0.02)
+            await site.async_get_config(max_age=0.01)
+            assert injector.requests == ["GET", "GET", "GET"]
+
+            # Setting the config also refreshes it
+            config = await site.async_set_config(grid_charging=True)
+            assert await site.async_get_config(max_age=10) is config
+            assert injector.requests == ["GET", "GET", "GET", "POST"]
+
+
+async def test_energy_site_get_config_max_age_overlapping_set():
+    """Test a read sent before a set doesn't replace its newer result."""
+    emulator = Emulator(EmulatorOptions(live_status=False))
+    token = emulator.add_sites(1)[0]
+    reading, gate = asyncio.Event(), asyncio.Event()
+
+    async def handler(request: netzero.MemoryRequest) -> netzero.MemoryResponse:
+        # Reads see the site as it was when they were sent
+        response = await emulator.async_handle(request)
+        if request.method == "GET":
+            reading.set()
+            await gate.wait()
+        return response
+
+    auth = netzero.Auth(
+        None,
+        token,
+        rate_limiter=netzero.RateLimiter(rate=1000, capacity=1000),
+        transport=netzero.MemoryTransport(handler),
+    )
+    site = netzero.EnergySite(auth, 100000)
+    read = asyncio.create_task(site.async_get_config())
+    await reading.wait()
+    config = await site.async_set_config(backup_reserve_percent=50)
+
+    gate.set()
+    assert (await read).backup_reserve_percent == 80
+    assert await site.async_get_config(max_age=10) is config
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_auth_host_emulator():
+    """Test EnergySite against the local emulator, given as the host."""
+    emulator = Emulator(EmulatorOptions(live_status=False))
+    token = emulator.add_sites(3)[0]
+    async with TestServer(emulator.app) as server:
+        auth = netzero.Auth(
+            None,
+            token,
+            retry_policy=FAST_RETRY,
+            rate_limiter=netzero.RateLimiter(rate=1000, capacity=1000),
+            host=str(server.make_url("/api/v1/")),
+        )
+        async with auth:
+            site = netzero.EnergySite(auth, 100001)
+            config = await site.async_get_config()
+            assert config.backup_reserve_percent == 80
+            assert config.live_status is None
+
+            config = await site.async_set_config(backup_reserve_percent=50)
+            assert config.backup_reserve_percent == 50
+            assert emulator.sites["100001"]["backup_reserve_percent"] == 50
+
+            # Sites belonging to other tokens aren't found
+            resp = await auth.request("GET", "999999/config")
+            assert resp.status == 404
+
+        # Unknown tokens are rejected
+        auth = netzero.Auth(None, "BADTOKEN", retry_policy=FAST_RETRY, host=auth.host)
+        async with auth:
+            resp = await auth.request("GET", "100001/config")
+            assert resp.status == 401
+
+    assert emulator.stats == {"GET 200": 1, "GET 401": 1, "GET 404": 1, "POST 200": 1}
+
+
+async def test_memory_transport():
+    """Test requests through a MemoryTransport reach the handler directly."""
+    emulator = Emulator(EmulatorOptions(live_status=False))
+    token = emulator.add_sites(1)[0]
+    auth = netzero.Auth(
+        None, token, transport=netzero.MemoryTransport(emulator.async_handle)
+    )
+    assert auth.websession is None
+    async with auth:
+        assert await auth.async_prewarm()
+
+        site = netzero.EnergySite(auth, 100000)
+        config = await site.async_set_config(
+            operational_mode=netzero.OperationalMode.BACKUP
+        )
+        assert config.operational_mode == netzero.OperationalMode.BACKUP
+        assert emulator.sites["100000"]["operational_mode"] == "backup"
+
+        with pytest.raises(aiohttp.ClientResponseError) as err:
+            await netzero.EnergySite(auth, 999999).async_get_config()
+        assert err.value.status == 404
+        assert err.value.request_info.url.path == "/api/v1/999999/config"
+
+
+async def test_memory_transport_retry():
+    """Test the retry policy applies to MemoryTransport failures."""
+    requests = []
+
+    async def handler(request: netzero.MemoryRequest) -> netzero.MemoryResponse:
+        requests.append(request)
+        if len(requests) == 1:
+            raise aiohttp.ClientConnectionError("Boom")
+        if len(requests) == 2:
+            return netzero.MemoryResponse(503, headers={"Retry-After": "0"})
+        return netzero.MemoryResponse.from_json({"ok": True})
+
+    auth = netzero.Auth(
+        None,
+        "TOKEN",
+        retry_policy=FAST_RETRY,
+        rate_limiter=netzero.RateLimiter(rate=1000, capacity=1000),
+        host="http://proxy.local/netzero/",
+        transport=netzero.MemoryTransport(handler),
+    )
+    resp = await auth.request("GET", "12345/config")
+    assert resp.status == 200
+    assert await resp.json() == {"ok": True}
+    assert [str(request.url) for request in requests] == [
+        "http://proxy.local/netzero/12345/config"
+    ] * 3
+    assert requests[0].headers["Authorization"] == "Bearer TOKEN"
+
+
+def _fleet_handler(emulator: Emulator, delays: dict[str, float], in_flight: list[int]):
+    """Return a handler delaying sites, and recording requests in flight."""
+
+    async def handler(request: netzero.MemoryRequest) -> netzero.MemoryResponse:
+        in_flight.append(in_flight[-1] + 1)
+        try:
+            await asyncio.sleep(delays.get(request.url.parts[-2], 0))
+            return await emulator.async_handle(request)
+        finally:
+            in_flight.append(in_flight[-1] - 1)
+
+    return handler
+
+
+async def test_energy_site_fleet():
+    """Test a fleet streams results as sites finish, within its limit."""
+    emulator = Emulator(EmulatorOptions(live_status=False))
+    tokens = emulator.add_sites(4, tokens=2)
+    in_flight = [0]
+    transport = netzero.MemoryTransport(
+        _fleet_handler(emulator, {"100000": 0.05}, in_flight)
+    )
+    site_tokens = {str(100000 + i): tokens[i % 2] for i in range(4)}
+    site_tokens["999999"] = tokens[0]
+    fleet = netzero.EnergySiteFleet.for_tokens(
+        None,
+        site_tokens,
+        concurrency=2,
+        rate_limiter=netzero.RateLimiter(rate=1000, capacity=1000),
+        transport=transport,
+    )
+    assert len({id(site.auth) for site in fleet.sites}) == 2
+
+    results = [result async for result in fleet.async_get_config()]
+    assert max(in_flight) == 2
+    # The slow site doesn't hold up the others
+    assert [result.site_id for result in results][-1] == "100000"
+    assert results[-1].elapsed >= 0.05
+    assert {result.site_id for result in results if result.ok} == {
+        "100000",
+        "100001",
+        "100002",
+        "100003",
+    }
+    (failed,) = [result for result in results if not result.ok]
+    assert failed.site_id == "999999"
+    assert failed.config is None
+    assert isinstance(failed.error, aiohttp.ClientResponseError)
+    assert failed.error.status == 404
+
+    results = [
+        result async for result in fleet.async_set_config(backup_reserve_percent=50)
+    ]
+    assert sum(result.ok for result in results) == 4
+    assert all(
+        result.config.backup_reserve_percent == 50 for result in results if result.ok
+    )
+    assert all(site["backup_reserve_percent"] == 50 for site in emulator.sites.values())
+    await fleet.async_close()
+
+
+async def test_energy_site_fleet_timeout():
+    """Test a slow site fails alone, and leaving early waits for changes."""
+    emulator = Emulator(EmulatorOptions(live_status=False))
+    token = emulator.add_sites(3)[0]
+    delays = {"100001": 10}
+    in_flight = [0]
+    auth = netzero.Auth(
+        None,
+        token,
+        retry_policy=netzero.RetryPolicy(attempts=1),
+        rate_limiter=netzero.RateLimiter(rate=1000, capacity=1000),
+        transport=netzero.MemoryTransport(_fleet_handler(emulator, delays, in_flight)),
+    )
+    sites = [netzero.EnergySite(auth, str(100000 + i)) for i in range(3)]
+    fleet = netzero.EnergySiteFleet(sites, timeout=0.05)
+
+    results = {result.site_id: result async for result in fleet.async_get_config()}
+    assert results["100000"].ok
+    assert results["100002"].ok
+    assert isinstance(results["100001"].error, TimeoutError)
+    assert in_flight[-1] == 0
+
+    # A change stalled waiting for its response times out, and may
+    # have been applied
+    results = {
+        result.site_id: result
+        async for result in fleet.async_set_config(grid_charging=True)
+    }
+    assert results["100000"].ok
+    assert not results["100000"].outcome_unknown
+    assert isinstance(results["100001"].error, TimeoutError)
+    assert results["100001"].outcome_unknown
+    assert in_flight[-1] == 0
+
+    # Leaving after the first result waits for the changes started...
+    delays["100001"] = 0.02
+    async with contextlib.aclosing(
+        fleet.async_set_config(grid_charging=False)
+    ) as results:
+        async for result in results:
+            assert result.ok
+            break
+    assert in_flight[-1] == 0
+    assert emulator.sites["100001"]["grid_charging"] is False
+
+    # ...for no longer than the timeout...
+    delays["100001"] = 10
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    async with contextlib.aclosing(
+        fleet.async_set_config(grid_charging=True)
+    ) as results:
+        async for result in results:
+            assert result.ok
+            break
+    assert loop.time() - start < 1
+    assert in_flight[-1] == 0
+
+    # ...but doesn't wait for the reads
+    delays["100001"] = 0.5
+    fleet.timeout = None
+    start = loop.time()
+    async with contextlib.aclosing(fleet.async_get_config()) as results:
+        async for result in results:
+            assert result.ok
+            break
+    assert loop.time() - start < 0.5
+    # The read is shared with other callers, so finishes for them
+    assert in_flight[-1] == 1
+    await sites[1].async_get_config()
+    assert in_flight[-1] == 0
+
+    with pytest.raises(ValueError):
+        netzero.EnergySiteFleet(sites, concurrency=0)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_energy_site_fleet_stalled_write():
+    """Test a change to a stalled server times out, even if abandoned."""
+    posts = []
+
+    async def handle_config(request: web.Request) -> web.Response:
+        posts.append(await request.json())
+        await asyncio.sleep(10)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post("/api/v1/{site}/config", handle_config)
+    async with TestServer(app) as server:
+        auth = netzero.Auth(
+            None,
+            "TOKEN",
+            retry_policy=netzero.RetryPolicy(attempts=1),
+            rate_limiter=netzero.RateLimiter(rate=1000, capacity=1000),
+            host=str(server.make_url("/api/v1")),
+        )
+        async with auth:
+            fleet = netzero.EnergySiteFleet(
+                [netzero.EnergySite(auth, "12345")], timeout=0.1
+            )
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            (result,) = [
+                result async for result in fleet.async_set_config(grid_charging=True)
+            ]
+            assert loop.time() - start < 1
+            assert isinstance(result.error, TimeoutError)
+            assert result.outcome_unknown
+            # The request was sent in full before the timeout
+            assert posts == [{"grid_charging": True}]
+
+            # Cancelling the caller doesn't leave it waiting either
+            async def consume() -> None:
+                async for _ in fleet.async_set_config(grid_charging=False):
+                    pass
+
+            task = loop.create_task(consume())
+            await asyncio.sleep(0.05)
+            start = loop.time()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert loop.time() - start < 1
+
+
+async def test_energy_site_fleet_one_token():
+    """Test many sites on one token queue for its rate limit, not time out."""
+    emulator = Emulator(EmulatorOptions(live_status=False))
+    token = emulator.add_sites(50)[0]
+    posts = {"started": 0, "finished": 0, "cancelled": 0}
+
+    async def handler(request: netzero.MemoryRequest) -> netzero.MemoryResponse:
+        if request.method == "POST":
+            posts["started"] += 1
+        try:
+            await asyncio.sleep(0.02)
+            response = await emulator.async_handle(request)
+        except asyncio.CancelledError:
+            posts["cancelled"] += 1
+            raise
+        if request.method == "POST":
+            posts["finished"] += 1
+        return response
+
+    # 45 requests beyond the burst take 0.45 s to be admitted, far
+    # longer than the timeout each is allowed once it is
+    auth = netzero.Auth(
+        None,
+        token,
+        rate_limiter=netzero.RateLimiter(rate=100, capacity=5),
+        transport=netzero.MemoryTransport(handler),
+    )
+    sites = [netzero.EnergySite(auth, site_id) for site_id in emulator.sites]
+    fleet = netzero.EnergySiteFleet(sites, concurrency=50, timeout=0.1)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = [result async for result in fleet.async_get_config()]
+    assert [result.error for result in results if not result.ok] == []
+    assert len(results) == 50
+    assert 0.45 <= loop.time() - start < 1.5
+
+    results = [result async for result in fleet.async_set_config(grid_charging=True)]
+    assert [result.error for result in results if not result.ok] == []
+    assert posts == {"started": 50, "finished": 50, "cancelled": 0}
+    assert all(site["grid_charging"] is True for site in emulator.sites.values())
+    assert emulator.stats == {"GET 200": 50, "POST 200": 50}
+
+
+@pytest.mark.parametrize(
+    ("err", "unknown"),
+    [
+        (TimeoutError(), True),
+        (aiohttp.SocketTimeoutError(), True),
+        (aiohttp.ServerDisconnectedError(), True),
+        (aiohttp.ConnectionTimeoutError(), False),
+        (aiohttp.ClientConnectorError(None, OSError("Boom")), False),
+        (ValueError(), False),
+    ],
+)
+def test_outcome_unknown(err, unknown):
+    """Test which failed changes may have been applied."""
+    assert netzero.outcome_unknown(err) is unknown
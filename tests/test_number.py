@@ -2,6 +2,7 @@
 
 from datetime import timedelta
 
+from aiohttp import ClientConnectionError
 from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from homeassistant.components.number import (
@@ -12,6 +13,8 @@ from homeassistant.components.number import (
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.util.dt import utcnow
 
+from .mocks import _config_with_changes
+
 control_cooldown_interval = timedelta(seconds=15)
 
 
@@ -36,8 +39,9 @@ async def test_number_set(hass, mock_energysite):
     assert state.state == "80"
 
     base_config = mock_energysite.async_set_config.return_value
-    base_config.raw_data["backup_reserve_percent"] = 70
-    mock_energysite.async_set_config.return_value = base_config
+    mock_energysite.async_set_config.return_value = _config_with_changes(
+        base_config, backup_reserve_percent=70
+    )
 
     await hass.services.async_call(
         NUMBER_DOMAIN,
@@ -47,10 +51,45 @@ async def test_number_set(hass, mock_energysite):
     )
     await hass.async_block_till_done()
 
-    # The update is only done after the coordinator returns
+    # The requested value is shown while the change is pending
+    state = hass.states.get("number.powerwall_backup_reserve")
+    assert state
+    assert state.state == "70"
+    assert state.attributes.get("pending") is True
+    mock_energysite.async_set_config.assert_not_called()
+
     async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
     await hass.async_block_till_done()
 
+    mock_energysite.async_set_config.assert_called_once_with(backup_reserve_percent=70)
+    state = hass.states.get("number.powerwall_backup_reserve")
+    assert state
+    assert state.state == "70"
+    assert "pending" not in state.attributes
+
+
+async def test_number_set_failure(hass, mock_energysite):
+    """Test the backup reserve is rolled back when the change fails."""
+
+    mock_energysite.async_set_config.side_effect = ClientConnectionError()
+
+    await hass.services.async_call(
+        NUMBER_DOMAIN,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 70.0, ATTR_ENTITY_ID: "number.powerwall_backup_reserve"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
     state = hass.states.get("number.powerwall_backup_reserve")
     assert state
     assert state.state == "70"
+
+    async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
+    await hass.async_block_till_done()
+
+    mock_energysite.async_set_config.assert_called_once()
+    state = hass.states.get("number.powerwall_backup_reserve")
+    assert state
+    assert state.state == "80"
+    assert "pending" not in state.attributes
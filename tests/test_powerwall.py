@@ -0,0 +1,84 @@
+"""Test the powerwall.py command line script."""
+
+import json
+import sys
+
+from aiohttp.test_utils import TestServer
+import pytest
+
+from benchmarks.emulator import Emulator, EmulatorOptions, parse_latency
+import powerwall
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_batch_one_token(tmp_path, monkeypatch, capsys):
+    """Test a batch of sites on one token keeps to its rate limit."""
+    emulator = Emulator(
+        EmulatorOptions(
+            latency=parse_latency("fixed:20"), rate_limit=150, live_status=False
+        )
+    )
+    token = emulator.add_sites(30)[0]
+    for site_id in emulator.sites:
+        (tmp_path / f"{site_id}.json").write_text(
+            json.dumps({"api_token": token, "system_id": site_id})
+        )
+
+    async with TestServer(emulator.app) as server:
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "powerwall.py",
+                "--url",
+                str(server.make_url("/api/v1")),
+                "--rate-limit",
+                "100",
+                "--burst",
+                "10",
+                # Much less than the time spent queued for the rate limit
+                "--timeout",
+                "0.15",
+                "--set-backup",
+                "40",
+                str(tmp_path),
+            ],
+        )
+        assert await powerwall.main() == 0
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == 30
+    assert all(record["ok"] for record in records)
+    assert {record["system_id"] for record in records} == set(emulator.sites)
+    # 20 requests beyond the burst are admitted at 100 per second
+    assert max(record["finished_ms"] for record in records) >= 190
+    assert all(site["backup_reserve_percent"] == 40 for site in emulator.sites.values())
+    # The emulator's own limit was never hit
+    assert emulator.stats == {"POST 200": 30}
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_single_no_live_status(monkeypatch, capsys):
+    """Test a site without a live status is still printed."""
+    emulator = Emulator(EmulatorOptions(live_status=False))
+    token = emulator.add_sites(1)[0]
+
+    async with TestServer(emulator.app) as server:
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "powerwall.py",
+                "--url",
+                str(server.make_url("/api/v1")),
+                "--api-token",
+                token,
+                "--system-id",
+                "100000",
+            ],
+        )
+        assert await powerwall.main() == 0
+
+    out = capsys.readouterr().out
+    assert "Battery backup reserve: 80%" in out
+    assert "No live status reported" in out
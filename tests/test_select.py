@@ -12,6 +12,8 @@ from homeassistant.components.select import (
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.util.dt import utcnow
 
+from .mocks import _config_with_changes
+
 control_cooldown_interval = timedelta(seconds=15)
 
 
@@ -51,8 +53,9 @@ async def test_select_operational_mode(hass, mock_energysite):
     base_config = mock_energysite.async_set_config.return_value
 
     for val in test_values:
-        base_config.raw_data["operational_mode"] = val[0]
-        mock_energysite.async_set_config.return_value = base_config
+        mock_energysite.async_set_config.return_value = _config_with_changes(
+            base_config, operational_mode=val[0]
+        )
 
         await hass.services.async_call(
             SELECT_DOMAIN,
@@ -78,8 +81,9 @@ async def test_select_energy_export_mode_null(hass, mock_energysite):
     assert state.state == "pv_only"
 
     base_config = mock_energysite.async_set_config.return_value
-    base_config.raw_data["energy_exports"] = None
-    mock_energysite.async_get_config.return_value = base_config
+    mock_energysite.async_get_config.return_value = _config_with_changes(
+        base_config, energy_exports=None
+    )
 
     async_fire_time_changed(hass, utcnow() + control_cooldown_interval)
     await hass.async_block_till_done()
@@ -106,8 +110,9 @@ async def test_select_energy_export_mode(hass, mock_energysite):
     base_config = mock_energysite.async_set_config.return_value
 
     for val in test_values:
-        base_config.raw_data["energy_exports"] = val[0]
-        mock_energysite.async_set_config.return_value = base_config
+        mock_energysite.async_set_config.return_value = _config_with_changes(
+            base_config, energy_exports=val[0]
+        )
 
         await hass.services.async_call(
             SELECT_DOMAIN,
@@ -0,0 +1,125 @@
+"""Test sensor platform for powerwall_control integration."""
+
+from custom_components.powerwall_control.const import DOMAIN
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from .conftest import DEFAULT_LIVE_STATUS
+from .mocks import _config_with_changes
+
+
+async def test_sensor(hass: HomeAssistant, mock_live_energysite) -> None:
+    """Test sensors report the live status."""
+    state = hass.states.get("sensor.powerwall_charge")
+    assert state.state == "64.5"
+    assert state.attributes["unit_of_measurement"] == "%"
+
+    state = hass.states.get("sensor.powerwall_battery_power")
+    assert state.state == "-2520"
+    assert state.attributes["unit_of_measurement"] == "W"
+
+    assert hass.states.get("sensor.powerwall_solar_power").state == "4140"
+    assert hass.states.get("sensor.powerwall_load_power").state == "1620"
+    assert hass.states.get("sensor.powerwall_grid_power").state == "110"
+    assert hass.states.get("sensor.powerwall_generator_power").state == "0"
+    assert (
+        hass.states.get("sensor.powerwall_status_time").state
+        == "2020-12-31T23:59:59+00:00"
+    )
+
+
+async def test_sensor_update(hass: HomeAssistant, mock_live_energysite) -> None:
+    """Test sensors and configuration entities update from a status poll."""
+    runtime_data = hass.config_entries.async_entries(DOMAIN)[0].runtime_data
+    config = runtime_data.coordinator.data
+    mock_live_energysite.async_get_config.return_value = _config_with_changes(
+        config,
+        backup_reserve_percent=30,
+        live_status={**DEFAULT_LIVE_STATUS, "grid_power": -900},
+    )
+
+    await runtime_data.status_coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.powerwall_grid_power").state == "-900"
+    assert hass.states.get("number.powerwall_backup_reserve").state == "30"
+    assert mock_live_energysite.async_get_config.await_count == 2
+
+
+async def test_sensor_without_live_status(hass: HomeAssistant, mock_energysite) -> None:
+    """Test sensors are unavailable when there is no live status."""
+    state = hass.states.get("sensor.powerwall_grid_power")
+    assert state.state == STATE_UNAVAILABLE
+
+
+def _wall_connector(din: str, power: int = 0) -> dict:
+    """Return a raw wall connector."""
+    return {
+        "din": din,
+        "wall_connector_state": 2,
+        "wall_connector_fault_state": 1,
+        "wall_connector_power": power,
+    }
+
+
+async def test_wall_connectors(hass: HomeAssistant, mock_live_energysite) -> None:
+    """Test wall connector entities are added, updated and removed by DIN."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    status_coordinator = entry.runtime_data.status_coordinator
+    config = status_coordinator.config_coordinator.data
+    device_registry = dr.async_get(hass)
+
+    async def _poll(*wall_connectors):
+        mock_live_energysite.async_get_config.return_value = _config_with_changes(
+            config,
+            live_status={**DEFAULT_LIVE_STATUS, "wall_connectors": wall_connectors},
+        )
+        await status_coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.wall_connector_abcd_power") is None
+
+    await _poll(_wall_connector("abcd", 100), _wall_connector("efgh"))
+    assert hass.states.get("sensor.wall_connector_abcd_power").state == "100"
+    assert hass.states.get("sensor.wall_connector_abcd_state").state == "2"
+    assert hass.states.get("sensor.wall_connector_abcd_fault_state").state == "1"
+    assert hass.states.get("sensor.wall_connector_efgh_power").state == "0"
+    device = device_registry.async_get_device(identifiers={(DOMAIN, "efgh")})
+    assert device.name == "Wall Connector efgh"
+    assert device.via_device_id is not None
+
+    # Only the connector which changed is written
+    reported = hass.states.get("sensor.wall_connector_efgh_power").last_reported
+    await _poll(_wall_connector("abcd", 7000), _wall_connector("efgh"))
+    assert hass.states.get("sensor.wall_connector_abcd_power").state == "7000"
+    state = hass.states.get("sensor.wall_connector_efgh_power")
+    assert state.last_reported == reported
+
+    # One connector goes, another appears
+    await _poll(_wall_connector("abcd", 7000), _wall_connector("ijkl", 50))
+    assert hass.states.get("sensor.wall_connector_efgh_power") is None
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "efgh")}) is None
+    assert hass.states.get("sensor.wall_connector_ijkl_power").state == "50"
+    assert hass.states.get("sensor.wall_connector_abcd_power").state == "7000"
+
+
+async def test_wall_connectors_removed_while_stopped(
+    hass: HomeAssistant, mock_live_energysite
+) -> None:
+    """Test wall connectors gone since the last run are removed at setup."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    device_registry = dr.async_get(hass)
+    device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, "gone")},
+        via_device=(DOMAIN, entry.data["system_id"]),
+    )
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "gone")}) is None
+    assert device_registry.async_get_device(
+        identifiers={(DOMAIN, entry.data["system_id"])}
+    )
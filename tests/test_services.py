@@ -0,0 +1,149 @@
+"""Test powerwall_control services."""
+
+import aiohttp
+import pytest
+import voluptuous as vol
+
+from custom_components.powerwall_control.const import DOMAIN
+from custom_components.powerwall_control.netzero import (
+    EnergyExportMode,
+    OperationalMode,
+)
+from homeassistant.components.number import (
+    ATTR_VALUE,
+    DOMAIN as NUMBER_DOMAIN,
+    SERVICE_SET_VALUE,
+)
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID, ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from .mocks import _config_with_changes
+
+
+async def test_set_config(hass: HomeAssistant, mock_energysite) -> None:
+    """Test set_config sends pending changes with its own, at once."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    base_config = mock_energysite.async_set_config.return_value
+    mock_energysite.async_set_config.return_value = _config_with_changes(
+        base_config,
+        backup_reserve_percent=40,
+        operational_mode="backup",
+        grid_charging=True,
+    )
+
+    # A change waiting for the debounce
+    await hass.services.async_call(
+        NUMBER_DOMAIN,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 40.0, ATTR_ENTITY_ID: "number.powerwall_backup_reserve"},
+        blocking=True,
+    )
+    mock_energysite.async_set_config.assert_not_called()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "set_config",
+        {
+            ATTR_CONFIG_ENTRY_ID: entry.entry_id,
+            "operational_mode": "backup",
+            "grid_charging": True,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    mock_energysite.async_set_config.assert_awaited_once_with(
+        backup_reserve_percent=40,
+        operational_mode=OperationalMode.BACKUP,
+        grid_charging=True,
+    )
+    assert response == {
+        "backup_reserve_percent": 40,
+        "operational_mode": "backup",
+        "energy_exports": "pv_only",
+        "grid_charging": True,
+    }
+    await hass.async_block_till_done()
+    assert hass.states.get("number.powerwall_backup_reserve").state == "40"
+    assert hass.states.get("switch.powerwall_grid_charging").state == "on"
+    assert entry.runtime_data.coordinator.applied_generation == 2
+
+
+async def test_set_config_no_op(hass: HomeAssistant, mock_energysite) -> None:
+    """Test set_config doesn't POST changes to the current values."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "set_config",
+        {ATTR_CONFIG_ENTRY_ID: entry.entry_id, "energy_exports": "pv_only"},
+        blocking=True,
+        return_response=True,
+    )
+
+    mock_energysite.async_set_config.assert_not_called()
+    assert response["energy_exports"] == EnergyExportMode.PV_ONLY
+
+
+async def test_set_config_invalid(hass: HomeAssistant, mock_energysite) -> None:
+    """Test set_config validation."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_config",
+            {ATTR_CONFIG_ENTRY_ID: entry.entry_id},
+            blocking=True,
+            return_response=True,
+        )
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_config",
+            {ATTR_CONFIG_ENTRY_ID: entry.entry_id, "operational_mode": "turbo"},
+            blocking=True,
+            return_response=True,
+        )
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_config",
+            {ATTR_CONFIG_ENTRY_ID: "missing", "grid_charging": True},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_config",
+            {ATTR_CONFIG_ENTRY_ID: entry.entry_id, "grid_charging": True},
+            blocking=True,
+            return_response=True,
+        )
+    mock_energysite.async_set_config.assert_not_called()
+
+
+async def test_set_config_failure(hass: HomeAssistant, mock_energysite) -> None:
+    """Test set_config reports failures, and rolls back the changes."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    mock_energysite.async_set_config.side_effect = aiohttp.ClientConnectionError
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_config",
+            {ATTR_CONFIG_ENTRY_ID: entry.entry_id, "grid_charging": True},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert not entry.runtime_data.coordinator.is_pending("grid_charging")
+    state = hass.states.get("switch.powerwall_grid_charging")
+    assert state.state == "off"
+    assert "pending" not in state.attributes
@@ -12,6 +12,8 @@ from homeassistant.components.switch import (
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.util.dt import utcnow
 
+from .mocks import _config_with_changes
+
 control_cooldown_interval = timedelta(seconds=15)
 
 
@@ -32,8 +34,9 @@ async def test_switch_turn_on_and_off(hass, mock_energysite):
     assert state.state == "off"
 
     base_config = mock_energysite.async_set_config.return_value
-    base_config.raw_data["grid_charging"] = True
-    mock_energysite.async_set_config.return_value = base_config
+    mock_energysite.async_set_config.return_value = _config_with_changes(
+        base_config, grid_charging=True
+    )
 
     await hass.services.async_call(
         SWITCH_DOMAIN,
@@ -51,8 +54,9 @@ async def test_switch_turn_on_and_off(hass, mock_energysite):
     assert state
     assert state.state == "on"
 
-    base_config.raw_data["grid_charging"] = False
-    mock_energysite.async_set_config.return_value = base_config
+    mock_energysite.async_set_config.return_value = _config_with_changes(
+        base_config, grid_charging=False
+    )
 
     await hass.services.async_call(
         SWITCH_DOMAIN,